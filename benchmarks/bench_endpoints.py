@@ -0,0 +1,168 @@
+"""
+Нагрузочный прогон всех маршрутов API в процессе через ASGITransport.
+
+Запуск:
+    python -m pytest benchmarks --bench-posts 100000 --bench-concurrency 20
+
+Результаты (запросов в секунду, p50/p95/p99) пишутся в JSON-отчёт
+--bench-report (по умолчанию benchmarks/report.json).
+"""
+import random
+
+import pytest
+from fastapi import status
+
+from tests.conftest import URL_PREFIX_AUTH, URL_PREFIX_POST
+
+# хеширование паролей намного дороже остальных запросов
+AUTH_REQUESTS_DIVISOR = 10
+
+
+@pytest.fixture
+def rnd(bench_options):
+    return random.Random(bench_options.seed)
+
+
+def check(result):
+    assert result['errors'] == 0, result['error_statuses']
+
+
+@pytest.mark.anyio
+async def test_list_posts(async_client, bench_data, bench, rnd):
+    pages = bench_data.last_post_id - bench_data.first_post_id
+    offsets = [rnd.randrange(max(pages - 20, 1)) for _ in range(100)]
+
+    async def send(number):
+        if number % 2:
+            return await async_client.get(
+                f'{URL_PREFIX_POST}/', params={'limit': 20}
+            )
+        return await async_client.get(
+            f'{URL_PREFIX_POST}/',
+            params={'offset': offsets[number % len(offsets)], 'limit': 20},
+        )
+
+    check(await bench('list', send))
+
+
+@pytest.mark.anyio
+async def test_get_post(async_client, bench_data, bench, rnd):
+    async def send(number):
+        post_id = rnd.randint(
+            bench_data.first_post_id, bench_data.last_post_id
+        )
+        return await async_client.get(f'{URL_PREFIX_POST}/{post_id}')
+
+    check(await bench('get', send))
+
+
+@pytest.mark.anyio
+async def test_search_posts(async_client, bench_data, bench, rnd):
+    async def send(number):
+        word = rnd.choice(bench_data.words)
+        return await async_client.get(
+            f'{URL_PREFIX_POST}/search/{word}', params={'limit': 20}
+        )
+
+    check(await bench('search', send))
+
+
+@pytest.mark.anyio
+async def test_user_statistics(async_client, bench_data, bench, rnd):
+    async def send(number):
+        user_id = rnd.randint(1, len(bench_data.logins) + 1)
+        return await async_client.get(
+            f'{URL_PREFIX_POST}/statistics/{user_id}'
+        )
+
+    check(await bench('statistics', send))
+
+
+@pytest.mark.anyio
+async def test_users_statistics(async_client, bench_data, bench, rnd):
+    async def send(number):
+        user_ids = rnd.sample(range(1, len(bench_data.logins) + 2), k=10)
+        return await async_client.post(
+            f'{URL_PREFIX_POST}/statistics', json={'user_ids': user_ids}
+        )
+
+    check(await bench('statistics_bulk', send))
+
+
+@pytest.mark.anyio
+async def test_create_post(async_client, bench_data, bench, headers):
+    async def send(number):
+        return await async_client.post(
+            f'{URL_PREFIX_POST}/',
+            json={'title': f'Пост #{number}', 'content': 'Текст поста'},
+            headers=headers,
+        )
+
+    check(
+        await bench('create', send, expected_status=status.HTTP_201_CREATED)
+    )
+
+
+@pytest.mark.anyio
+async def test_patch_post(async_client, bench_data, bench, headers, rnd):
+    async def send(number):
+        post_id = rnd.randint(
+            bench_data.first_post_id, bench_data.last_post_id
+        )
+        return await async_client.patch(
+            f'{URL_PREFIX_POST}/{post_id}',
+            json={'title': f'Изменённый пост #{number}'},
+            headers=headers,
+        )
+
+    check(await bench('patch', send))
+
+
+@pytest.mark.anyio
+async def test_delete_post(
+    async_client, bench_data, bench, bench_options, headers, rnd
+):
+    post_ids = list(
+        range(bench_data.first_post_id, bench_data.last_post_id + 1)
+    )
+    requests = min(bench_options.requests, len(post_ids))
+    post_ids = rnd.sample(post_ids, k=requests)
+
+    async def send(number):
+        return await async_client.delete(
+            f'{URL_PREFIX_POST}/{post_ids[number]}', headers=headers
+        )
+
+    check(await bench('delete', send, requests=requests))
+
+
+@pytest.mark.anyio
+async def test_auth(async_client, bench_data, bench, bench_options, rnd):
+    async def send(number):
+        login = rnd.choice(bench_data.logins)
+        return await async_client.post(
+            f'{URL_PREFIX_AUTH}/auth',
+            json={'login': login, 'password': bench_data.password},
+        )
+
+    requests = max(bench_options.requests // AUTH_REQUESTS_DIVISOR, 2)
+    check(await bench('auth', send, requests=requests))
+
+
+@pytest.mark.anyio
+async def test_register(async_client, bench_data, bench, bench_options):
+    async def send(number):
+        return await async_client.post(
+            f'{URL_PREFIX_AUTH}/register',
+            json={'login': f'bench_new_user_{number}', 'password': 'secret'},
+        )
+
+    requests = max(bench_options.requests // AUTH_REQUESTS_DIVISOR, 2)
+    check(
+        await bench(
+            'register',
+            send,
+            expected_status=status.HTTP_201_CREATED,
+            requests=requests,
+        )
+    )
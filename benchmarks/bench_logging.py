@@ -0,0 +1,69 @@
+"""
+Накладные расходы логирования на запрос: создание поста (одна запись
+лога на запрос) с выключенным логированием, с синхронным выводом
+и с выводом через очередь в фоновом потоке.
+
+Запуск:
+    python -m pytest benchmarks/bench_logging.py --bench-requests 2000
+
+В отчёт пишутся результаты каждого режима (log_<режим>) и разница
+средней задержки с режимом off (logging_overhead).
+"""
+import pytest
+from fastapi import status
+
+from src.core.config import settings
+from src.core.logger import configure_logging
+from tests.conftest import URL_PREFIX_POST
+
+LOGGING_MODES = {
+    'off': {'level': 'WARNING'},
+    'sync': {},
+    'sync_json': {'json': True},
+    'queue_json': {'json': True, 'queue': True},
+    'queue_json_sampled': {'json': True, 'queue': True, 'sample_rate': 0.1},
+}
+
+
+@pytest.mark.anyio
+async def test_logging_overhead(
+    async_client, bench_data, bench, bench_report, headers, tmp_path
+):
+    async def send(number):
+        return await async_client.post(
+            f'{URL_PREFIX_POST}/',
+            json={'title': f'Пост #{number}', 'content': 'Текст поста'},
+            headers=headers,
+        )
+
+    mean_ms = {}
+    try:
+        for mode, options in LOGGING_MODES.items():
+            with open(tmp_path / f'{mode}.log', 'w') as stream:
+                configure_logging(stream=stream, **options)
+                # прогрев соединений и кэшей перед замером
+                await send(0)
+                result = await bench(
+                    f'log_{mode}',
+                    send,
+                    expected_status=status.HTTP_201_CREATED,
+                )
+                configure_logging(stream=stream, level='WARNING')
+            assert result['errors'] == 0, result['error_statuses']
+            mean_ms[mode] = result['elapsed_s'] * 1000 / result['requests']
+    finally:
+        configure_logging(
+            level=settings.log_level,
+            json=settings.log_json,
+            queue=settings.log_queue_enabled,
+            sample_rate=settings.log_sample_rate,
+        )
+
+    bench_report.add(
+        'logging_overhead',
+        {
+            f'{mode}_ms': round(value - mean_ms['off'], 4)
+            for mode, value in mean_ms.items()
+            if mode != 'off'
+        },
+    )
@@ -0,0 +1,156 @@
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any, Awaitable, Callable, NamedTuple
+
+import pytest
+from sqlalchemy import func, insert, select
+
+from benchmarks.load import BenchOptions, BenchReport, drive
+from src.core.auth import hash_password
+from src.core.config import settings
+from src.db.postgres import create_engine
+from src.models import Base, Post, User
+from src.repositories.post import post_crud
+from src.services.seed import POST_COLUMNS, DataGenerator, SeedConfig
+from tests.conftest import (  # noqa: F401
+    anyio_backend,
+    async_client,
+    create_test_database,
+    create_test_user,
+    db_session,
+    db_session_factory,
+    headers,
+)
+
+BENCH_PASSWORD = 'password'
+BENCH_LOGIN_PREFIX = 'bench_user_'
+BENCH_CONTENT_MEDIAN = 200
+BENCH_PERIOD = timedelta(days=730)
+SEED_BATCH_SIZE = 10000
+
+
+class BenchData(NamedTuple):
+    logins: list[str]
+    password: str
+    first_post_id: int
+    last_post_id: int
+    words: list[str]
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup('benchmarks')
+    group.addoption('--bench-users', type=int, default=100)
+    group.addoption('--bench-posts', type=int, default=10000)
+    group.addoption('--bench-requests', type=int, default=500)
+    group.addoption('--bench-concurrency', type=int, default=10)
+    group.addoption('--bench-seed', type=int, default=42)
+    group.addoption(
+        '--bench-report',
+        type=Path,
+        default=Path(__file__).parent / 'report.json',
+    )
+
+
+@pytest.fixture(scope='session')
+def bench_options(request: pytest.FixtureRequest) -> BenchOptions:
+    option = request.config.getoption
+    return BenchOptions(
+        users=option('bench_users'),
+        posts=option('bench_posts'),
+        requests=option('bench_requests'),
+        concurrency=option('bench_concurrency'),
+        seed=option('bench_seed'),
+        report=option('bench_report'),
+    )
+
+
+@pytest.fixture(scope='session')
+def bench_report(bench_options):
+    report = BenchReport(bench_options)
+    yield report
+    report.write()
+
+
+@pytest.fixture(scope='module')
+async def db_engine(create_test_database):
+    # в отличие от тестов - пул соединений с настройками сервиса
+    engine = create_engine(settings.dsn_test)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    yield engine
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+
+@pytest.fixture(scope='module')
+async def bench_data(db_session, create_test_user, bench_options):
+    now = datetime.now(UTC).replace(tzinfo=None)
+    generator = DataGenerator(
+        SeedConfig(
+            users=bench_options.users,
+            posts=bench_options.posts,
+            date_from=now - BENCH_PERIOD,
+            date_to=now,
+            content_median=BENCH_CONTENT_MEDIAN,
+            seed=bench_options.seed,
+            batch_size=SEED_BATCH_SIZE,
+            login_prefix=BENCH_LOGIN_PREFIX,
+            password=BENCH_PASSWORD,
+        )
+    )
+    logins = []
+    for records in generator.users(hash_password(BENCH_PASSWORD)):
+        await db_session.execute(
+            insert(User),
+            [
+                {'login': login, 'password': password}
+                for login, password in records
+            ],
+        )
+        logins.extend(login for login, _ in records)
+    await db_session.commit()
+    ids = dict(
+        (
+            await db_session.execute(
+                select(User.login, User.id).where(User.login.in_(logins))
+            )
+        ).all()
+    )
+
+    for records in generator.posts([ids[login] for login in logins]):
+        await post_crud.copy_records(
+            db_session, columns=POST_COLUMNS, records=records
+        )
+    await db_session.commit()
+
+    stmt = select(func.min(Post.id), func.max(Post.id))
+    first_id, last_id = (await db_session.execute(stmt)).one()
+    return BenchData(
+        logins, BENCH_PASSWORD, first_id, last_id, generator.vocabulary
+    )
+
+
+@pytest.fixture
+def bench(
+    bench_options, bench_report
+) -> Callable[..., Awaitable[dict[str, Any]]]:
+    async def run(
+        name: str,
+        send: Callable[[int], Awaitable[Any]],
+        *,
+        expected_status: int = 200,
+        requests: int | None = None,
+    ) -> dict[str, Any]:
+        result = await drive(
+            send,
+            requests=requests or bench_options.requests,
+            concurrency=bench_options.concurrency,
+            expected_status=expected_status,
+        )
+        bench_report.add(name, result)
+        return result
+
+    return run
@@ -0,0 +1,110 @@
+"""
+Нагрузка на обработчики API и отчёт о задержках для benchmarks/bench_*.py
+"""
+import asyncio
+import itertools
+import platform
+import subprocess
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, NamedTuple
+
+import orjson
+from httpx import Response
+
+from benchmarks.search_backends import percentiles
+
+
+class BenchOptions(NamedTuple):
+    users: int
+    posts: int
+    requests: int
+    concurrency: int
+    seed: int
+    report: Path
+
+
+async def drive(
+    send: Callable[[int], Awaitable[Response]],
+    *,
+    requests: int,
+    concurrency: int,
+    expected_status: int,
+) -> dict[str, Any]:
+    """
+    Выполнение requests запросов send(i) в concurrency параллельных
+    потоков. Ответы с кодом, отличным от expected_status, считаются
+    ошибками и не входят в задержки
+    """
+
+    numbers = itertools.count()
+    latencies: list[float] = []
+    errors: dict[int, int] = {}
+
+    async def worker() -> None:
+        while (number := next(numbers)) < requests:
+            started_at = time.perf_counter()
+            response = await send(number)
+            elapsed = time.perf_counter() - started_at
+            if response.status_code == expected_status:
+                latencies.append(elapsed)
+            else:
+                errors[response.status_code] = (
+                    errors.get(response.status_code, 0) + 1
+                )
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started_at
+
+    result = {
+        'requests': requests,
+        'concurrency': concurrency,
+        'errors': sum(errors.values()),
+        'error_statuses': {str(code): n for code, n in errors.items()},
+        'elapsed_s': round(elapsed, 3),
+        'rps': round(requests / elapsed, 1),
+    }
+    if len(latencies) > 1:
+        result.update(percentiles(latencies))
+
+    return result
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class BenchReport:
+    """
+    Результаты прогона в машиночитаемом виде для сравнения между коммитами
+    """
+
+    def __init__(self, options: BenchOptions) -> None:
+        self.options = options
+        self.results: dict[str, dict[str, Any]] = {}
+
+    def add(self, name: str, result: dict[str, Any]) -> None:
+        self.results[name] = result
+
+    def write(self) -> None:
+        report = {
+            'commit': git_commit(),
+            'created_at': datetime.now(UTC).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'users': self.options.users,
+            'posts': self.options.posts,
+            'results': self.results,
+        }
+        self.options.report.write_bytes(
+            orjson.dumps(report, option=orjson.OPT_INDENT_2)
+        )
@@ -0,0 +1,129 @@
+"""
+Сравнение путей чтения списка постов: ORM-объекты с валидацией
+response_model и строки выборки с прямой сериализацией orjson.
+
+Запуск:
+    python -m benchmarks.post_lists --posts 100000 --page 500
+
+Данные генерируются в отдельной базе (по умолчанию
+<POSTGRES_TEST_DB>_bench) и переиспользуются между запусками.
+"""
+import argparse
+import asyncio
+import random
+import time
+from typing import Any, Awaitable, Callable
+
+import orjson
+from pydantic import TypeAdapter
+from sqlalchemy import NullPool, func, select
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from benchmarks.search_backends import (
+    percentiles,
+    prepare_database,
+    seed_posts,
+)
+from src.core.config import settings
+from src.models import Base
+from src.models.post import Post
+from src.repositories.base import fetch_rows, select_rows
+from src.schemas.post import PostInDB, PostRow
+from src.services.seed import make_vocabulary
+
+posts_adapter = TypeAdapter(list[PostInDB])
+
+
+async def orm_page(db: AsyncSession, offset: int, limit: int) -> bytes:
+    # как FastAPI с response_model: объекты сессии, валидация, сериализация
+    stmt = select(Post).order_by(Post.id).offset(offset).limit(limit)
+    result = await db.execute(statement=stmt)
+    posts = posts_adapter.validate_python(
+        result.scalars().all(), from_attributes=True
+    )
+    return orjson.dumps(posts_adapter.dump_python(posts, mode='json'))
+
+
+async def rows_page(db: AsyncSession, offset: int, limit: int) -> bytes:
+    stmt = (
+        select_rows(Post, PostRow)
+        .order_by(Post.id)
+        .offset(offset)
+        .limit(limit)
+    )
+    return orjson.dumps(await fetch_rows(db, stmt, PostRow))
+
+
+async def measure(
+    session_factory: async_sessionmaker,
+    page: Callable[[AsyncSession, int, int], Awaitable[bytes]],
+    offsets: list[int],
+    limit: int,
+) -> dict[str, Any]:
+    latencies = []
+    async with session_factory() as db:
+        for offset in offsets:
+            started = time.perf_counter()
+            await page(db, offset, limit)
+            latencies.append(time.perf_counter() - started)
+            # сессия живёт один запрос, как в обработчике
+            db.expunge_all()
+    return percentiles(latencies)
+
+
+async def run(args: argparse.Namespace) -> dict:
+    rnd = random.Random(args.seed)
+    dsn = await prepare_database(args.database)
+    engine = create_async_engine(dsn, poolclass=NullPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await seed_posts(dsn, args.posts, make_vocabulary(rnd), rnd)
+
+    session_factory = async_sessionmaker(
+        bind=engine, class_=AsyncSession, expire_on_commit=False
+    )
+    async with session_factory() as db:
+        total = await db.scalar(select(func.count()).select_from(Post))
+    offsets = [
+        rnd.randrange(max(total - args.page, 1)) for _ in range(args.pages)
+    ]
+
+    paths = {'orm': orm_page, 'rows': rows_page}
+    report = {
+        'posts': total,
+        'page': args.page,
+        'pages': args.pages,
+        'paths': {},
+    }
+    for name, page in paths.items():
+        # прогрев соединения и кэша подготовленных запросов
+        await measure(session_factory, page, offsets[:3], args.page)
+        report['paths'][name] = await measure(
+            session_factory, page, offsets, args.page
+        )
+
+    await engine.dispose()
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--posts', type=int, default=100_000)
+    parser.add_argument('--page', type=int, default=500)
+    parser.add_argument('--pages', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument(
+        '--database', default=f'{settings.postgres_test_db}_bench'
+    )
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    print(orjson.dumps(report, option=orjson.OPT_INDENT_2).decode())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,187 @@
+"""
+Сравнение задержек поисковых движков: ILIKE, полнотекстовый поиск Postgres
+и BM25 по индексу в памяти.
+
+Запуск:
+    python -m benchmarks.search_backends --posts 1000000 --queries 100
+
+Данные генерируются в отдельной базе (по умолчанию
+<POSTGRES_TEST_DB>_bench) и переиспользуются между запусками.
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+import asyncpg
+import orjson
+from sqlalchemy import NullPool
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from src.core.config import settings
+from src.models import Base
+from src.models.post import Post
+from src.search.memory import MemorySearchBackend
+from src.search.sql import FullTextSearchBackend, SubstringSearchBackend
+from src.services.seed import make_vocabulary
+
+WORDS_PER_POST = 40
+COPY_BATCH_SIZE = 50000
+RESULT_LIMIT = 20
+
+
+def zipf_weights(size: int) -> list[float]:
+    weights = []
+    total = 0.0
+    for rank in range(1, size + 1):
+        total += 1 / rank
+        weights.append(total)
+    return weights
+
+
+async def prepare_database(database: str) -> str:
+    conn = await asyncpg.connect(
+        settings.dsn.replace('postgresql+asyncpg', 'postgresql')
+    )
+    exists = await conn.fetchval(
+        'SELECT 1 FROM pg_database WHERE datname = $1', database
+    )
+    if not exists:
+        await conn.execute(f'CREATE DATABASE {database}')
+    await conn.close()
+
+    return settings.dsn.rsplit('/', 1)[0] + f'/{database}'
+
+
+async def seed_posts(
+    dsn: str, posts: int, vocabulary: list[str], rnd: random.Random
+) -> None:
+    conn = await asyncpg.connect(
+        dsn.replace('postgresql+asyncpg', 'postgresql')
+    )
+    existing = await conn.fetchval('SELECT count(*) FROM post')
+    if existing >= posts:
+        await conn.close()
+        return
+
+    user_id = await conn.fetchval(
+        'INSERT INTO "user" (login, password) VALUES ($1, $2) '
+        'ON CONFLICT (login) DO UPDATE SET login = EXCLUDED.login '
+        'RETURNING id',
+        'bench_user',
+        '-',
+    )
+    cum_weights = zipf_weights(len(vocabulary))
+    start = datetime(2020, 1, 1)
+    remaining = posts - existing
+    while remaining:
+        size = min(COPY_BATCH_SIZE, remaining)
+        records = []
+        for _ in range(size):
+            words = rnd.choices(
+                vocabulary, cum_weights=cum_weights, k=WORDS_PER_POST
+            )
+            created_at = start + timedelta(minutes=rnd.randint(0, 2_500_000))
+            records.append(
+                (
+                    user_id,
+                    ' '.join(words[:4]),
+                    ' '.join(words[4:]),
+                    created_at,
+                    created_at,
+                )
+            )
+        await conn.copy_records_to_table(
+            'post',
+            records=records,
+            columns=[
+                'user_id', 'title', 'content', 'created_at', 'updated_at'
+            ],
+        )
+        remaining -= size
+        print(f'seeded {posts - remaining}/{posts}')
+    await conn.execute('ANALYZE post')
+    await conn.close()
+
+
+def percentiles(latencies: list[float]) -> dict[str, float]:
+    cuts = statistics.quantiles(latencies, n=100, method='inclusive')
+    return {
+        'p50_ms': round(cuts[49] * 1000, 3),
+        'p95_ms': round(cuts[94] * 1000, 3),
+        'p99_ms': round(cuts[98] * 1000, 3),
+        'max_ms': round(max(latencies) * 1000, 3),
+    }
+
+
+async def run(args: argparse.Namespace) -> dict:
+    rnd = random.Random(args.seed)
+    vocabulary = make_vocabulary(rnd)
+    dsn = await prepare_database(args.database)
+    engine = create_async_engine(dsn, poolclass=NullPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await seed_posts(dsn, args.posts, vocabulary, rnd)
+
+    session_factory = async_sessionmaker(
+        bind=engine, class_=AsyncSession, expire_on_commit=False
+    )
+    memory = MemorySearchBackend(Post)
+    async with session_factory() as db:
+        started = time.perf_counter()
+        await memory.build(db)
+        build_seconds = time.perf_counter() - started
+
+    # запросы из одного-двух слов средней частоты
+    queries = [
+        ' '.join(rnd.sample(vocabulary[100:5000], k=rnd.randint(1, 2)))
+        for _ in range(args.queries)
+    ]
+    backends = {
+        'ilike': SubstringSearchBackend(Post),
+        'fts': FullTextSearchBackend(Post),
+        'memory': memory,
+    }
+    report = {
+        'posts': len(memory.index),
+        'queries': args.queries,
+        'index_build_s': round(build_seconds, 3),
+        'backends': {},
+    }
+    for name, backend in backends.items():
+        latencies = []
+        async with session_factory() as db:
+            for query in queries:
+                started = time.perf_counter()
+                await backend.search(
+                    db, search_str=query, offset=0, limit=RESULT_LIMIT
+                )
+                latencies.append(time.perf_counter() - started)
+        report['backends'][name] = percentiles(latencies)
+
+    await engine.dispose()
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--posts', type=int, default=1_000_000)
+    parser.add_argument('--queries', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument(
+        '--database', default=f'{settings.postgres_test_db}_bench'
+    )
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    print(orjson.dumps(report, option=orjson.OPT_INDENT_2).decode())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,188 @@
+"""06_post_monthly_counts_statement_triggers
+
+Revision ID: 3b7c9d1e5f20
+Revises: e421cd5c88a6
+Create Date: 2026-10-18 19:05:12.418233
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '3b7c9d1e5f20'
+down_revision = 'e421cd5c88a6'
+branch_labels = None
+depends_on = None
+
+
+POST_MONTHLY_COUNTS_FUNCTION = """
+CREATE OR REPLACE FUNCTION post_monthly_counts_update() RETURNS trigger AS $$
+DECLARE
+    user_ids integer[];
+    months date[];
+    deltas integer[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO post_monthly_counts (user_id, month, count)
+        SELECT user_id, date_trunc('month', created_at)::date, count(*)
+        FROM new_rows
+        GROUP BY 1, 2
+        ORDER BY 1, 2
+        ON CONFLICT (user_id, month)
+        DO UPDATE SET count = post_monthly_counts.count + EXCLUDED.count;
+        RETURN NULL;
+    ELSIF TG_OP = 'DELETE' THEN
+        SELECT
+            array_agg(user_id ORDER BY user_id, month),
+            array_agg(month ORDER BY user_id, month),
+            array_agg(-delta ORDER BY user_id, month)
+        INTO user_ids, months, deltas
+        FROM (
+            SELECT user_id, date_trunc('month', created_at)::date AS month,
+                count(*)::integer AS delta
+            FROM old_rows
+            GROUP BY 1, 2
+        ) AS changes;
+    ELSE
+        SELECT
+            array_agg(user_id ORDER BY user_id, month),
+            array_agg(month ORDER BY user_id, month),
+            array_agg(delta ORDER BY user_id, month)
+        INTO user_ids, months, deltas
+        FROM (
+            SELECT user_id, month, sum(delta)::integer AS delta
+            FROM (
+                SELECT user_id,
+                    date_trunc('month', created_at)::date AS month,
+                    1 AS delta
+                FROM new_rows
+                UNION ALL
+                SELECT user_id, date_trunc('month', created_at)::date, -1
+                FROM old_rows
+            ) AS row_changes
+            GROUP BY 1, 2
+            HAVING sum(delta) <> 0
+        ) AS changes;
+    END IF;
+    IF user_ids IS NULL THEN
+        RETURN NULL;
+    END IF;
+
+    -- блокировка существующих счётчиков в порядке (user_id, month)
+    PERFORM 1
+    FROM post_monthly_counts AS counts
+    JOIN unnest(user_ids, months) AS changes (user_id, month)
+        ON counts.user_id = changes.user_id
+        AND counts.month = changes.month
+    ORDER BY counts.user_id, counts.month
+    FOR UPDATE OF counts;
+
+    -- уменьшаются только существующие счётчики: счётчики удалённого
+    -- пользователя уже удалены каскадом вместе с ним
+    UPDATE post_monthly_counts AS counts
+    SET count = counts.count + changes.delta
+    FROM unnest(user_ids, months, deltas) AS changes (user_id, month, delta)
+    WHERE changes.delta < 0
+        AND counts.user_id = changes.user_id
+        AND counts.month = changes.month;
+    DELETE FROM post_monthly_counts AS counts
+    USING unnest(user_ids, months, deltas) AS changes (user_id, month, delta)
+    WHERE changes.delta < 0
+        AND counts.user_id = changes.user_id
+        AND counts.month = changes.month
+        AND counts.count <= 0;
+
+    INSERT INTO post_monthly_counts (user_id, month, count)
+    SELECT user_id, month, delta
+    FROM unnest(user_ids, months, deltas) AS changes (user_id, month, delta)
+    WHERE delta > 0
+    ORDER BY 1, 2
+    ON CONFLICT (user_id, month)
+    DO UPDATE SET count = post_monthly_counts.count + EXCLUDED.count;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+POST_MONTHLY_COUNTS_ROW_FUNCTION = """
+CREATE OR REPLACE FUNCTION post_monthly_counts_update() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE post_monthly_counts SET count = count - 1
+        WHERE user_id = OLD.user_id
+            AND month = date_trunc('month', OLD.created_at)::date;
+        DELETE FROM post_monthly_counts
+        WHERE user_id = OLD.user_id
+            AND month = date_trunc('month', OLD.created_at)::date
+            AND count <= 0;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'INSERT') THEN
+        INSERT INTO post_monthly_counts (user_id, month, count)
+        VALUES (NEW.user_id, date_trunc('month', NEW.created_at)::date, 1)
+        ON CONFLICT (user_id, month)
+        DO UPDATE SET count = post_monthly_counts.count + 1;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def upgrade() -> None:
+    # замена триггеров в одной транзакции: изменения post между
+    # удалением старых и созданием новых триггеров не теряются
+    op.execute('LOCK TABLE post IN SHARE ROW EXCLUSIVE MODE')
+    op.execute('DROP TRIGGER post_monthly_counts_update ON post')
+    op.execute('DROP TRIGGER post_monthly_counts_insert_delete ON post')
+    op.execute(POST_MONTHLY_COUNTS_FUNCTION)
+    op.execute(
+        """
+        CREATE TRIGGER post_monthly_counts_insert
+        AFTER INSERT ON post
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION post_monthly_counts_update()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER post_monthly_counts_delete
+        AFTER DELETE ON post
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION post_monthly_counts_update()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER post_monthly_counts_update
+        AFTER UPDATE ON post
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION post_monthly_counts_update()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute('LOCK TABLE post IN SHARE ROW EXCLUSIVE MODE')
+    op.execute('DROP TRIGGER post_monthly_counts_update ON post')
+    op.execute('DROP TRIGGER post_monthly_counts_delete ON post')
+    op.execute('DROP TRIGGER post_monthly_counts_insert ON post')
+    op.execute(POST_MONTHLY_COUNTS_ROW_FUNCTION)
+    op.execute(
+        """
+        CREATE TRIGGER post_monthly_counts_insert_delete
+        AFTER INSERT OR DELETE ON post
+        FOR EACH ROW EXECUTE FUNCTION post_monthly_counts_update()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER post_monthly_counts_update
+        AFTER UPDATE OF user_id, created_at ON post
+        FOR EACH ROW
+        WHEN (
+            OLD.user_id IS DISTINCT FROM NEW.user_id
+            OR OLD.created_at IS DISTINCT FROM NEW.created_at
+        )
+        EXECUTE FUNCTION post_monthly_counts_update()
+        """
+    )
@@ -0,0 +1,47 @@
+"""03_post_search_vector
+
+Revision ID: 5086fd755aac
+Revises: f2b5526012fc
+Create Date: 2026-10-18 17:21:28.648340
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '5086fd755aac'
+down_revision = 'f2b5526012fc'
+branch_labels = None
+depends_on = None
+
+
+SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('russian', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('russian', coalesce(content, '')), 'B')"
+)
+
+
+def upgrade() -> None:
+    op.add_column(
+        'post',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(SEARCH_VECTOR_EXPRESSION, persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        'ix_post_search_vector',
+        'post',
+        ['search_vector'],
+        unique=False,
+        postgresql_using='gin',
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_post_search_vector', table_name='post')
+    op.drop_column('post', 'search_vector')
@@ -0,0 +1,91 @@
+"""04_post_monthly_counts
+
+Revision ID: 825aa79ae1b1
+Revises: 5086fd755aac
+Create Date: 2026-10-18 17:26:40.631450
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '825aa79ae1b1'
+down_revision = '5086fd755aac'
+branch_labels = None
+depends_on = None
+
+
+POST_MONTHLY_COUNTS_FUNCTION = """
+CREATE OR REPLACE FUNCTION post_monthly_counts_update() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE post_monthly_counts SET count = count - 1
+        WHERE user_id = OLD.user_id
+            AND month = date_trunc('month', OLD.created_at)::date;
+        DELETE FROM post_monthly_counts
+        WHERE user_id = OLD.user_id
+            AND month = date_trunc('month', OLD.created_at)::date
+            AND count <= 0;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'INSERT') THEN
+        INSERT INTO post_monthly_counts (user_id, month, count)
+        VALUES (NEW.user_id, date_trunc('month', NEW.created_at)::date, 1)
+        ON CONFLICT (user_id, month)
+        DO UPDATE SET count = post_monthly_counts.count + 1;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def upgrade() -> None:
+    op.create_index('ix_post_user_id', 'post', ['user_id'], unique=False)
+    op.create_table('post_monthly_counts',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('month', sa.Date(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'month')
+    )
+
+    # блокировка записи в post, чтобы не потерять изменения
+    # между заполнением счётчиков и созданием триггеров
+    op.execute('LOCK TABLE post IN SHARE ROW EXCLUSIVE MODE')
+    op.execute(POST_MONTHLY_COUNTS_FUNCTION)
+    op.execute(
+        """
+        CREATE TRIGGER post_monthly_counts_insert_delete
+        AFTER INSERT OR DELETE ON post
+        FOR EACH ROW EXECUTE FUNCTION post_monthly_counts_update()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER post_monthly_counts_update
+        AFTER UPDATE OF user_id, created_at ON post
+        FOR EACH ROW
+        WHEN (
+            OLD.user_id IS DISTINCT FROM NEW.user_id
+            OR OLD.created_at IS DISTINCT FROM NEW.created_at
+        )
+        EXECUTE FUNCTION post_monthly_counts_update()
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO post_monthly_counts (user_id, month, count)
+        SELECT user_id, date_trunc('month', created_at)::date, count(*)
+        FROM post
+        GROUP BY 1, 2
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute('DROP TRIGGER post_monthly_counts_update ON post')
+    op.execute('DROP TRIGGER post_monthly_counts_insert_delete ON post')
+    op.execute('DROP FUNCTION post_monthly_counts_update()')
+    op.drop_table('post_monthly_counts')
+    op.drop_index('ix_post_user_id', table_name='post')
@@ -0,0 +1,35 @@
+"""05_post_excerpt
+
+Revision ID: e421cd5c88a6
+Revises: 825aa79ae1b1
+Create Date: 2026-10-18 17:43:21.550521
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e421cd5c88a6'
+down_revision = '825aa79ae1b1'
+branch_labels = None
+depends_on = None
+
+
+EXCERPT_EXPRESSION = 'left(content, 200)'
+
+
+def upgrade() -> None:
+    op.add_column(
+        'post',
+        sa.Column(
+            'excerpt',
+            sa.String(),
+            sa.Computed(EXCERPT_EXPRESSION, persisted=True),
+            nullable=True,
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('post', 'excerpt')
@@ -0,0 +1,26 @@
+"""02_post_created_at_id_index
+
+Revision ID: f2b5526012fc
+Revises: db6b0a213aed
+Create Date: 2026-10-18 17:20:34.450081
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2b5526012fc'
+down_revision = 'db6b0a213aed'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_post_created_at_id', 'post', ['created_at', 'id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_post_created_at_id', table_name='post')
@@ -1,40 +1,283 @@
-from typing import Any
+from dataclasses import fields as dataclass_fields
+from datetime import date
+from functools import partial
+from typing import Annotated, Any, AsyncIterator, Awaitable, Callable
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+    status,
+)
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.core.auth import get_current_user
-from src.core.config import logger
+from src.core.auth import (
+    get_admin_user,
+    get_current_user,
+    get_request_user_id,
+)
+from src.core.config import logger, settings
+from src.core.http_cache import (
+    cache_headers,
+    is_conditional,
+    is_not_modified,
+    make_etag,
+    not_modified,
+)
+from src.core.logger import SAMPLED
+from src.core.pagination import Page, decode_cursor, encode_cursor
+from src.core.response_cache import response_cache
 from src.db.postgres import get_session
-from src.models import User
+from src.db.replicas import (
+    get_read_session,
+    get_read_session_factory,
+    is_replica_session,
+    read_router,
+)
 from src.repositories.post import post_crud
-from src.schemas.post import PostCreate, PostInDB, PostUpdate
+from src.schemas.post import (
+    POST_FIELDS,
+    ExportFormat,
+    PostCreate,
+    PostInDB,
+    PostRow,
+    PostsBulkDelete,
+    PostsBulkResult,
+    PostsBulkUpdate,
+    PostsImportReport,
+    PostsStatistics,
+    PostsStatisticsPeriod,
+    PostsStatisticsRequest,
+    PostUpdate,
+    SearchMode,
+    post_row_type,
+)
+from src.schemas.user import User
 from src.services.avg_posts_per_month_for_user import (
     retrieve_avg_posts_per_month,
+    retrieve_avg_posts_per_month_for_users,
 )
+from src.services.export_posts import EXPORT_MEDIA_TYPES, export_posts
+from src.services.import_posts import READ_CHUNK_SIZE, import_posts
 
 post_router = APIRouter()
 
+# строки без полей: для проверки условных запросов достаточно ключей
+PAGE_KEYS_ROW = post_row_type(())
+
 
 @post_router.get(
     '/',
     response_model=list[PostInDB],
     summary='Получение постов',
-    description='Возвращает список всех постов блога',
+    description=(
+        'Возвращает список всех постов блога. Без offset посты отдаются '
+        'от новых к старым постранично по курсору: ссылки на соседние '
+        'страницы передаются в заголовке Link (параметры after/before). '
+        'Параметр fields ограничивает поля постов, например '
+        'fields=id,title,excerpt. Ответ содержит ETag; при совпадении '
+        'If-None-Match возвращается 304. Готовые ответы кэшируются '
+        'и отдаются сжатыми gzip, если клиент это поддерживает'
+    ),
 )
 async def get_posts(
     *,
-    db: AsyncSession = Depends(get_session),
+    request: Request,
+    db: AsyncSession = Depends(get_read_session),
     offset: int | None = None,
     limit: int | None = None,
+    after: str | None = None,
+    before: str | None = None,
+    fields: str | None = None,
 ) -> Any:
     """
-    Получение списка всех постов блога
+    Получение списка всех постов блога.
+    Посты читаются строками и сериализуются без валидации response_model.
+    Условный запрос проверяется по ключам страницы без чтения постов
     """
 
-    posts = await post_crud.get_multi(db=db, offset=offset, limit=limit)
+    cached = _get_cached_response(request)
+    if cached is not None:
+        return cached
+    generation = response_cache.generation
 
-    return posts
+    row_type = _row_type(fields)
+    if offset is not None:
+        if after is not None or before is not None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail='offset cannot be combined with after/before',
+            )
+        load_page = partial(
+            post_crud.get_multi_rows, db=db, offset=offset, limit=limit
+        )
+    else:
+        if after is not None and before is not None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail='after and before cannot be combined',
+            )
+        try:
+            after_key = decode_cursor(after) if after is not None else None
+            before_key = (
+                decode_cursor(before) if before is not None else None
+            )
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail='Invalid cursor',
+            )
+        load_page = partial(
+            post_crud.get_multi_by_cursor,
+            db=db,
+            after=after_key,
+            before=before_key,
+            limit=limit,
+        )
+
+    if is_conditional(request):
+        page = await load_page(row_type=PAGE_KEYS_ROW)
+        headers = _page_cache_headers(page, row_type)
+        if is_not_modified(request, headers['ETag']):
+            return not_modified(headers)
+
+    page = await load_page(row_type=row_type)
+    response = ORJSONResponse(
+        page.items, headers=_page_cache_headers(page, row_type)
+    )
+    if offset is None and page.items:
+        has_next = page.has_more if before is None else True
+        has_prev = page.has_more if before is not None else after is not None
+        links = _page_links(request, page, has_next, has_prev)
+        if links:
+            response.headers['Link'] = links
+
+    return response_cache.set(request, response, generation)
+
+
+def _get_cached_response(request: Request) -> Response | None:
+    """
+    Получение готового ответа из кэша. Пользователь, чьи чтения
+    закреплены за основной БД, не получает ответы, которые могли быть
+    построены по отстающей реплике
+    """
+
+    if read_router.is_pinned(get_request_user_id(request)):
+        return None
+
+    return response_cache.get(request)
+
+
+def _page_cache_headers(page: Page, row_type: type) -> dict[str, str]:
+    """
+    Заголовки кэширования страницы: ETag зависит от набора полей,
+    идентификаторов и времени изменения постов страницы
+    """
+
+    etag = make_etag(
+        tuple(field.name for field in dataclass_fields(row_type)),
+        page.has_more,
+        [(key[1], key[2]) for key in page.keys],
+    )
+
+    return cache_headers('get_posts', etag, page.last_modified)
+
+
+def _row_type(fields: str | None) -> type:
+    """
+    Тип строк ответа по списку полей из параметра fields
+    """
+
+    if fields is None:
+        return PostRow
+
+    names = tuple(
+        dict.fromkeys(
+            name for name in map(str.strip, fields.split(',')) if name
+        )
+    )
+    unknown = [name for name in names if name not in POST_FIELDS]
+    if unknown or not names:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=(
+                f'Invalid fields: {fields}. '
+                f'Allowed fields: {", ".join(POST_FIELDS)}'
+            ),
+        )
+
+    return post_row_type(names)
+
+
+def _page_links(
+    request: Request, page: Page, has_next: bool, has_prev: bool
+) -> str:
+    """
+    Формирование заголовка Link со ссылками на соседние страницы
+    """
+
+    base_url = request.url.remove_query_params(['after', 'before'])
+    links = []
+    if has_next:
+        cursor = encode_cursor(*page.last)
+        links.append(
+            f'<{base_url.include_query_params(after=cursor)}>; rel="next"'
+        )
+    if has_prev:
+        cursor = encode_cursor(*page.first)
+        links.append(
+            f'<{base_url.include_query_params(before=cursor)}>; rel="prev"'
+        )
+
+    return ', '.join(links)
+
+
+@post_router.get(
+    '/export',
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    summary='Выгрузка постов',
+    description=(
+        'Выгружает посты в формате NDJSON или CSV потоком, не загружая '
+        'их в память целиком. Параметры user_id и from/to ограничивают '
+        'автора и период создания постов'
+    ),
+)
+async def export_posts_stream(
+    *,
+    session_factory: Callable[[], Awaitable[AsyncSession]] = Depends(
+        get_read_session_factory
+    ),
+    export_format: ExportFormat = Query(ExportFormat.ndjson, alias='format'),
+    user_id: int | None = None,
+    date_from: date | None = Query(None, alias='from'),
+    date_to: date | None = Query(None, alias='to'),
+) -> Any:
+    """
+    Потоковая выгрузка постов
+    """
+
+    return StreamingResponse(
+        export_posts(
+            session_factory,
+            export_format=export_format,
+            user_id=user_id,
+            date_from=date_from,
+            date_to=date_to,
+        ),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            'Content-Disposition': (
+                f'attachment; filename="posts.{export_format.value}"'
+            )
+        },
+    )
 
 
 @post_router.get(
@@ -42,23 +285,55 @@ async def get_posts(
     response_model=PostInDB,
     status_code=status.HTTP_200_OK,
     summary='Получение поста',
-    description='Возвращает пост по идентификатору',
+    description=(
+        'Возвращает пост по идентификатору. Ответ содержит ETag '
+        'и Last-Modified; условные запросы If-None-Match '
+        'и If-Modified-Since получают 304, если пост не изменился'
+    ),
 )
 async def get_post(
     post_id: int,
     *,
-    db: AsyncSession = Depends(get_session),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_session),
 ) -> Any:
     """
-    Получение поста по идентификатору
+    Получение поста по идентификатору.
+    Условный запрос проверяется по времени изменения поста
+    без чтения содержимого. Пользователь, закреплённый за основной БД
+    после записи, читает мимо кэша; прочитанное с реплики в кэш
+    не попадает
     """
 
-    post = await post_crud.get(db=db, obj_id=post_id)
+    use_cache = not read_router.is_pinned(get_request_user_id(request))
+    if is_conditional(request):
+        updated_at = await post_crud.get_updated_at(
+            db=db, obj_id=post_id, use_cache=use_cache
+        )
+        if updated_at is not None:
+            headers = cache_headers(
+                'get_post', make_etag(post_id, updated_at), updated_at
+            )
+            if is_not_modified(request, headers['ETag'], updated_at):
+                return not_modified(headers)
+
+    post = await post_crud.get_cached(
+        db=db,
+        obj_id=post_id,
+        use_cache=use_cache,
+        fill_cache=not is_replica_session(db),
+    )
     if not post:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f'Post(id={post_id}) not found',
         )
+    response.headers.update(
+        cache_headers(
+            'get_post', make_etag(post.id, post.updated_at), post.updated_at
+        )
+    )
 
     return post
 
@@ -82,15 +357,178 @@ async def create_post(
     post.user_id = user.id
     post = await post_crud.create(db=db, obj=post)
     logger.info(
-        (
-            f'User [login:{user.login}, id:{user.id}] created post '
-            f'[id:{post.id}, title:{post.title}]'
-        )
+        'User [login:%s, id:%s] created post [id:%s, title:%s]',
+        user.login,
+        user.id,
+        post.id,
+        post.title,
+        extra=SAMPLED,
     )
 
     return post
 
 
+@post_router.post(
+    '/bulk',
+    response_model=list[PostInDB],
+    status_code=status.HTTP_201_CREATED,
+    summary='Создание нескольких постов',
+    description=(
+        'Создаёт список постов одним запросом к БД. Размер списка '
+        'ограничен настройкой POST_BULK_MAX_SIZE'
+    ),
+)
+async def create_posts_bulk(
+    *,
+    db: AsyncSession = Depends(get_session),
+    user: User = Depends(get_current_user),
+    posts: list[PostCreate] = Body(
+        min_length=1, max_length=settings.post_bulk_max_size
+    ),
+) -> Any:
+    """
+    Создание нескольких постов
+    """
+
+    for post in posts:
+        post.user_id = user.id
+    posts = await post_crud.create_many(db=db, objs=posts)
+    logger.info(
+        'User [login:%s, id:%s] created %s posts [ids:%s..%s]',
+        user.login,
+        user.id,
+        len(posts),
+        posts[0].id,
+        posts[-1].id,
+    )
+
+    return posts
+
+
+@post_router.post(
+    '/import',
+    response_model=PostsImportReport,
+    status_code=status.HTTP_200_OK,
+    summary='Импорт постов',
+    description=(
+        'Загружает посты из файла NDJSON или CSV (формат выгрузки) '
+        'командой COPY пачками по POST_IMPORT_BATCH_SIZE строк. '
+        'Ошибочные строки и пачки попадают в отчёт и не прерывают импорт. '
+        'Доступно администраторам'
+    ),
+)
+async def import_posts_file(
+    file: UploadFile,
+    *,
+    db: AsyncSession = Depends(get_session),
+    user: User = Depends(get_admin_user),
+    export_format: ExportFormat = Query(ExportFormat.ndjson, alias='format'),
+) -> Any:
+    """
+    Импорт постов из файла
+    """
+
+    async def read_chunks() -> AsyncIterator[bytes]:
+        while chunk := await file.read(READ_CHUNK_SIZE):
+            yield chunk
+
+    report = await import_posts(
+        db,
+        read_chunks(),
+        export_format=export_format,
+        batch_size=settings.post_import_batch_size,
+    )
+    logger.info(
+        'User [login:%s, id:%s] imported %s posts from %s',
+        user.login,
+        user.id,
+        report.inserted,
+        file.filename,
+    )
+
+    return report
+
+
+@post_router.patch(
+    '/bulk',
+    response_model=PostsBulkResult,
+    summary='Обновление нескольких постов',
+    description=(
+        'Обновляет содержимое постов из списка одним запросом к БД. '
+        'Возвращает обновлённые посты и список ненайденных идентификаторов'
+    ),
+)
+async def update_posts_bulk(
+    *,
+    db: AsyncSession = Depends(get_session),
+    user: User = Depends(get_current_user),
+    data: PostsBulkUpdate,
+) -> Any:
+    """
+    Обновление содержимого нескольких постов
+    """
+
+    data.data.user_id = user.id
+    posts = await post_crud.patch_many(
+        db=db, obj_ids=data.ids, data=data.data
+    )
+    logger.info(
+        'User [login:%s, id:%s] updated %s posts [ids:%s]',
+        user.login,
+        user.id,
+        len(posts),
+        tuple(post.id for post in posts),
+    )
+
+    return _bulk_result(data.ids, posts)
+
+
+@post_router.delete(
+    '/bulk',
+    response_model=PostsBulkResult,
+    status_code=status.HTTP_200_OK,
+    summary='Удаление нескольких постов',
+    description=(
+        'Удаляет посты из списка одним запросом к БД. Возвращает '
+        'удалённые посты и список ненайденных идентификаторов'
+    ),
+)
+async def delete_posts_bulk(
+    *,
+    db: AsyncSession = Depends(get_session),
+    user: User = Depends(get_current_user),
+    data: PostsBulkDelete,
+) -> Any:
+    """
+    Удаление нескольких постов
+    """
+
+    posts = await post_crud.delete_many(db=db, obj_ids=data.ids)
+    logger.info(
+        'User [login:%s, id:%s] deleted %s posts [ids:%s]',
+        user.login,
+        user.id,
+        len(posts),
+        tuple(post.id for post in posts),
+    )
+
+    return _bulk_result(data.ids, posts)
+
+
+def _bulk_result(ids: list[int], posts: list) -> dict[str, list]:
+    """
+    Формирование результата пакетной операции в порядке запроса
+    """
+
+    by_id = {post.id: post for post in posts}
+    ids = list(dict.fromkeys(ids))
+
+    return {
+        'posts': [by_id[post_id] for post_id in ids if post_id in by_id],
+        'not_found': [post_id for post_id in ids if post_id not in by_id],
+    }
+
+
 @post_router.delete(
     '/{post_id}',
     response_model=PostInDB,
@@ -115,10 +553,12 @@ async def delete_post(
             detail=f'Post(id={post_id}) not found',
         )
     logger.info(
-        (
-            f'User [login:{user.login}, id:{user.id}] deleted post '
-            f'[id:{post.id}, title:{post.title}]'
-        )
+        'User [login:%s, id:%s] deleted post [id:%s, title:%s]',
+        user.login,
+        user.id,
+        post.id,
+        post.title,
+        extra=SAMPLED,
     )
 
 
@@ -150,10 +590,12 @@ async def update_post(
             detail=f'Post(id={post_id}) not found',
         )
     logger.info(
-        (
-            f'User [login:{user.login}, id:{user.id}] updated post '
-            f'[id:{post.id}, title:{post.title}]'
-        )
+        'User [login:%s, id:%s] updated post [id:%s, title:%s]',
+        user.login,
+        user.id,
+        post.id,
+        post.title,
+        extra=SAMPLED,
     )
 
     return post
@@ -163,44 +605,98 @@ async def update_post(
     '/statistics/{user_id}',
     status_code=status.HTTP_200_OK,
     summary='Получение среднего количества постов пользователя за месяц',
-    description='Возвращает среднее количества постов пользователя за месяц',
+    description=(
+        'Возвращает среднее количества постов пользователя за месяц. '
+        'Параметры from/to ограничивают период (с точностью до месяца)'
+    ),
 )
 async def get_user_avg_posts_month(
     user_id: int,
     *,
-    db: AsyncSession = Depends(get_session),
+    db: AsyncSession = Depends(get_read_session),
+    period: Annotated[PostsStatisticsPeriod, Query()],
 ) -> dict[str, int]:
     """
     Получение среднего количества постов пользователя за месяц
     """
 
     avg_posts_month = await retrieve_avg_posts_per_month(
-        db=db, user_id=user_id
+        db=db,
+        user_id=user_id,
+        date_from=period.date_from,
+        date_to=period.date_to,
     )
 
     return {'avg_posts_month': avg_posts_month}
 
 
+@post_router.post(
+    '/statistics',
+    response_model=PostsStatistics,
+    status_code=status.HTTP_200_OK,
+    summary='Получение среднего количества постов за месяц для пользователей',
+    description=(
+        'Возвращает среднее количество постов за месяц для каждого '
+        'пользователя из списка и список ненайденных пользователей'
+    ),
+)
+async def get_users_avg_posts_month(
+    *,
+    db: AsyncSession = Depends(get_read_session),
+    data: PostsStatisticsRequest,
+) -> Any:
+    """
+    Получение среднего количества постов за месяц для списка пользователей
+    """
+
+    return await retrieve_avg_posts_per_month_for_users(
+        db=db,
+        user_ids=data.user_ids,
+        date_from=data.date_from,
+        date_to=data.date_to,
+    )
+
+
 @post_router.get(
     '/search/{search_str}',
     response_model=list[PostInDB],
     status_code=status.HTTP_200_OK,
     summary='Поиск постов по названию или содержанию',
-    description='Возвращает посты отфильтрованные по названию или содержанию',
+    description=(
+        'Возвращает посты отфильтрованные по названию или содержанию. '
+        'Режимы: fts - полнотекстовый поиск Postgres с сортировкой '
+        'по релевантности, ilike - поиск подстроки, memory - поиск BM25 '
+        'по индексу в памяти сервиса. Параметр fields ограничивает поля '
+        'постов, как в списке постов. Готовые ответы кэшируются, как '
+        'и список постов'
+    ),
 )
 async def search_posts(
     search_str: str,
     *,
-    db: AsyncSession = Depends(get_session),
+    request: Request,
+    db: AsyncSession = Depends(get_read_session),
     offset: int | None = None,
     limit: int | None = None,
+    mode: SearchMode | None = None,
+    fields: str | None = None,
 ) -> Any:
     """
     Получение списка постов отфильтрованных по названию или содержанию
     """
 
+    cached = _get_cached_response(request)
+    if cached is not None:
+        return cached
+    generation = response_cache.generation
+
     posts = await post_crud.search_posts(
-        db=db, search_str=search_str, offset=offset, limit=limit
+        db=db,
+        search_str=search_str,
+        offset=offset,
+        limit=limit,
+        mode=mode,
+        row_type=_row_type(fields),
     )
 
-    return posts
+    return response_cache.set(request, ORJSONResponse(posts), generation)
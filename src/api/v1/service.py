@@ -0,0 +1,99 @@
+from typing import Any
+
+from fastapi import APIRouter, status
+
+from src.core.admission import admission_controller
+from src.core.auth import password_hasher, principal_cache, token_cache
+from src.core.response_cache import response_cache
+from src.db.postgres import engine, get_pool_stats
+from src.db.replicas import read_router
+from src.repositories.post import post_crud
+
+service_router = APIRouter()
+
+
+@service_router.get(
+    '/password-hasher',
+    status_code=status.HTTP_200_OK,
+    summary='Статистика хеширования паролей',
+    description=(
+        'Возвращает число ожидающих и выполняемых операций хеширования '
+        'паролей и время их ожидания в очереди'
+    ),
+)
+async def get_password_hasher_stats() -> dict[str, Any]:
+    """
+    Получение статистики хеширования паролей
+    """
+
+    return password_hasher.stats()
+
+
+@service_router.get(
+    '/cache',
+    status_code=status.HTTP_200_OK,
+    summary='Статистика кэшей',
+    description='Возвращает счётчики попаданий, промахов и вытеснений кэшей',
+)
+async def get_cache_stats() -> dict[str, Any]:
+    """
+    Получение статистики кэшей
+    """
+
+    return {
+        'post': post_crud.cache.stats(),
+        'auth_principal': principal_cache.stats(),
+        'auth_token': token_cache.stats(),
+        'response': response_cache.stats(),
+    }
+
+
+@service_router.get(
+    '/pool',
+    status_code=status.HTTP_200_OK,
+    summary='Статистика пула соединений',
+    description=(
+        'Возвращает число выданных соединений, соединений сверх размера '
+        'пула и время ожидания соединения'
+    ),
+)
+async def get_db_pool_stats() -> dict[str, Any]:
+    """
+    Получение статистики пула соединений с БД
+    """
+
+    return get_pool_stats(engine)
+
+
+@service_router.get(
+    '/replicas',
+    status_code=status.HTTP_200_OK,
+    summary='Статистика реплик',
+    description=(
+        'Возвращает число реплик, недоступных реплик и распределение '
+        'читающих запросов между репликами и основной БД'
+    ),
+)
+async def get_replicas_stats() -> dict[str, Any]:
+    """
+    Получение статистики маршрутизации чтения по репликам
+    """
+
+    return read_router.stats()
+
+
+@service_router.get(
+    '/admission',
+    status_code=status.HTTP_200_OK,
+    summary='Статистика допуска запросов',
+    description=(
+        'Возвращает число выполняемых и ожидающих запросов по группам '
+        'маршрутов и число отклонённых запросов по причинам'
+    ),
+)
+async def get_admission_stats() -> dict[str, Any]:
+    """
+    Получение статистики допуска запросов
+    """
+
+    return admission_controller.stats()
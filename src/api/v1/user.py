@@ -4,7 +4,11 @@ from typing import Any
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.core.auth import authenticate_user, create_access_token, hash_password
+from src.core.auth import (
+    authenticate_user,
+    create_access_token,
+    password_hasher,
+)
 from src.core.config import settings
 from src.db.postgres import get_session
 from src.repositories.user import user_crud
@@ -36,7 +40,7 @@ async def register(
             detail='User already exists',
         )
 
-    obj.password = hash_password(obj.password)
+    obj.password = await password_hasher.hash(obj.password)
     user = await user_crud.create(db=db, obj=obj)
     return user
 
@@ -71,6 +75,7 @@ async def auth(
         seconds=settings.access_token_expire_seconds
     )
     access_token = create_access_token(
-        data={"sub": user.login}, expires_delta=access_token_expires
+        data={"sub": user.login, "uid": user.id},
+        expires_delta=access_token_expires,
     )
     return AccessToken(access_token=access_token, token_type="bearer")
@@ -0,0 +1,55 @@
+"""
+Импорт постов из файла NDJSON или CSV командой COPY.
+
+Запуск:
+    python -m src.cli.import_posts posts.ndjson
+    python -m src.cli.import_posts posts.csv --format csv --batch-size 10000
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+from typing import AsyncIterator
+
+from src.core.config import settings
+from src.db.postgres import async_session, engine
+from src.schemas.post import ExportFormat
+from src.services.import_posts import READ_CHUNK_SIZE, import_posts
+
+
+async def read_chunks(path: Path) -> AsyncIterator[bytes]:
+    with path.open('rb') as file:
+        while chunk := file.read(READ_CHUNK_SIZE):
+            yield chunk
+
+
+async def run(args: argparse.Namespace) -> int:
+    async with async_session() as db:
+        report = await import_posts(
+            db,
+            read_chunks(args.path),
+            export_format=ExportFormat(args.format),
+            batch_size=args.batch_size,
+        )
+    await engine.dispose()
+
+    print(report.model_dump_json(indent=2))
+    return 0 if not report.failed else 1
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('path', type=Path)
+    parser.add_argument(
+        '--format',
+        choices=[export_format.value for export_format in ExportFormat],
+        default=ExportFormat.ndjson.value,
+    )
+    parser.add_argument(
+        '--batch-size', type=int, default=settings.post_import_batch_size
+    )
+    sys.exit(asyncio.run(run(parser.parse_args())))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""
+Заполнение БД сгенерированными пользователями и постами командой COPY.
+
+Запуск:
+    python -m src.cli.seed --users 10000 --posts 1000000
+    python -m src.cli.seed --posts 5000000 --skew 1.3 --truncate --fast \
+        --jobs 8
+    python -m src.cli.seed --posts 5000000 --truncate --drop-indexes
+
+Данные детерминированы: одинаковые параметры и --seed дают одинаковые
+строки, а с --truncate и --jobs 1 - и одинаковые идентификаторы.
+"""
+import argparse
+import asyncio
+from datetime import datetime
+
+import orjson
+
+from src.core.config import settings
+from src.services.seed import SEED_PASSWORD, SeedConfig, seed
+
+
+async def run(args: argparse.Namespace) -> None:
+    config = SeedConfig(
+        users=args.users,
+        posts=args.posts,
+        date_from=args.date_from,
+        date_to=args.date_to,
+        skew=args.skew,
+        content_median=args.content_median,
+        content_sigma=args.content_sigma,
+        content_max=args.content_max,
+        seed=args.seed,
+        batch_size=args.batch_size,
+        password=args.password,
+    )
+    report = await seed(
+        (args.dsn or settings.dsn).replace('postgresql+asyncpg', 'postgresql'),
+        config,
+        jobs=args.jobs,
+        truncate=args.truncate,
+        disable_triggers=args.fast,
+        drop_indexes=args.drop_indexes,
+    )
+
+    print(orjson.dumps(report, option=orjson.OPT_INDENT_2).decode())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--posts', type=int, default=100_000)
+    parser.add_argument(
+        '--skew',
+        type=float,
+        default=1.1,
+        help='показатель распределения Ципфа постов по авторам',
+    )
+    parser.add_argument(
+        '--content-median',
+        type=int,
+        default=600,
+        help='медиана длины содержания в символах',
+    )
+    parser.add_argument('--content-sigma', type=float, default=0.8)
+    parser.add_argument('--content-max', type=int, default=20000)
+    parser.add_argument(
+        '--date-from',
+        type=datetime.fromisoformat,
+        default=datetime(2020, 1, 1),
+    )
+    parser.add_argument(
+        '--date-to', type=datetime.fromisoformat, default=datetime(2025, 1, 1)
+    )
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--batch-size', type=int, default=50000)
+    parser.add_argument(
+        '--password',
+        default=SEED_PASSWORD,
+        help=(
+            'пароль всех сгенерированных пользователей '
+            f'(по умолчанию {SEED_PASSWORD}); логины - seed_user_<номер>'
+        ),
+    )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=1,
+        help='число параллельных соединений для загрузки постов',
+    )
+    parser.add_argument(
+        '--truncate',
+        action='store_true',
+        help='очистить пользователей и посты перед загрузкой',
+    )
+    parser.add_argument(
+        '--fast',
+        action='store_true',
+        help=(
+            'отключить триггеры счётчиков постов на время загрузки '
+            'и пересчитать счётчики после неё'
+        ),
+    )
+    parser.add_argument(
+        '--drop-indexes',
+        action='store_true',
+        help=(
+            'удалить вторичные индексы постов на время загрузки и построить '
+            'их заново после неё (включает --fast); только для БД, '
+            'которую не использует сервис'
+        ),
+    )
+    parser.add_argument('--dsn', help='по умолчанию - БД сервиса')
+    args = parser.parse_args()
+    if args.jobs > 1 and not (args.fast or args.drop_indexes):
+        parser.error('--jobs > 1 requires --fast or --drop-indexes')
+    asyncio.run(run(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,290 @@
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Any
+
+from fastapi import Request, status
+from fastapi.responses import ORJSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.core.auth import get_request_user_id
+from src.core.cache import LRUCache
+from src.core.config import settings
+
+API_PREFIX = '/api/'
+AUTH_PREFIX = '/api/v1/users/'
+SEARCH_PREFIX = '/api/v1/posts/search/'
+STATISTICS_PREFIX = '/api/v1/posts/statistics'
+READ_METHODS = frozenset(('GET', 'HEAD', 'OPTIONS'))
+SHED_RETRY_AFTER = 1
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, reason: str, retry_after: float) -> None:
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class ConcurrencyLimiter:
+    """
+    Ограничение числа одновременно выполняемых запросов группы.
+    Сверх лимита запросы ждут в очереди не дольше timeout секунд;
+    при заполненной очереди запрос отклоняется сразу
+    """
+
+    def __init__(
+        self, *, limit: int, queue_size: int, timeout: float
+    ) -> None:
+        self.limit = limit
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.active = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self.admitted = 0
+        self.shed = {'queue_full': 0, 'timeout': 0, 'rate_limit': 0}
+        self.max_queue_depth = 0
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> None:
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            self.admitted += 1
+            return
+
+        if len(self._waiters) >= self.queue_size:
+            self.shed['queue_full'] += 1
+            raise AdmissionRejected('queue_full', SHED_RETRY_AFTER)
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.max_queue_depth = max(self.max_queue_depth, len(self._waiters))
+        try:
+            await asyncio.wait_for(waiter, self.timeout)
+        except asyncio.TimeoutError:
+            self._discard(waiter)
+            self.shed['timeout'] += 1
+            raise AdmissionRejected('timeout', SHED_RETRY_AFTER)
+        except BaseException:
+            # место могло быть передано одновременно с отменой запроса
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            else:
+                self._discard(waiter)
+            raise
+
+        self.admitted += 1
+
+    def _discard(self, waiter: asyncio.Future) -> None:
+        if waiter in self._waiters:
+            self._waiters.remove(waiter)
+
+    def release(self) -> None:
+        # место передаётся первому ожидающему без уменьшения active
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            'limit': self.limit,
+            'active': self.active,
+            'queue_depth': self.queue_depth,
+            'queue_size': self.queue_size,
+            'max_queue_depth': self.max_queue_depth,
+            'admitted': self.admitted,
+            'shed': dict(self.shed),
+        }
+
+
+class TokenBucketLimiter:
+    """
+    Ограничение частоты запросов по ключу (пользователь или адрес
+    клиента): ведро на burst запросов пополняется со скоростью rate
+    запросов в секунду
+    """
+
+    def __init__(
+        self, *, rate: float, burst: int, max_keys: int = 100000
+    ) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._buckets = LRUCache(max_keys)
+
+    def acquire(self, key: Any) -> None:
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.get(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated_at) * self.rate)
+        if tokens < 1:
+            self._buckets.set(key, (tokens, now))
+            raise AdmissionRejected('rate_limit', (1 - tokens) / self.rate)
+
+        self._buckets.set(key, (tokens - 1, now))
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            'rate': self.rate,
+            'burst': self.burst,
+            'keys': len(self._buckets),
+        }
+
+
+def route_group(method: str, path: str) -> str | None:
+    """
+    Группа ограничений запроса; запросы вне API не ограничиваются
+    """
+
+    if not path.startswith(API_PREFIX):
+        return None
+    if path.startswith(AUTH_PREFIX):
+        return 'auth'
+    if path.startswith(SEARCH_PREFIX):
+        return 'search'
+    if method in READ_METHODS or path.startswith(STATISTICS_PREFIX):
+        return 'reads'
+    return 'writes'
+
+
+def is_rate_limited(group: str, path: str) -> bool:
+    return group in ('auth', 'search') or path.startswith(STATISTICS_PREFIX)
+
+
+class AdmissionController:
+    """
+    Допуск запросов: ограничение частоты дорогих запросов
+    и конкурентности по группам маршрутов
+    """
+
+    def __init__(
+        self,
+        limiters: dict[str, ConcurrencyLimiter],
+        rate_limiter: TokenBucketLimiter | None = None,
+    ) -> None:
+        self.limiters = limiters
+        self.rate_limiter = rate_limiter
+
+    async def admit(self, scope: Scope) -> ConcurrencyLimiter | None:
+        """
+        Допуск запроса. Возвращает ограничитель, место в котором нужно
+        освободить по завершении запроса; при отказе AdmissionRejected
+        """
+
+        group = route_group(scope['method'], scope['path'])
+        limiter = self.limiters.get(group)
+        if limiter is None:
+            return None
+
+        if self.rate_limiter is not None and is_rate_limited(
+            group, scope['path']
+        ):
+            try:
+                self.rate_limiter.acquire(client_key(scope))
+            except AdmissionRejected:
+                limiter.shed['rate_limit'] += 1
+                raise
+
+        await limiter.acquire()
+        return limiter
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            'groups': {
+                group: limiter.stats()
+                for group, limiter in self.limiters.items()
+            },
+            'rate_limit': (
+                self.rate_limiter.stats()
+                if self.rate_limiter is not None
+                else None
+            ),
+        }
+
+
+def client_key(scope: Scope) -> Any:
+    """
+    Ключ ограничения частоты: пользователь из токена или адрес клиента
+    """
+
+    user_id = get_request_user_id(Request(scope))
+    if user_id is not None:
+        return user_id
+    client = scope.get('client')
+    return client[0] if client else None
+
+
+admission_controller = AdmissionController(
+    {
+        group: ConcurrencyLimiter(
+            limit=limit,
+            queue_size=settings.admission_queue_size,
+            timeout=settings.admission_queue_timeout,
+        )
+        for group, limit in settings.admission_limits.items()
+    },
+    (
+        TokenBucketLimiter(
+            rate=settings.rate_limit_per_second,
+            burst=settings.rate_limit_burst,
+        )
+        if settings.rate_limit_enabled
+        else None
+    ),
+)
+
+
+class AdmissionMiddleware:
+    """
+    ASGI-middleware допуска запросов. Отклонённый запрос сразу получает
+    503 (очередь группы заполнена или ожидание истекло) или 429
+    (превышена частота) с заголовком Retry-After, не занимая соединение
+    с БД
+    """
+
+    def __init__(
+        self, app: ASGIApp, controller: AdmissionController | None = None
+    ) -> None:
+        self.app = app
+        self.controller = controller or admission_controller
+
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            limiter = await self.controller.admit(scope)
+        except AdmissionRejected as exc:
+            await self._reject(exc, scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            if limiter is not None:
+                limiter.release()
+
+    @staticmethod
+    async def _reject(
+        exc: AdmissionRejected, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        if exc.reason == 'rate_limit':
+            status_code = status.HTTP_429_TOO_MANY_REQUESTS
+            detail = 'Too many requests'
+        else:
+            status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+            detail = 'Service overloaded'
+        response = ORJSONResponse(
+            {'detail': detail},
+            status_code=status_code,
+            headers={'Retry-After': str(max(math.ceil(exc.retry_after), 1))},
+        )
+        await response(scope, receive, send)
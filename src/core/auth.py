@@ -1,22 +1,55 @@
+import time
 from datetime import datetime, timedelta, timezone
+from typing import Any
 
 import jwt
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jwt import ExpiredSignatureError, InvalidTokenError
-from passlib.context import CryptContext
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.core.config import settings
+from src.core.cache import LRUCache
+from src.core.config import logger, settings
+from src.core.password import PasswordHasher, get_crypt_context
 from src.db.postgres import get_session
+from src.models.user import User as UserModel
+from src.repositories.base import RepositoryListener
 from src.repositories.user import user_crud
-from src.schemas.user import User
+from src.schemas.user import User, UserUpdate
 
 ALGORITHM = 'HS256'
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = get_crypt_context(settings.bcrypt_rounds)
+password_hasher = PasswordHasher(
+    rounds=settings.bcrypt_rounds,
+    executor=settings.password_hasher_executor,
+    workers=settings.password_hasher_workers,
+    max_concurrency=settings.password_hasher_max_concurrency,
+)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl='auth')
 
+# проверенные токены до истечения их срока действия
+token_cache = LRUCache(settings.auth_cache_size)
+# пользователи по логину из токена
+principal_cache = LRUCache(
+    settings.auth_cache_size, settings.auth_principal_cache_ttl
+)
+
+
+class PrincipalCacheInvalidator(RepositoryListener):
+    """
+    Удаление изменённых и удалённых пользователей из кэша
+    """
+
+    async def on_update(self, obj: UserModel) -> None:
+        principal_cache.delete(obj.login)
+
+    async def on_delete(self, obj: UserModel) -> None:
+        principal_cache.delete(obj.login)
+
+
+user_crud.add_listener(PrincipalCacheInvalidator())
+
 
 def hash_password(password: str) -> str:
     """
@@ -54,6 +87,40 @@ def create_access_token(
     return encoded_jwt
 
 
+def decode_access_token(token: str) -> dict[str, Any]:
+    """
+    Проверка и декодирование токена с кэшированием результата
+    до истечения срока действия токена
+    """
+
+    payload = token_cache.get(token)
+    if payload is not None:
+        return payload
+
+    payload = jwt.decode(token, settings.secret_key, algorithms=[ALGORITHM])
+    exp = payload.get('exp')
+    if exp is not None:
+        ttl = exp - time.time()
+        if ttl > 0:
+            token_cache.set(token, payload, ttl=ttl)
+
+    return payload
+
+
+def get_request_user_id(request: Request) -> int | None:
+    """
+    Получение идентификатора пользователя из токена запроса, если он есть
+    """
+
+    scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+    if scheme.lower() != 'bearer' or not token:
+        return None
+    try:
+        return decode_access_token(token).get('uid')
+    except InvalidTokenError:
+        return None
+
+
 async def authenticate_user(
     db: AsyncSession,
     login: str,
@@ -66,8 +133,18 @@ async def authenticate_user(
     user = await user_crud.get_user_by_login(db=db, login=login)
     if not user:
         return False
-    if not verify_password(password, user.password):
+    verified, new_hash = await password_hasher.verify_and_update(
+        password, user.password
+    )
+    if not verified:
         return False
+    if new_hash is not None:
+        user = await user_crud.patch(
+            db=db, obj_id=user.id, data=UserUpdate(password=new_hash)
+        )
+        logger.info(
+            'User [login:%s, id:%s] password rehashed', login, user.id
+        )
 
     return user
 
@@ -93,9 +170,7 @@ async def get_current_user(
     )
 
     try:
-        payload = jwt.decode(
-            token, settings.secret_key, algorithms=[ALGORITHM]
-        )
+        payload = decode_access_token(token)
         login: str = payload.get('sub')
         if login is None:
             raise credentials_exception
@@ -104,9 +179,30 @@ async def get_current_user(
     except InvalidTokenError:
         raise credentials_exception
 
-    user = await user_crud.get_user_by_login(db=db, login=login)
-
+    user = principal_cache.get(login)
     if user is None:
+        db_user = await user_crud.get_user_by_login(db=db, login=login)
+        if db_user is None:
+            raise credentials_exception
+        user = User(id=db_user.id, login=db_user.login)
+        principal_cache.set(login, user)
+
+    user_id = payload.get('uid')
+    if user_id is not None and user_id != user.id:
         raise credentials_exception
 
     return user
+
+
+async def get_admin_user(user: User = Depends(get_current_user)) -> User:
+    """
+    Получение пользователя с правами администратора
+    """
+
+    if user.login not in settings.admin_logins:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail='Admin access required',
+        )
+
+    return user
@@ -0,0 +1,238 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+
+from src.core.config import logger
+
+
+class LRUCache:
+    """
+    Кэш в памяти процесса с вытеснением давно неиспользуемых записей
+    и ограничением времени жизни
+    """
+
+    def __init__(self, maxsize: int, ttl: float | None = None) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float | None, Any]] = (
+            OrderedDict()
+        )
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            self.expirations += 1
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+        }
+
+
+class CacheBackend:
+    """
+    Разделяемый между процессами кэш (второй уровень)
+    """
+
+    async def get(self, key: str) -> bytes | None:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        raise NotImplementedError
+
+    async def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    Реализация кэша второго уровня в памяти процесса для тестов
+    """
+
+    def __init__(self, maxsize: int = 10000) -> None:
+        self._cache = LRUCache(maxsize)
+
+    async def get(self, key: str) -> bytes | None:
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._cache.set(key, value, ttl=ttl)
+
+    async def delete(self, key: str) -> None:
+        self._cache.delete(key)
+
+
+class TwoTierCache:
+    """
+    Двухуровневый кэш: LRU в памяти процесса и необязательный
+    разделяемый кэш. Ошибки второго уровня не прерывают запрос
+    """
+
+    def __init__(
+        self,
+        l1: LRUCache,
+        *,
+        namespace: str,
+        dumps: Callable[[Any], bytes],
+        loads: Callable[[bytes], Any],
+        l2: CacheBackend | None = None,
+        enabled: bool = True,
+    ) -> None:
+        self.l1 = l1
+        self.l2 = l2
+        self.enabled = enabled
+        self._namespace = namespace
+        self._dumps = dumps
+        self._loads = loads
+        self._generation = 0
+        self._inflight: dict[str, asyncio.Future] = {}
+        self.l2_hits = 0
+        self.l2_misses = 0
+        self.l2_errors = 0
+
+    def _key(self, key: Hashable) -> str:
+        return f'{self._namespace}:{key}'
+
+    async def get(self, key: Hashable) -> Any:
+        if not self.enabled:
+            return None
+
+        cache_key = self._key(key)
+        value = self.l1.get(cache_key)
+        if value is not None or self.l2 is None:
+            return value
+
+        try:
+            raw = await self.l2.get(cache_key)
+        except Exception as exc:
+            self.l2_errors += 1
+            logger.warning(
+                'Cache L2 get failed [key:%s]: %s', cache_key, exc
+            )
+            return None
+        if raw is None:
+            self.l2_misses += 1
+            return None
+
+        self.l2_hits += 1
+        value = self._loads(raw)
+        self.l1.set(cache_key, value)
+        return value
+
+    async def set(self, key: Hashable, value: Any) -> None:
+        if not self.enabled:
+            return
+
+        cache_key = self._key(key)
+        self.l1.set(cache_key, value)
+        if self.l2 is None:
+            return
+        try:
+            await self.l2.set(cache_key, self._dumps(value), ttl=self.l1.ttl)
+        except Exception as exc:
+            self.l2_errors += 1
+            logger.warning(
+                'Cache L2 set failed [key:%s]: %s', cache_key, exc
+            )
+
+    async def delete(self, key: Hashable) -> None:
+        self._generation += 1
+        cache_key = self._key(key)
+        self.l1.delete(cache_key)
+        if self.l2 is None:
+            return
+        try:
+            await self.l2.delete(cache_key)
+        except Exception as exc:
+            self.l2_errors += 1
+            logger.warning(
+                'Cache L2 delete failed [key:%s]: %s', cache_key, exc
+            )
+
+    async def get_or_load(
+        self, key: Hashable, loader: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Чтение через кэш. Одновременные промахи по одному ключу
+        ожидают одну загрузку; результат загрузки не сохраняется,
+        если во время неё произошла инвалидация
+        """
+
+        value = await self.get(key)
+        if value is not None or not self.enabled:
+            return value if value is not None else await loader()
+
+        cache_key = self._key(key)
+        inflight = self._inflight.get(cache_key)
+        if inflight is not None:
+            value = await asyncio.shield(inflight)
+            return value if value is not None else await loader()
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[cache_key] = future
+        generation = self._generation
+        value = None
+        try:
+            value = await loader()
+            if value is not None and generation == self._generation:
+                await self.set(key, value)
+        finally:
+            del self._inflight[cache_key]
+            future.set_result(value)
+
+        return value
+
+    def clear(self) -> None:
+        self._generation += 1
+        self.l1.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            'l1': self.l1.stats(),
+            'l2': {
+                'enabled': self.l2 is not None,
+                'hits': self.l2_hits,
+                'misses': self.l2_misses,
+                'errors': self.l2_errors,
+            },
+        }
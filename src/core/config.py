@@ -1,10 +1,9 @@
 import logging
-from logging import config as logging_config
 
 from pydantic import ConfigDict, IPvAnyAddress
 from pydantic_settings import BaseSettings
 
-from src.core.logger import LOGGING
+from src.core.logger import configure_logging
 
 
 class AppSettings(BaseSettings):
@@ -22,6 +21,70 @@ class AppSettings(BaseSettings):
     postgres_test_db: str
     demo: bool
 
+    db_echo: bool = False
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = False
+    db_statement_cache_size: int = 100
+    db_replica_dsns: list[str] = []
+    db_replica_retry_seconds: float = 30
+    db_read_your_writes_seconds: float = 0
+    db_slow_query_seconds: float = 0.5
+    db_profile_top_n: int = 5
+    db_request_queries_warning: int = 50
+
+    post_bulk_max_size: int = 1000
+    post_export_batch_size: int = 1000
+    post_import_batch_size: int = 5000
+
+    http_cache_control: dict[str, str] = {
+        'get_post': 'no-cache',
+        'get_posts': 'no-cache',
+    }
+
+    search_default_mode: str = 'fts'
+    search_index_enabled: bool = False
+
+    post_cache_enabled: bool = True
+    post_cache_size: int = 10000
+    post_cache_ttl: float = 60
+    response_cache_enabled: bool = True
+    response_cache_max_bytes: int = 64 * 1024 * 1024
+    response_cache_ttl: float = 5
+    response_cache_gzip_min_size: int = 1024
+
+    admin_logins: list[str] = []
+    auth_cache_size: int = 10000
+    auth_principal_cache_ttl: float = 30
+
+    admission_enabled: bool = True
+    admission_limits: dict[str, int] = {
+        'reads': 50,
+        'writes': 20,
+        'auth': 8,
+        'search': 10,
+    }
+    admission_queue_size: int = 100
+    admission_queue_timeout: float = 5
+    rate_limit_enabled: bool = False
+    rate_limit_per_second: float = 5
+    rate_limit_burst: int = 20
+
+    log_level: str = 'INFO'
+    log_json: bool = False
+    log_queue_enabled: bool = False
+    log_sample_rate: float = 1.0
+
+    metrics_enabled: bool = True
+    server_timing_enabled: bool = False
+
+    bcrypt_rounds: int = 12
+    password_hasher_executor: str = 'thread'
+    password_hasher_workers: int = 2
+    password_hasher_max_concurrency: int = 4
+
     model_config = ConfigDict(env_file='.env')
 
     @property
@@ -41,5 +104,10 @@ class AppSettings(BaseSettings):
         )
 
 settings = AppSettings()
-logging_config.dictConfig(LOGGING)
+configure_logging(
+    level=settings.log_level,
+    json=settings.log_json,
+    queue=settings.log_queue_enabled,
+    sample_rate=settings.log_sample_rate,
+)
 logger = logging.getLogger(settings.app_title)
@@ -0,0 +1,81 @@
+import hashlib
+from datetime import UTC, datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any
+
+from fastapi import Request, Response, status
+
+from src.core.config import settings
+
+CONDITIONAL_HEADERS = ('if-none-match', 'if-modified-since')
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Формирование ETag из значений, определяющих содержимое ответа
+    """
+
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=16)
+    return f'"{digest.hexdigest()}"'
+
+
+def http_date(value: datetime) -> str:
+    # время в БД хранится без часового пояса в UTC
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return format_datetime(value, usegmt=True)
+
+
+def is_conditional(request: Request) -> bool:
+    return any(header in request.headers for header in CONDITIONAL_HEADERS)
+
+
+def is_not_modified(
+    request: Request, etag: str, last_modified: datetime | None = None
+) -> bool:
+    """
+    Проверка условий If-None-Match и If-Modified-Since.
+    If-Modified-Since учитывается, только если If-None-Match не передан
+    """
+
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match is not None:
+        if if_none_match.strip() == '*':
+            return True
+        tags = if_none_match.split(',')
+        return etag in (tag.strip().removeprefix('W/') for tag in tags)
+
+    if_modified_since = request.headers.get('if-modified-since')
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=UTC)
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=UTC)
+
+    return last_modified.replace(microsecond=0) <= since
+
+
+def cache_headers(
+    route: str, etag: str, last_modified: datetime | None = None
+) -> dict[str, str]:
+    """
+    Заголовки валидации кэша и Cache-Control из настроек маршрута
+    """
+
+    headers = {'ETag': etag}
+    if last_modified is not None:
+        headers['Last-Modified'] = http_date(last_modified)
+    cache_control = settings.http_cache_control.get(route)
+    if cache_control:
+        headers['Cache-Control'] = cache_control
+
+    return headers
+
+
+def not_modified(headers: dict[str, str]) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
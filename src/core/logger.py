@@ -1,3 +1,15 @@
+import atexit
+import logging
+import random
+from contextvars import ContextVar
+from copy import deepcopy
+from logging import config as logging_config
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
+from typing import Any, TextIO
+
+import orjson
+
 LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 LOG_DEFAULT_HANDLERS = [
     'console',
@@ -58,3 +70,128 @@ LOGGING = {
         'handlers': LOG_DEFAULT_HANDLERS,
     },
 }
+
+# extra для частых информационных событий, которые можно прореживать
+SAMPLED = {'sampled': True}
+
+request_id: ContextVar[str | None] = ContextVar('request_id', default=None)
+
+_RECORD_ATTRS = frozenset(
+    logging.LogRecord('', 0, '', 0, '', None, None).__dict__
+) | {'message', 'asctime', 'request_id', 'sampled'}
+_listeners: list[QueueListener] = []
+
+
+class LogContextFilter(logging.Filter):
+    """
+    Добавление к записи идентификатора запроса и прореживание записей
+    с extra=SAMPLED: проходит доля sample_rate таких записей уровня
+    INFO и ниже. Выполняется в потоке, создавшем запись
+    """
+
+    def __init__(self, sample_rate: float = 1.0) -> None:
+        super().__init__()
+        self.sample_rate = sample_rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if (
+            self.sample_rate < 1
+            and getattr(record, 'sampled', False)
+            and record.levelno <= logging.INFO
+            and random.random() >= self.sample_rate
+        ):
+            return False
+        record.request_id = request_id.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Запись лога одной строкой JSON. Поля, переданные через extra,
+    выводятся отдельными ключами
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'request_id': getattr(record, 'request_id', None),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                data[key] = value
+        if record.exc_info:
+            data['exc_info'] = self.formatException(record.exc_info)
+        return orjson.dumps(data, default=str).decode()
+
+
+class LogQueueHandler(QueueHandler):
+    """
+    Передача записей в очередь без форматирования: сообщение
+    собирается из аргументов и форматируется в потоке QueueListener.
+    Аргументы сообщений должны быть неизменяемыми значениями
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def stop_logging() -> None:
+    while _listeners:
+        _listeners.pop().stop()
+
+
+atexit.register(stop_logging)
+
+
+def configure_logging(
+    *,
+    level: str = 'INFO',
+    json: bool = False,
+    queue: bool = False,
+    sample_rate: float = 1.0,
+    stream: TextIO | None = None,
+) -> None:
+    """
+    Настройка логирования. queue переносит форматирование и вывод
+    записей в фоновый поток (QueueHandler/QueueListener), json выводит
+    записи строками JSON, sample_rate - доля выводимых частых
+    информационных событий
+    """
+
+    stop_logging()
+    config: dict[str, Any] = deepcopy(LOGGING)
+    config['formatters']['json'] = {'()': JsonFormatter}
+    config['filters'] = {
+        'context': {'()': LogContextFilter, 'sample_rate': sample_rate}
+    }
+    for handler in config['handlers'].values():
+        if json:
+            handler['formatter'] = 'json'
+        if not queue:
+            handler['filters'] = ['context']
+    if stream is not None:
+        config['handlers']['console']['stream'] = stream
+    for logger_config in (config['root'], config['loggers']['']):
+        logger_config['level'] = level
+    logging_config.dictConfig(config)
+
+    if queue:
+        for name in ('', 'uvicorn.access'):
+            _enqueue(logging.getLogger(name), sample_rate)
+
+
+def _enqueue(logger: logging.Logger, sample_rate: float) -> None:
+    records: SimpleQueue = SimpleQueue()
+    handlers = logger.handlers[:]
+    queue_handler = LogQueueHandler(records)
+    queue_handler.addFilter(LogContextFilter(sample_rate))
+    for handler in handlers:
+        logger.removeHandler(handler)
+    logger.addHandler(queue_handler)
+
+    listener = QueueListener(records, *handlers, respect_handler_level=True)
+    listener.start()
+    _listeners.append(listener)
@@ -0,0 +1,219 @@
+from bisect import bisect_left
+from typing import Any, Iterable
+
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+QUERY_LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0
+)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class Histogram:
+    """
+    Гистограмма с заранее заданными границами корзин.
+    Наблюдение - поиск корзины и два сложения без блокировок: запись
+    выполняется только из цикла событий
+    """
+
+    __slots__ = ('bounds', 'counts', 'sum')
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+    def render(self, name: str, labels: str) -> Iterable[str]:
+        prefix = f'{labels},' if labels else ''
+        total = 0
+        for bound, count in zip(self.bounds, self.counts):
+            total += count
+            yield f'{name}_bucket{{{prefix}le="{bound}"}} {total}'
+        total += self.counts[-1]
+        yield f'{name}_bucket{{{prefix}le="+Inf"}} {total}'
+        suffix = f'{{{labels}}}' if labels else ''
+        yield f'{name}_sum{suffix} {self.sum}'
+        yield f'{name}_count{suffix} {total}'
+
+
+class RouteMetrics:
+    __slots__ = ('responses', 'latency', 'db_queries', 'db_time')
+
+    def __init__(self) -> None:
+        self.responses: dict[int, int] = {}
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.db_queries = Histogram(QUERY_COUNT_BUCKETS)
+        self.db_time = Histogram(LATENCY_BUCKETS)
+
+
+class Metrics:
+    """
+    Метрики HTTP-запросов и запросов к БД процесса. Метрики маршрутов
+    создаются при первом обращении к маршруту, поэтому их число
+    ограничено числом маршрутов приложения
+    """
+
+    def __init__(self) -> None:
+        self.routes: dict[tuple[str, str], RouteMetrics] = {}
+        self.in_flight = 0
+        self.db_queries = 0
+        self.db_errors = 0
+        self.db_query_latency = Histogram(QUERY_LATENCY_BUCKETS)
+
+    def observe_request(
+        self,
+        method: str,
+        route: str,
+        status_code: int,
+        elapsed: float,
+        queries: int,
+        db_time: float,
+    ) -> None:
+        key = (method, route)
+        metrics = self.routes.get(key)
+        if metrics is None:
+            metrics = self.routes[key] = RouteMetrics()
+        metrics.responses[status_code] = (
+            metrics.responses.get(status_code, 0) + 1
+        )
+        metrics.latency.observe(elapsed)
+        metrics.db_queries.observe(queries)
+        metrics.db_time.observe(db_time)
+
+    def observe_query(self, elapsed: float) -> None:
+        self.db_queries += 1
+        self.db_query_latency.observe(elapsed)
+
+    def render(
+        self,
+        pools: dict[str, dict[str, Any]],
+        admission: dict[str, Any] | None = None,
+    ) -> str:
+        """
+        Метрики в текстовом формате Prometheus.
+        pools - состояние пулов соединений по именам БД,
+        admission - состояние допуска запросов по группам маршрутов
+        """
+
+        lines = [
+            '# HELP http_requests_total Total HTTP requests.',
+            '# TYPE http_requests_total counter',
+        ]
+        for (method, route), metrics in self.routes.items():
+            for status_code, count in metrics.responses.items():
+                lines.append(
+                    f'http_requests_total{{{_labels(method, route)},'
+                    f'status="{status_code}"}} {count}'
+                )
+
+        histograms = (
+            (
+                'http_request_duration_seconds',
+                'HTTP request latency.',
+                'latency',
+            ),
+            (
+                'http_request_db_queries',
+                'Database queries per HTTP request.',
+                'db_queries',
+            ),
+            (
+                'http_request_db_duration_seconds',
+                'Database time per HTTP request.',
+                'db_time',
+            ),
+        )
+        for name, description, attr in histograms:
+            lines.append(f'# HELP {name} {description}')
+            lines.append(f'# TYPE {name} histogram')
+            for (method, route), metrics in self.routes.items():
+                lines.extend(
+                    getattr(metrics, attr).render(
+                        name, _labels(method, route)
+                    )
+                )
+
+        lines.extend(
+            (
+                '# HELP http_requests_in_flight HTTP requests in progress.',
+                '# TYPE http_requests_in_flight gauge',
+                f'http_requests_in_flight {self.in_flight}',
+                '# HELP db_queries_total Total database queries.',
+                '# TYPE db_queries_total counter',
+                f'db_queries_total {self.db_queries}',
+                '# HELP db_query_errors_total Failed database queries.',
+                '# TYPE db_query_errors_total counter',
+                f'db_query_errors_total {self.db_errors}',
+                '# HELP db_query_duration_seconds Database query latency.',
+                '# TYPE db_query_duration_seconds histogram',
+                *self.db_query_latency.render(
+                    'db_query_duration_seconds', ''
+                ),
+            )
+        )
+
+        pool_metrics = (
+            ('db_pool_size', 'gauge', 'size'),
+            ('db_pool_checked_out', 'gauge', 'checked_out'),
+            ('db_pool_checked_in', 'gauge', 'checked_in'),
+            ('db_pool_overflow', 'gauge', 'overflow'),
+            ('db_pool_waits_total', 'counter', 'waits'),
+            ('db_pool_wait_seconds_total', 'counter', 'wait_time_total_s'),
+            ('db_pool_timeouts_total', 'counter', 'timeouts'),
+        )
+        for name, metric_type, key in pool_metrics:
+            lines.append(f'# TYPE {name} {metric_type}')
+            for pool, stats in pools.items():
+                if key in stats:
+                    lines.append(
+                        f'{name}{{pool="{_escape(pool)}"}} {stats[key]}'
+                    )
+
+        if admission is not None:
+            lines.extend(_render_admission(admission))
+
+        return '\n'.join(lines) + '\n'
+
+
+def _render_admission(admission: dict[str, Any]) -> list[str]:
+    lines = []
+    groups = admission['groups']
+    admission_metrics = (
+        ('admission_active_requests', 'gauge', 'active'),
+        ('admission_queue_depth', 'gauge', 'queue_depth'),
+        ('admission_queue_depth_max', 'gauge', 'max_queue_depth'),
+        ('admission_admitted_total', 'counter', 'admitted'),
+    )
+    for name, metric_type, key in admission_metrics:
+        lines.append(f'# TYPE {name} {metric_type}')
+        for group, stats in groups.items():
+            lines.append(f'{name}{{group="{_escape(group)}"}} {stats[key]}')
+
+    lines.append('# HELP admission_shed_total Requests rejected on admission.')
+    lines.append('# TYPE admission_shed_total counter')
+    for group, stats in groups.items():
+        for reason, count in stats['shed'].items():
+            lines.append(
+                f'admission_shed_total{{group="{_escape(group)}",'
+                f'reason="{reason}"}} {count}'
+            )
+    return lines
+
+
+def _escape(value: str) -> str:
+    return (
+        value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    )
+
+
+def _labels(method: str, route: str) -> str:
+    return f'method="{_escape(method)}",route="{_escape(route)}"'
+
+
+metrics = Metrics()
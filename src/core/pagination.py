@@ -0,0 +1,56 @@
+import base64
+from datetime import datetime
+from typing import Any, NamedTuple
+
+import orjson
+
+CursorKey = tuple[datetime, int]
+
+
+PageKey = tuple[datetime, int, datetime]
+
+
+class Page(NamedTuple):
+    """
+    Страница постов: записи, признак наличия следующих записей
+    в направлении выборки и ключи записей (created_at, id, updated_at)
+    """
+
+    items: list[Any]
+    has_more: bool
+    keys: list[PageKey]
+
+    @property
+    def first(self) -> CursorKey | None:
+        return self.keys[0][:2] if self.keys else None
+
+    @property
+    def last(self) -> CursorKey | None:
+        return self.keys[-1][:2] if self.keys else None
+
+    @property
+    def last_modified(self) -> datetime | None:
+        return max(key[2] for key in self.keys) if self.keys else None
+
+
+def encode_cursor(created_at: datetime, obj_id: int) -> str:
+    """
+    Кодирование ключа (created_at, id) в непрозрачный курсор
+    """
+
+    raw = orjson.dumps([created_at.isoformat(), obj_id])
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode()
+
+
+def decode_cursor(cursor: str) -> CursorKey:
+    """
+    Декодирование курсора в ключ (created_at, id)
+    """
+
+    try:
+        padding = '=' * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(cursor + padding)
+        created_at, obj_id = orjson.loads(raw)
+        return datetime.fromisoformat(created_at), int(obj_id)
+    except (ValueError, TypeError) as exc:
+        raise ValueError(f'Invalid cursor: {cursor}') from exc
@@ -0,0 +1,140 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable
+
+from passlib.context import CryptContext
+
+EXECUTOR_THREAD = 'thread'
+EXECUTOR_PROCESS = 'process'
+
+
+@lru_cache
+def get_crypt_context(rounds: int) -> CryptContext:
+    # хеши с любой другой стоимостью считаются устаревшими
+    return CryptContext(
+        schemes=['bcrypt'],
+        deprecated='auto',
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=rounds,
+        bcrypt__max_rounds=rounds,
+    )
+
+
+def hash_password_sync(password: str, rounds: int) -> str:
+    return get_crypt_context(rounds).hash(password)
+
+
+def verify_and_update_sync(
+    password: str, hashed_password: str, rounds: int
+) -> tuple[bool, str | None]:
+    return get_crypt_context(rounds).verify_and_update(
+        password, hashed_password
+    )
+
+
+def _timed_call(fn: Callable, *args: Any) -> tuple[float, Any]:
+    # время старта по часам ОС сопоставимо между процессами
+    return time.time(), fn(*args)
+
+
+class PasswordHasher:
+    """
+    Хеширование и проверка паролей в отдельном пуле потоков или процессов
+    с ограничением числа одновременных операций
+    """
+
+    def __init__(
+        self,
+        *,
+        rounds: int,
+        executor: str = EXECUTOR_THREAD,
+        workers: int = 2,
+        max_concurrency: int = 4,
+    ) -> None:
+        if executor not in (EXECUTOR_THREAD, EXECUTOR_PROCESS):
+            raise ValueError(f'Unknown password hasher executor: {executor}')
+        self.rounds = rounds
+        self._executor_type = executor
+        self._workers = workers
+        self._executor: Executor | None = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.max_concurrency = max_concurrency
+        self.waiting = 0
+        self.running = 0
+        self.completed = 0
+        self.queue_time_total = 0.0
+        self.queue_time_max = 0.0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self._executor_type == EXECUTOR_PROCESS:
+                self._executor = ProcessPoolExecutor(self._workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    self._workers, thread_name_prefix='password-hasher'
+                )
+        return self._executor
+
+    async def _run(self, fn: Callable, *args: Any) -> Any:
+        queued_at = time.time()
+        acquired = False
+        self.waiting += 1
+        try:
+            async with self._semaphore:
+                acquired = True
+                self.waiting -= 1
+                self.running += 1
+                try:
+                    loop = asyncio.get_running_loop()
+                    started_at, result = await loop.run_in_executor(
+                        self._get_executor(), _timed_call, fn, *args
+                    )
+                finally:
+                    self.running -= 1
+        finally:
+            if not acquired:
+                self.waiting -= 1
+
+        queue_time = max(started_at - queued_at, 0.0)
+        self.completed += 1
+        self.queue_time_total += queue_time
+        self.queue_time_max = max(self.queue_time_max, queue_time)
+        return result
+
+    async def hash(self, password: str) -> str:
+        """
+        Хеширование пароля
+        """
+
+        return await self._run(hash_password_sync, password, self.rounds)
+
+    async def verify_and_update(
+        self, password: str, hashed_password: str
+    ) -> tuple[bool, str | None]:
+        """
+        Проверка пароля. Если хеш создан с устаревшими параметрами,
+        возвращается новый хеш
+        """
+
+        return await self._run(
+            verify_and_update_sync, password, hashed_password, self.rounds
+        )
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            'executor': self._executor_type,
+            'workers': self._workers,
+            'max_concurrency': self.max_concurrency,
+            'waiting': self.waiting,
+            'running': self.running,
+            'completed': self.completed,
+            'queue_time_total_s': round(self.queue_time_total, 6),
+            'queue_time_max_s': round(self.queue_time_max, 6),
+        }
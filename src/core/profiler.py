@@ -0,0 +1,254 @@
+import heapq
+import re
+import time
+import uuid
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.config import logger, settings
+from src.core.logger import request_id
+from src.core.metrics import metrics
+
+UNMATCHED_ROUTE = 'unmatched'
+SQL_MAX_LENGTH = 1000
+REQUEST_ID_HEADER = b'x-request-id'
+REQUEST_ID_MAX_LENGTH = 128
+
+SQL_STRING = re.compile(r"'(?:[^']|'')*'")
+SQL_NUMBER = re.compile(r'(?<![$\w.])\d+(?:\.\d+)?\b')
+SQL_SPACES = re.compile(r'\s+')
+
+
+def normalize_sql(statement: str) -> str:
+    """
+    Приведение запроса к виду без литералов и лишних пробелов
+    для группировки однотипных запросов в логе
+    """
+
+    statement = SQL_STRING.sub('?', statement)
+    statement = SQL_NUMBER.sub('?', statement)
+    statement = SQL_SPACES.sub(' ', statement).strip()
+    if len(statement) > SQL_MAX_LENGTH:
+        statement = statement[:SQL_MAX_LENGTH] + '...'
+
+    return statement
+
+
+def route_template(scope: Scope) -> str:
+    """
+    Шаблон пути маршрута запроса. Маршрут вложенного роутера хранит
+    шаблон без префикса, поэтому префикс берётся из самого пути
+    """
+
+    route = scope.get('route')
+    if route is None:
+        return UNMATCHED_ROUTE
+
+    segments = scope['path'].split('/')
+    prefix = len(segments) - route.path.count('/')
+    return '/'.join(segments[:prefix]) + route.path
+
+
+class RequestStats:
+    """
+    Профиль запросов к БД в рамках одного HTTP-запроса: число, общее
+    время и top_n самых медленных запросов
+    """
+
+    __slots__ = ('scope', 'queries', 'db_time', 'top_n', '_slowest')
+
+    def __init__(self, scope: Scope | None = None, top_n: int = 0) -> None:
+        self.scope = scope
+        self.queries = 0
+        self.db_time = 0.0
+        self.top_n = top_n
+        self._slowest: list[tuple[float, int, str]] = []
+
+    @property
+    def route(self) -> str:
+        if self.scope is None:
+            return UNMATCHED_ROUTE
+        return route_template(self.scope)
+
+    def add(self, statement: str, elapsed: float) -> None:
+        self.queries += 1
+        self.db_time += elapsed
+        if self.top_n <= 0:
+            return
+
+        item = (elapsed, self.queries, statement)
+        if len(self._slowest) < self.top_n:
+            heapq.heappush(self._slowest, item)
+        elif elapsed > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, item)
+
+    @property
+    def slowest(self) -> list[tuple[float, str]]:
+        """
+        Самые медленные запросы в порядке убывания времени
+        """
+
+        return [
+            (elapsed, normalize_sql(statement))
+            for elapsed, _, statement in sorted(self._slowest, reverse=True)
+        ]
+
+
+request_stats: ContextVar[RequestStats | None] = ContextVar(
+    'request_stats', default=None
+)
+
+
+def record_query(statement: str, elapsed: float) -> None:
+    """
+    Учёт выполненного запроса в метриках и профиле текущего HTTP-запроса
+    """
+
+    if settings.metrics_enabled:
+        metrics.observe_query(elapsed)
+
+    stats = request_stats.get()
+    if stats is not None:
+        stats.add(statement, elapsed)
+
+    threshold = settings.db_slow_query_seconds
+    if threshold > 0 and elapsed >= threshold:
+        route = UNMATCHED_ROUTE if stats is None else stats.route
+        logger.warning(
+            'Slow query [%.1fms, route:%s] %s',
+            elapsed * 1000,
+            route,
+            normalize_sql(statement),
+        )
+
+
+def server_timing(stats: RequestStats, elapsed: float) -> str:
+    return (
+        f'db;dur={stats.db_time * 1000:.1f};desc="{stats.queries} queries", '
+        f'app;dur={elapsed * 1000:.1f}'
+    )
+
+
+def get_request_id(scope: Scope) -> str:
+    for name, value in scope['headers']:
+        if name == REQUEST_ID_HEADER:
+            if 0 < len(value) <= REQUEST_ID_MAX_LENGTH and value.isascii():
+                return value.decode()
+            break
+    return uuid.uuid4().hex
+
+
+class InstrumentationMiddleware:
+    """
+    ASGI-middleware профилирования HTTP-запросов. Профиль запросов к БД
+    доступен в контексте запроса (request_stats, request.state.db_stats)
+    и попадает в метрики, заголовок Server-Timing и лог запросов,
+    превысивших DB_REQUEST_QUERIES_WARNING запросов к БД.
+    Идентификатор запроса берётся из заголовка X-Request-ID или
+    генерируется, попадает в записи лога и возвращается в ответе
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        started_at = time.perf_counter()
+        stats = RequestStats(scope, settings.db_profile_top_n)
+        scope.setdefault('state', {})['db_stats'] = stats
+        status_code = 500
+        current_request_id = get_request_id(scope)
+
+        async def send_instrumented(message: Message) -> None:
+            nonlocal status_code
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+                message.setdefault('headers', []).append(
+                    (REQUEST_ID_HEADER, current_request_id.encode())
+                )
+                if settings.server_timing_enabled:
+                    elapsed = time.perf_counter() - started_at
+                    message.setdefault('headers', []).append(
+                        (
+                            b'server-timing',
+                            server_timing(stats, elapsed).encode(),
+                        )
+                    )
+            await send(message)
+
+        token = request_stats.set(stats)
+        request_id_token = request_id.set(current_request_id)
+        metrics.in_flight += 1
+        try:
+            await self.app(scope, receive, send_instrumented)
+        finally:
+            elapsed = time.perf_counter() - started_at
+            metrics.in_flight -= 1
+            request_stats.reset(token)
+            self._finish(scope, stats, status_code, elapsed)
+            request_id.reset(request_id_token)
+
+    @staticmethod
+    def _finish(
+        scope: Scope, stats: RequestStats, status_code: int, elapsed: float
+    ) -> None:
+        route = stats.route
+        if settings.metrics_enabled:
+            metrics.observe_request(
+                scope['method'],
+                route,
+                status_code,
+                elapsed,
+                stats.queries,
+                stats.db_time,
+            )
+
+        limit = settings.db_request_queries_warning
+        if limit > 0 and stats.queries > limit:
+            slowest = '; '.join(
+                f'{query_time * 1000:.1f}ms {statement}'
+                for query_time, statement in stats.slowest
+            )
+            logger.warning(
+                'Request %s %s made %s queries in %.1fms [slowest: %s]',
+                scope['method'],
+                route,
+                stats.queries,
+                stats.db_time * 1000,
+                slowest,
+            )
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """
+    Подключение учёта запросов к БД через события движка SQLAlchemy
+    """
+
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, 'before_cursor_execute')
+    def before_cursor_execute(conn, cursor, statement, *args) -> None:
+        conn.info.setdefault('query_started_at', []).append(
+            time.perf_counter()
+        )
+
+    @event.listens_for(sync_engine, 'after_cursor_execute')
+    def after_cursor_execute(conn, cursor, statement, *args) -> None:
+        started_at = conn.info['query_started_at'].pop()
+        record_query(statement, time.perf_counter() - started_at)
+
+    @event.listens_for(sync_engine, 'handle_error')
+    def handle_error(context) -> None:
+        if context.connection is not None:
+            started = context.connection.info.get('query_started_at')
+            if started:
+                started.pop()
+        metrics.db_errors += 1
@@ -0,0 +1,201 @@
+import gzip
+import time
+from collections import OrderedDict
+from typing import Any
+from urllib.parse import urlencode
+
+from fastapi import Request, Response
+
+from src.core.config import settings
+from src.core.http_cache import is_not_modified, not_modified
+from src.repositories.base import RepositoryListener
+from src.repositories.post import post_crud
+
+VALIDATOR_HEADERS = ('etag', 'last-modified', 'cache-control')
+GZIP_LEVEL = 6
+
+
+def accepts_gzip(request: Request) -> bool:
+    for coding in request.headers.get('accept-encoding', '').split(','):
+        name, _, params = coding.partition(';')
+        if name.strip().lower() not in ('gzip', '*'):
+            continue
+        return params.replace(' ', '').lower() not in ('q=0', 'q=0.0')
+    return False
+
+
+class CachedResponse:
+    """
+    Сериализованный ответ и его сжатая версия
+    """
+
+    __slots__ = ('expires_at', 'body', 'gzip_body', 'headers')
+
+    def __init__(
+        self,
+        expires_at: float,
+        body: bytes,
+        gzip_body: bytes | None,
+        headers: dict[str, str],
+    ) -> None:
+        self.expires_at = expires_at
+        self.body = body
+        self.gzip_body = gzip_body
+        self.headers = headers
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + len(self.gzip_body or b'')
+
+    def to_response(self, request: Request) -> Response:
+        etag = self.headers.get('etag')
+        if etag is not None and is_not_modified(request, etag):
+            return not_modified(
+                {
+                    key: value
+                    for key, value in self.headers.items()
+                    if key in VALIDATOR_HEADERS
+                }
+            )
+
+        headers = {**self.headers, 'vary': 'Accept-Encoding'}
+        body = self.body
+        if self.gzip_body is not None and accepts_gzip(request):
+            body = self.gzip_body
+            headers['content-encoding'] = 'gzip'
+
+        return Response(content=body, headers=headers)
+
+
+class ResponseCache:
+    """
+    Кэш готовых ответов GET с ограничением по объёму и вытеснением
+    давно неиспользуемых записей. Ответы больше min_gzip_size хранятся
+    также в сжатом виде. Ответ не сохраняется, если во время его
+    построения кэш был сброшен
+    """
+
+    def __init__(
+        self,
+        *,
+        max_bytes: int,
+        ttl: float,
+        min_gzip_size: int,
+        enabled: bool = True,
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.min_gzip_size = min_gzip_size
+        self.enabled = enabled
+        self._data: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._size = 0
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(request: Request) -> str:
+        params = sorted(request.query_params.multi_items())
+        return f'{request.url.path}?{urlencode(params)}'
+
+    def get(self, request: Request) -> Response | None:
+        if not self.enabled:
+            return None
+
+        key = self.key(request)
+        entry = self._data.get(key)
+        if entry is None or entry.expires_at <= time.monotonic():
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry.to_response(request)
+
+    def set(
+        self, request: Request, response: Response, generation: int
+    ) -> Response:
+        """
+        Сохранение ответа, построенного при поколении кэша generation.
+        Возвращает ответ для отправки клиенту
+        """
+
+        if (
+            not self.enabled
+            or response.status_code != 200
+            or generation != self.generation
+        ):
+            return response
+
+        body = response.body
+        gzip_body = None
+        if len(body) >= self.min_gzip_size:
+            gzip_body = gzip.compress(body, compresslevel=GZIP_LEVEL)
+        headers = {
+            key: value
+            for key, value in response.headers.items()
+            if key != 'content-length'
+        }
+        entry = CachedResponse(
+            time.monotonic() + self.ttl, body, gzip_body, headers
+        )
+        if entry.size <= self.max_bytes:
+            key = self.key(request)
+            self._remove(key)
+            self._data[key] = entry
+            self._size += entry.size
+            while self._size > self.max_bytes:
+                self._remove(next(iter(self._data)))
+                self.evictions += 1
+
+        return entry.to_response(request)
+
+    def _remove(self, key: str) -> None:
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self._size -= entry.size
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._data.clear()
+        self._size = 0
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            'entries': len(self._data),
+            'bytes': self._size,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+
+class ResponseCacheInvalidator(RepositoryListener):
+    """
+    Сброс кэша ответов при любом изменении постов
+    """
+
+    def __init__(self, cache: ResponseCache) -> None:
+        self._cache = cache
+
+    async def on_create(self, obj: Any) -> None:
+        self._cache.clear()
+
+    async def on_update(self, obj: Any) -> None:
+        self._cache.clear()
+
+    async def on_delete(self, obj: Any) -> None:
+        self._cache.clear()
+
+
+response_cache = ResponseCache(
+    max_bytes=settings.response_cache_max_bytes,
+    ttl=settings.response_cache_ttl,
+    min_gzip_size=settings.response_cache_gzip_min_size,
+    enabled=settings.response_cache_enabled,
+)
+post_crud.add_listener(ResponseCacheInvalidator(response_cache))
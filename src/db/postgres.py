@@ -1,12 +1,94 @@
+import time
+from typing import Any
+
+from sqlalchemy import exc
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection
 
 from src.core.config import settings
+from src.core.profiler import instrument_engine
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """
+    Пул соединений с учётом времени ожидания соединения
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.waits = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+        self.timeouts = 0
+
+    def connect(self) -> PoolProxiedConnection:
+        started_at = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            wait_time = time.perf_counter() - started_at
+            self.waits += 1
+            self.wait_time_total += wait_time
+            self.wait_time_max = max(self.wait_time_max, wait_time)
+
+
+def create_engine(dsn: str) -> AsyncEngine:
+    engine = create_async_engine(
+        dsn,
+        echo=settings.db_echo,
+        poolclass=InstrumentedPool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        connect_args={
+            'statement_cache_size': settings.db_statement_cache_size,
+            'prepared_statement_cache_size': (
+                settings.db_statement_cache_size
+            ),
+        },
+    )
+    instrument_engine(engine)
+
+    return engine
+
+
+def get_pool_stats(engine: AsyncEngine) -> dict[str, Any]:
+    """
+    Получение состояния пула соединений
+    """
+
+    pool = engine.pool
+    stats = {
+        'size': pool.size(),
+        'checked_in': pool.checkedin(),
+        'checked_out': pool.checkedout(),
+        'overflow': max(pool.overflow(), 0),
+        'max_overflow': settings.db_max_overflow,
+    }
+    if isinstance(pool, InstrumentedPool):
+        stats.update(
+            {
+                'waits': pool.waits,
+                'wait_time_total_s': round(pool.wait_time_total, 6),
+                'wait_time_max_s': round(pool.wait_time_max, 6),
+                'timeouts': pool.timeouts,
+            }
+        )
+
+    return stats
+
 
-engine = create_async_engine(settings.dsn, echo=True, future=True)
+engine = create_engine(settings.dsn)
 async_session = async_sessionmaker(
     bind=engine,
     class_=AsyncSession,
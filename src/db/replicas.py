@@ -0,0 +1,160 @@
+import itertools
+import time
+from functools import partial
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.core.auth import get_request_user_id
+from src.core.cache import LRUCache
+from src.core.config import logger, settings
+from src.db.postgres import async_session, create_engine
+from src.repositories.base import RepositoryListener
+from src.repositories.post import post_crud
+
+REPLICA_SESSION_KEY = 'replica'
+
+
+class ReadSessionRouter:
+    """
+    Распределение читающих сессий по репликам по кругу.
+    Недоступная реплика исключается на retry_after секунд; если доступных
+    реплик нет или пользователь недавно выполнял запись, используется
+    основная БД
+    """
+
+    def __init__(
+        self,
+        primary: async_sessionmaker,
+        replicas: list[async_sessionmaker],
+        *,
+        retry_after: float,
+        read_your_writes_window: float = 0,
+        max_pinned_users: int = 10000,
+    ) -> None:
+        self.primary = primary
+        self.replicas = replicas
+        self.retry_after = retry_after
+        self._down_until = [0.0] * len(replicas)
+        self._order = itertools.cycle(range(len(replicas)))
+        self._pins = (
+            LRUCache(max_pinned_users, ttl=read_your_writes_window)
+            if read_your_writes_window > 0
+            else None
+        )
+        self.primary_reads = 0
+        self.replica_reads = 0
+        self.replica_failures = 0
+
+    def pin(self, user_id: int) -> None:
+        """
+        Закрепление чтений пользователя за основной БД
+        """
+
+        if self._pins is not None:
+            self._pins.set(user_id, True)
+
+    def is_pinned(self, user_id: int | None) -> bool:
+        if self._pins is None or user_id is None:
+            return False
+        return self._pins.get(user_id, False)
+
+    async def session(self, user_id: int | None = None) -> AsyncSession:
+        if self.replicas and not self.is_pinned(user_id):
+            for _ in range(len(self.replicas)):
+                index = next(self._order)
+                if self._down_until[index] > time.monotonic():
+                    continue
+
+                session = self.replicas[index]()
+                try:
+                    await session.connection()
+                except Exception as exc:
+                    await session.close()
+                    self.replica_failures += 1
+                    self._down_until[index] = (
+                        time.monotonic() + self.retry_after
+                    )
+                    logger.warning(
+                        'Read replica #%s unavailable: %s', index, exc
+                    )
+                    continue
+
+                self.replica_reads += 1
+                session.info[REPLICA_SESSION_KEY] = True
+                return session
+
+        self.primary_reads += 1
+        return self.primary()
+
+    def stats(self) -> dict[str, Any]:
+        now = time.monotonic()
+        return {
+            'replicas': len(self.replicas),
+            'replicas_down': sum(
+                until > now for until in self._down_until
+            ),
+            'primary_reads': self.primary_reads,
+            'replica_reads': self.replica_reads,
+            'replica_failures': self.replica_failures,
+        }
+
+
+class ReadYourWritesListener(RepositoryListener):
+    """
+    Закрепление чтений автора изменённого поста за основной БД
+    """
+
+    def __init__(self, router: ReadSessionRouter) -> None:
+        self._router = router
+
+    async def on_create(self, obj: Any) -> None:
+        self._router.pin(obj.user_id)
+
+    async def on_update(self, obj: Any) -> None:
+        self._router.pin(obj.user_id)
+
+    async def on_delete(self, obj: Any) -> None:
+        self._router.pin(obj.user_id)
+
+
+read_router = ReadSessionRouter(
+    async_session,
+    [
+        async_sessionmaker(
+            bind=create_engine(dsn),
+            class_=AsyncSession,
+            expire_on_commit=False,
+        )
+        for dsn in settings.db_replica_dsns
+    ],
+    retry_after=settings.db_replica_retry_seconds,
+    read_your_writes_window=settings.db_read_your_writes_seconds,
+)
+post_crud.add_listener(ReadYourWritesListener(read_router))
+
+
+def is_replica_session(session: AsyncSession) -> bool:
+    """
+    Сессия читает с реплики и может вернуть устаревшие данные
+    """
+
+    return session.info.get(REPLICA_SESSION_KEY, False)
+
+
+async def get_read_session(request: Request) -> AsyncIterator[AsyncSession]:
+    user_id = get_request_user_id(request)
+    async with await read_router.session(user_id=user_id) as session:
+        yield session
+
+
+async def get_read_session_factory(
+    request: Request,
+) -> Callable[[], Awaitable[AsyncSession]]:
+    """
+    Фабрика читающих сессий для потоковых ответов, которые обращаются
+    к БД после выхода из обработчика запроса
+    """
+
+    return partial(read_router.session, user_id=get_request_user_id(request))
@@ -1,11 +1,35 @@
+from contextlib import asynccontextmanager
+
 import uvicorn
 from fastapi import FastAPI, Depends
-from fastapi.responses import ORJSONResponse
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 
 from src.api.v1.base import api_router
-from src.core.auth import get_current_user
-from src.core.config import settings
-from src.models import User
+from src.core.admission import AdmissionMiddleware, admission_controller
+from src.core.auth import get_current_user, password_hasher
+from src.core.config import logger, settings
+from src.core.metrics import CONTENT_TYPE, metrics
+from src.core.profiler import InstrumentationMiddleware
+from src.db.postgres import async_session, engine, get_pool_stats
+from src.db.replicas import read_router
+from src.repositories.post import post_crud
+from src.schemas.user import User
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.search_index_enabled:
+        post_crud.add_listener(post_crud.search_index)
+        async with async_session() as db:
+            await post_crud.search_index.build(db)
+        logger.info(
+            'Search index built [posts:%s]',
+            len(post_crud.search_index.index),
+        )
+
+    yield
+
+    password_hasher.shutdown()
 
 
 app = FastAPI(
@@ -13,15 +37,37 @@ app = FastAPI(
     docs_url='/api/openapi',
     openapi_url='/api/openapi.json',
     default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 app.include_router(api_router, prefix='/api/v1')
+if settings.admission_enabled:
+    app.add_middleware(AdmissionMiddleware)
+app.add_middleware(InstrumentationMiddleware)
 
 @app.get("/ping")
 async def ping(user: User = Depends(get_current_user)) -> dict:
     return {'message': 'Pong'}
 
 
+@app.get('/metrics', include_in_schema=False)
+async def get_metrics() -> PlainTextResponse:
+    """
+    Метрики сервиса в текстовом формате Prometheus
+    """
+
+    pools = {'primary': get_pool_stats(engine)}
+    for index, replica in enumerate(read_router.replicas):
+        pools[f'replica_{index}'] = get_pool_stats(replica.kw['bind'])
+
+    admission = (
+        admission_controller.stats() if settings.admission_enabled else None
+    )
+    return PlainTextResponse(
+        metrics.render(pools, admission), media_type=CONTENT_TYPE
+    )
+
+
 if __name__ == '__main__':
     host = settings.project_host
     uvicorn.run(
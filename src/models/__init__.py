@@ -1,3 +1,4 @@
 from src.models.base import Base
 from src.models.user import User
 from src.models.post import Post
+from src.models.post_monthly_count import PostMonthlyCount
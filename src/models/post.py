@@ -1,10 +1,27 @@
 from datetime import datetime
 
-from sqlalchemy import String, ForeignKey, DateTime, func, Integer
+from sqlalchemy import (
+    Computed,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    func,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .base import Base
 
+EXCERPT_LENGTH = 200
+EXCERPT_EXPRESSION = f'left(content, {EXCERPT_LENGTH})'
+SEARCH_CONFIG = 'russian'
+SEARCH_VECTOR_EXPRESSION = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(content, '')), 'B')"
+)
+
 
 class Post(Base):
     """
@@ -12,10 +29,28 @@ class Post(Base):
     """
 
     __tablename__ = 'post'
+    __table_args__ = (
+        Index('ix_post_created_at_id', 'created_at', 'id'),
+        Index(
+            'ix_post_search_vector', 'search_vector', postgresql_using='gin'
+        ),
+    )
+    # не возвращать вычисляемые колонки из INSERT ... RETURNING
+    __mapper_args__ = {'eager_defaults': False}
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    user_id: Mapped[int] = mapped_column(ForeignKey('user.id', ondelete='CASCADE'), nullable=False)
+    user_id: Mapped[int] = mapped_column(ForeignKey('user.id', ondelete='CASCADE'), nullable=False, index=True)
     title: Mapped[str] = mapped_column(String, nullable=False)
     content: Mapped[str] = mapped_column(String, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=func.now())
     updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=func.now(), onupdate=func.now())
+    excerpt: Mapped[str] = mapped_column(
+        String,
+        Computed(EXCERPT_EXPRESSION, persisted=True),
+        deferred=True,
+    )
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(SEARCH_VECTOR_EXPRESSION, persisted=True),
+        deferred=True,
+    )
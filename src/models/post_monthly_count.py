@@ -0,0 +1,150 @@
+from datetime import date
+
+from sqlalchemy import DDL, Date, ForeignKey, Integer, event
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+# Счётчики поддерживаются триггерами на таблице post в той же транзакции,
+# что и изменение поста, поэтому учитываются любые пути записи.
+# Триггеры уровня оператора: изменения строк оператора суммируются
+# по (user_id, month), и каждый счётчик обновляется один раз в порядке
+# (user_id, month), поэтому параллельные пакетные записи не блокируют
+# друг друга взаимно
+POST_MONTHLY_COUNTS_FUNCTION = """
+CREATE OR REPLACE FUNCTION post_monthly_counts_update() RETURNS trigger AS $$
+DECLARE
+    user_ids integer[];
+    months date[];
+    deltas integer[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO post_monthly_counts (user_id, month, count)
+        SELECT user_id, date_trunc('month', created_at)::date, count(*)
+        FROM new_rows
+        GROUP BY 1, 2
+        ORDER BY 1, 2
+        ON CONFLICT (user_id, month)
+        DO UPDATE SET count = post_monthly_counts.count + EXCLUDED.count;
+        RETURN NULL;
+    ELSIF TG_OP = 'DELETE' THEN
+        SELECT
+            array_agg(user_id ORDER BY user_id, month),
+            array_agg(month ORDER BY user_id, month),
+            array_agg(-delta ORDER BY user_id, month)
+        INTO user_ids, months, deltas
+        FROM (
+            SELECT user_id, date_trunc('month', created_at)::date AS month,
+                count(*)::integer AS delta
+            FROM old_rows
+            GROUP BY 1, 2
+        ) AS changes;
+    ELSE
+        SELECT
+            array_agg(user_id ORDER BY user_id, month),
+            array_agg(month ORDER BY user_id, month),
+            array_agg(delta ORDER BY user_id, month)
+        INTO user_ids, months, deltas
+        FROM (
+            SELECT user_id, month, sum(delta)::integer AS delta
+            FROM (
+                SELECT user_id,
+                    date_trunc('month', created_at)::date AS month,
+                    1 AS delta
+                FROM new_rows
+                UNION ALL
+                SELECT user_id, date_trunc('month', created_at)::date, -1
+                FROM old_rows
+            ) AS row_changes
+            GROUP BY 1, 2
+            HAVING sum(delta) <> 0
+        ) AS changes;
+    END IF;
+    IF user_ids IS NULL THEN
+        RETURN NULL;
+    END IF;
+
+    -- блокировка существующих счётчиков в порядке (user_id, month)
+    PERFORM 1
+    FROM post_monthly_counts AS counts
+    JOIN unnest(user_ids, months) AS changes (user_id, month)
+        ON counts.user_id = changes.user_id
+        AND counts.month = changes.month
+    ORDER BY counts.user_id, counts.month
+    FOR UPDATE OF counts;
+
+    -- уменьшаются только существующие счётчики: счётчики удалённого
+    -- пользователя уже удалены каскадом вместе с ним
+    UPDATE post_monthly_counts AS counts
+    SET count = counts.count + changes.delta
+    FROM unnest(user_ids, months, deltas) AS changes (user_id, month, delta)
+    WHERE changes.delta < 0
+        AND counts.user_id = changes.user_id
+        AND counts.month = changes.month;
+    DELETE FROM post_monthly_counts AS counts
+    USING unnest(user_ids, months, deltas) AS changes (user_id, month, delta)
+    WHERE changes.delta < 0
+        AND counts.user_id = changes.user_id
+        AND counts.month = changes.month
+        AND counts.count <= 0;
+
+    INSERT INTO post_monthly_counts (user_id, month, count)
+    SELECT user_id, month, delta
+    FROM unnest(user_ids, months, deltas) AS changes (user_id, month, delta)
+    WHERE delta > 0
+    ORDER BY 1, 2
+    ON CONFLICT (user_id, month)
+    DO UPDATE SET count = post_monthly_counts.count + EXCLUDED.count;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+# таблицы переходов нельзя задать для триггера на несколько событий
+# или со списком колонок, поэтому по триггеру на каждое событие
+POST_MONTHLY_COUNTS_TRIGGERS = (
+    """
+    CREATE OR REPLACE TRIGGER post_monthly_counts_insert
+    AFTER INSERT ON post
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION post_monthly_counts_update()
+    """,
+    """
+    CREATE OR REPLACE TRIGGER post_monthly_counts_delete
+    AFTER DELETE ON post
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION post_monthly_counts_update()
+    """,
+    """
+    CREATE OR REPLACE TRIGGER post_monthly_counts_update
+    AFTER UPDATE ON post
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION post_monthly_counts_update()
+    """,
+)
+# пересчёт счётчиков по всем постам после загрузки с отключёнными триггерами
+POST_MONTHLY_COUNTS_REBUILD = (
+    'DELETE FROM post_monthly_counts',
+    """
+    INSERT INTO post_monthly_counts (user_id, month, count)
+    SELECT user_id, date_trunc('month', created_at)::date, count(*)
+    FROM post
+    GROUP BY 1, 2
+    """,
+)
+
+
+class PostMonthlyCount(Base):
+    """
+    Количество постов пользователя за месяц
+    """
+
+    __tablename__ = 'post_monthly_counts'
+
+    user_id: Mapped[int] = mapped_column(ForeignKey('user.id', ondelete='CASCADE'), primary_key=True)
+    month: Mapped[date] = mapped_column(Date, primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+event.listen(Base.metadata, 'after_create', DDL(POST_MONTHLY_COUNTS_FUNCTION))
+for trigger in POST_MONTHLY_COUNTS_TRIGGERS:
+    event.listen(Base.metadata, 'after_create', DDL(trigger))
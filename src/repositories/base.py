@@ -1,8 +1,19 @@
-from typing import Any, Generic, Type, TypeVar
+from dataclasses import fields
+from itertools import starmap
+from typing import Any, Generic, Sequence, Type, TypeVar
 
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
-from sqlalchemy import select
+from sqlalchemy import (
+    Select,
+    any_,
+    delete,
+    insert,
+    literal,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models.base import Base
@@ -12,6 +23,26 @@ CreateSchemaType = TypeVar('CreateSchemaType', bound=BaseModel)
 UpdateSchemaType = TypeVar('UpdateSchemaType', bound=BaseModel)
 
 
+def select_rows(model: Type[Base], row_type: type) -> Select:
+    """
+    Выборка колонок модели в порядке полей row_type (dataclass)
+    """
+
+    return select(*(getattr(model, field.name) for field in fields(row_type)))
+
+
+async def fetch_rows(
+    db: AsyncSession, stmt: Select, row_type: type
+) -> list[Any]:
+    """
+    Выполнение выборки колонок с упаковкой строк в row_type
+    без загрузки ORM-объектов
+    """
+
+    result = await db.execute(statement=stmt)
+    return list(starmap(row_type, result))
+
+
 class Repository:
 
     def get(self, *args, **kwargs):
@@ -30,11 +61,40 @@ class Repository:
         raise NotImplementedError
 
 
+class RepositoryListener:
+    """
+    Подписчик на изменения объектов репозитория.
+    Методы вызываются после успешного коммита
+    """
+
+    async def on_create(self, obj: Any) -> None:
+        pass
+
+    async def on_update(self, obj: Any) -> None:
+        pass
+
+    async def on_delete(self, obj: Any) -> None:
+        pass
+
+
 class RepositoryDB(
     Repository, Generic[ModelType, CreateSchemaType, UpdateSchemaType]
 ):
     def __init__(self, model: Type[ModelType]) -> None:
         self._model = model
+        self._listeners: list[RepositoryListener] = []
+
+    def add_listener(self, listener: RepositoryListener) -> None:
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: RepositoryListener) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    async def _notify(self, event: str, obj: ModelType) -> None:
+        for listener in self._listeners:
+            await getattr(listener, event)(obj)
 
     async def get(self, db: AsyncSession, obj_id: Any) -> ModelType | None:
         stmt = select(self._model).where(self._model.id == obj_id)
@@ -44,41 +104,167 @@ class RepositoryDB(
     async def get_multi(
         self, db: AsyncSession, *, offset: int, limit: int
     ) -> list[ModelType]:
-        stmt = select(self._model).offset(offset).limit(limit)
+        stmt = (
+            select(self._model)
+            .order_by(self._model.id)
+            .offset(offset)
+            .limit(limit)
+        )
         results = await db.execute(statement=stmt)
         return results.scalars().all()
 
     async def create(
         self, db: AsyncSession, *, obj: CreateSchemaType
     ) -> ModelType:
-        obj_data = jsonable_encoder(obj)
-        db_obj = self._model(**obj_data)
-        db.add(db_obj)
+        stmt = (
+            insert(self._model)
+            .values(**jsonable_encoder(obj))
+            .returning(self._model)
+        )
+        results = await db.scalars(stmt)
+        db_obj = results.one()
         await db.commit()
-        await db.refresh(db_obj)
+        await self._notify('on_create', db_obj)
         return db_obj
 
+    async def create_many(
+        self, db: AsyncSession, *, objs: list[CreateSchemaType]
+    ) -> list[ModelType]:
+        """
+        Создание объектов одним запросом INSERT ... RETURNING
+        в одной транзакции
+        """
+
+        if not objs:
+            return []
+
+        stmt = insert(self._model).returning(
+            self._model, sort_by_parameter_order=True
+        )
+        results = await db.scalars(
+            stmt, [jsonable_encoder(obj) for obj in objs]
+        )
+        db_objs = results.all()
+        await db.commit()
+        for db_obj in db_objs:
+            await self._notify('on_create', db_obj)
+        return db_objs
+
+    async def copy_records(
+        self,
+        db: AsyncSession,
+        *,
+        columns: Sequence[str],
+        records: list[tuple],
+    ) -> int:
+        """
+        Загрузка записей в таблицу командой COPY. Значения по умолчанию
+        SQLAlchemy и подписчики репозитория не применяются
+        """
+
+        conn = await db.connection()
+        raw_conn = await conn.get_raw_connection()
+        driver_conn = raw_conn.driver_connection
+        async with driver_conn.transaction():
+            await driver_conn.copy_records_to_table(
+                self._model.__tablename__, columns=columns, records=records
+            )
+        return len(records)
+
+    @staticmethod
+    def _update_values(data: UpdateSchemaType) -> dict[str, Any]:
+        return {
+            key: value
+            for key, value in jsonable_encoder(data).items()
+            if value is not None
+        }
+
+    def _id_in(self, obj_ids: list[Any]) -> Any:
+        return self._model.id == any_(
+            literal(obj_ids, ARRAY(self._model.id.type))
+        )
+
+    async def delete_many(
+        self, db: AsyncSession, *, obj_ids: list[Any]
+    ) -> list[ModelType]:
+        """
+        Удаление объектов одним запросом DELETE ... RETURNING.
+        Возвращает удалённые объекты
+        """
+
+        stmt = (
+            delete(self._model)
+            .where(self._id_in(obj_ids))
+            .returning(self._model)
+        )
+        results = await db.scalars(stmt)
+        objs = results.all()
+        await db.commit()
+        for obj in objs:
+            await self._notify('on_delete', obj)
+        return objs
+
+    async def patch_many(
+        self, db: AsyncSession, *, obj_ids: list[Any], data: UpdateSchemaType
+    ) -> list[ModelType]:
+        """
+        Обновление объектов одним запросом UPDATE ... RETURNING.
+        Возвращает обновлённые объекты
+        """
+
+        obj_data = self._update_values(data)
+        if not obj_data:
+            stmt = select(self._model).where(self._id_in(obj_ids))
+            results = await db.scalars(stmt)
+            return results.all()
+
+        stmt = (
+            update(self._model)
+            .where(self._id_in(obj_ids))
+            .values(**obj_data)
+            .returning(self._model)
+        )
+        results = await db.scalars(stmt)
+        objs = results.all()
+        await db.commit()
+        for obj in objs:
+            await self._notify('on_update', obj)
+        return objs
+
     async def delete(self, db: AsyncSession, obj_id: Any) -> ModelType | None:
-        obj = await self.get(db=db, obj_id=obj_id)
+        stmt = (
+            delete(self._model)
+            .where(self._model.id == obj_id)
+            .returning(self._model)
+        )
+        results = await db.scalars(stmt)
+        obj = results.one_or_none()
         if not obj:
             return None
 
-        await db.delete(obj)
         await db.commit()
+        await self._notify('on_delete', obj)
         return obj
 
     async def patch(
         self, db: AsyncSession, obj_id: Any, data: UpdateSchemaType
     ) -> ModelType | None:
-        obj = await self.get(db=db, obj_id=obj_id)
+        obj_data = self._update_values(data)
+        if not obj_data:
+            return await self.get(db=db, obj_id=obj_id)
+
+        # updated_at выставляется в БД через onupdate=func.now()
+        stmt = (
+            update(self._model)
+            .where(self._model.id == obj_id)
+            .values(**obj_data)
+            .returning(self._model)
+        )
+        results = await db.scalars(stmt)
+        obj = results.one_or_none()
         if not obj:
             return None
 
-        obj_data = jsonable_encoder(data)
-        for key, value in obj_data.items():
-            if value is not None:
-                setattr(obj, key, value)
-
         await db.commit()
-        await db.refresh(obj)
+        await self._notify('on_update', obj)
         return obj
@@ -1,55 +1,294 @@
-from sqlalchemy import extract, func, select
+from dataclasses import fields
+from datetime import date, datetime, timedelta
+from typing import Any, AsyncIterator, Sequence, Type
+
+from sqlalchemy import (
+    Integer,
+    Select,
+    and_,
+    any_,
+    func,
+    literal,
+    select,
+    tuple_,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.cache import LRUCache, TwoTierCache
+from src.core.config import settings
+from src.core.pagination import CursorKey, Page
 from src.models.post import Post as PostModel
-from src.schemas.post import PostCreate, PostUpdate
+from src.models.post_monthly_count import PostMonthlyCount
+from src.models.user import User as UserModel
+from src.schemas.post import (
+    PostCreate,
+    PostInDB,
+    PostRow,
+    PostUpdate,
+    SearchMode,
+)
+from src.search.base import SearchBackend
+from src.search.memory import MemorySearchBackend
+from src.search.sql import FullTextSearchBackend, SubstringSearchBackend
+
+from .base import RepositoryDB, RepositoryListener, select_rows
+
+
+class PostCacheInvalidator(RepositoryListener):
+    """
+    Удаление изменённых и удалённых постов из кэша
+    """
 
-from .base import RepositoryDB, ModelType
+    def __init__(self, cache: TwoTierCache) -> None:
+        self._cache = cache
+
+    async def on_update(self, obj: PostModel) -> None:
+        await self._cache.delete(obj.id)
+
+    async def on_delete(self, obj: PostModel) -> None:
+        await self._cache.delete(obj.id)
 
 
 class RepositoryPost(RepositoryDB[PostModel, PostCreate, PostUpdate]):
-    async def get_avg_posts_per_month_for_user(
-        self, db: AsyncSession, user_id: int
-    ) -> int:
+    def __init__(self, model: Type[PostModel]) -> None:
+        super().__init__(model)
+        self.cache = TwoTierCache(
+            LRUCache(settings.post_cache_size, settings.post_cache_ttl),
+            namespace='post',
+            dumps=lambda post: post.model_dump_json().encode(),
+            loads=PostInDB.model_validate_json,
+            enabled=settings.post_cache_enabled,
+        )
+        self.add_listener(PostCacheInvalidator(self.cache))
+        self.search_index = MemorySearchBackend(model)
+        self._search_backends: dict[SearchMode, SearchBackend] = {
+            SearchMode.fts: FullTextSearchBackend(model),
+            SearchMode.ilike: SubstringSearchBackend(model),
+            SearchMode.memory: self.search_index,
+        }
+
+    async def get_cached(
+        self,
+        db: AsyncSession,
+        obj_id: int,
+        *,
+        use_cache: bool = True,
+        fill_cache: bool = True,
+    ) -> PostInDB | None:
+        """
+        Получение поста через кэш.
+        use_cache=False читает пост мимо кэша, fill_cache=False не
+        сохраняет прочитанный пост в кэш (чтение с отстающей реплики)
+        """
+
+        async def load() -> PostInDB | None:
+            post = await self.get(db=db, obj_id=obj_id)
+            return PostInDB.model_validate(post) if post else None
+
+        if not use_cache:
+            return await load()
+        if not fill_cache:
+            post = await self.cache.get(obj_id)
+            return post if post is not None else await load()
+        return await self.cache.get_or_load(obj_id, load)
+
+    async def get_multi_rows(
+        self,
+        db: AsyncSession,
+        *,
+        offset: int,
+        limit: int | None,
+        row_type: type = PostRow,
+    ) -> Page:
         """
-        Получение среднего количества постов пользователя за месяц
+        Получение страницы постов строками row_type без загрузки
+        ORM-объектов; выбираются только колонки полей row_type
+        и ключи страницы
         """
 
-        monthly_counts = (
-            select(func.count(self._model.id).label('post_count'))
-            .where(self._model.user_id == user_id)
-            .group_by(
-                extract('year', self._model.created_at),
-                extract('month', self._model.created_at),
+        stmt = (
+            self._select_page(row_type)
+            .order_by(self._model.id)
+            .offset(offset)
+            .limit(limit)
+        )
+        result = await db.execute(statement=stmt)
+        return self._make_page(result.all(), False, row_type)
+
+    async def get_multi_by_cursor(
+        self,
+        db: AsyncSession,
+        *,
+        after: CursorKey | None = None,
+        before: CursorKey | None = None,
+        limit: int | None = None,
+        row_type: type = PostRow,
+    ) -> Page:
+        """
+        Получение страницы постов по курсору (created_at, id).
+        Посты упорядочены от новых к старым
+        """
+
+        key = tuple_(self._model.created_at, self._model.id)
+        stmt = self._select_page(row_type)
+        if before is not None:
+            stmt = stmt.where(key > tuple_(*before)).order_by(
+                self._model.created_at, self._model.id
+            )
+        else:
+            if after is not None:
+                stmt = stmt.where(key < tuple_(*after))
+            stmt = stmt.order_by(
+                self._model.created_at.desc(), self._model.id.desc()
             )
-            .subquery()
+        if limit is not None:
+            stmt = stmt.limit(limit + 1)
+
+        result = await db.execute(statement=stmt)
+        rows = result.all()
+        has_more = limit is not None and len(rows) > limit
+        if has_more:
+            rows = rows[:limit]
+        if before is not None:
+            rows.reverse()
+
+        return self._make_page(rows, has_more, row_type)
+
+    def _select_page(self, row_type: type) -> Select:
+        # ключи страницы выбираются дополнительными колонками,
+        # даже если их нет среди полей row_type
+        return select_rows(self._model, row_type).add_columns(
+            self._model.created_at, self._model.id, self._model.updated_at
         )
-        stmt = select(
-            func.avg(monthly_counts.c.post_count).label('avg_posts_per_month')
+
+    @staticmethod
+    def _make_page(rows: list, has_more: bool, row_type: type) -> Page:
+        width = len(fields(row_type))
+        return Page(
+            [row_type(*row[:width]) for row in rows],
+            has_more,
+            [tuple(row[width:]) for row in rows],
         )
-        result = await db.execute(statement=stmt)
 
-        return int(result.scalar())
+    async def get_updated_at(
+        self, db: AsyncSession, obj_id: int, *, use_cache: bool = True
+    ) -> datetime | None:
+        """
+        Получение времени изменения поста из кэша или запросом
+        без загрузки содержимого
+        """
 
-    async def search_posts(
-        self, db: AsyncSession, *, search_str: str, offset: int, limit: int
-    ) ->list[ModelType]:
+        post = await self.cache.get(obj_id) if use_cache else None
+        if post is not None:
+            return post.updated_at
+
+        stmt = select(self._model.updated_at).where(self._model.id == obj_id)
+        return await db.scalar(stmt)
+
+    async def get_avg_posts_per_month_for_users(
+        self,
+        db: AsyncSession,
+        user_ids: list[int],
+        date_from: date | None = None,
+        date_to: date | None = None,
+    ) -> dict[int, int]:
         """
-        Поиск постов по названию или содержанию
+        Получение среднего количества постов за месяц для нескольких
+        пользователей одним запросом по помесячным счётчикам.
+        Период учитывается с точностью до месяца; несуществующие
+        пользователи в результат не попадают
         """
 
+        join_on = [PostMonthlyCount.user_id == UserModel.id]
+        if date_from is not None:
+            join_on.append(PostMonthlyCount.month >= date_from.replace(day=1))
+        if date_to is not None:
+            join_on.append(PostMonthlyCount.month <= date_to)
         stmt = (
-            select(self._model)
-            .where(
-                self._model.title.ilike(f'%{search_str}%')
-                | self._model.content.ilike(f'%{search_str}%')
+            select(
+                UserModel.id,
+                func.avg(PostMonthlyCount.count).label('avg_posts_per_month'),
             )
-            .offset(offset)
-            .limit(limit)
+            .outerjoin(PostMonthlyCount, and_(*join_on))
+            .where(UserModel.id == any_(literal(user_ids, ARRAY(Integer))))
+            .group_by(UserModel.id)
         )
         result = await db.execute(statement=stmt)
 
-        return result.scalars().all()
+        return {
+            user_id: int(avg_posts) if avg_posts is not None else 0
+            for user_id, avg_posts in result.all()
+        }
+
+    async def stream_rows(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: int | None = None,
+        date_from: date | None = None,
+        date_to: date | None = None,
+        batch_size: int,
+    ) -> AsyncIterator[Sequence[Any]]:
+        """
+        Потоковое чтение постов серверным курсором пачками по batch_size
+        строк. Следующая пачка читается только после обработки предыдущей
+        """
+
+        stmt = (
+            select(
+                self._model.id,
+                self._model.user_id,
+                self._model.title,
+                self._model.content,
+                self._model.created_at,
+                self._model.updated_at,
+            )
+            .order_by(self._model.id)
+            .execution_options(yield_per=batch_size)
+        )
+        if user_id is not None:
+            stmt = stmt.where(self._model.user_id == user_id)
+        if date_from is not None:
+            stmt = stmt.where(self._model.created_at >= date_from)
+        if date_to is not None:
+            stmt = stmt.where(
+                self._model.created_at < date_to + timedelta(days=1)
+            )
+
+        result = await db.stream(stmt)
+        async for rows in result.partitions():
+            yield rows
+
+    async def search_posts(
+        self,
+        db: AsyncSession,
+        *,
+        search_str: str,
+        offset: int,
+        limit: int,
+        mode: SearchMode | None = None,
+        row_type: type = PostRow,
+    ) -> list[Any]:
+        """
+        Поиск постов по названию или содержанию.
+        Если выбранный движок не готов (индекс в памяти не построен),
+        используется полнотекстовый поиск Postgres
+        """
+
+        backend = self._search_backends[
+            mode or SearchMode(settings.search_default_mode)
+        ]
+        if not backend.ready:
+            backend = self._search_backends[SearchMode.fts]
+
+        return await backend.search(
+            db,
+            search_str=search_str,
+            offset=offset,
+            limit=limit,
+            row_type=row_type,
+        )
 
 
 post_crud = RepositoryPost(PostModel)
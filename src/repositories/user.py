@@ -1,4 +1,5 @@
-from sqlalchemy import select
+from sqlalchemy import Integer, any_, literal, select
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models.user import User as UserModel
@@ -19,5 +20,18 @@ class RepositoryUser(RepositoryDB[UserModel, UserCreate, UserUpdate]):
         results = await db.execute(statement=stmt)
         return results.scalar_one_or_none()
 
+    async def get_existing_ids(
+        self, db: AsyncSession, user_ids: list[int]
+    ) -> set[int]:
+        """
+        Получение идентификаторов существующих пользователей из списка
+        """
+
+        stmt = select(self._model.id).where(
+            self._model.id == any_(literal(user_ids, ARRAY(Integer)))
+        )
+        results = await db.execute(statement=stmt)
+        return set(results.scalars().all())
+
 
 user_crud = RepositoryUser(UserModel)
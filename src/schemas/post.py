@@ -1,7 +1,20 @@
-from datetime import datetime
+from dataclasses import dataclass, fields, make_dataclass
+from datetime import UTC, date, datetime
+from enum import Enum
+from functools import lru_cache
 from typing import Optional
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    field_validator,
+    model_validator,
+)
+
+from src.core.config import settings
+
+STATISTICS_MAX_USERS = 1000
 
 
 class PostBase(BaseModel):
@@ -19,9 +32,113 @@ class PostCreate(PostBase):
     user_id: Optional[int] = None
 
 
+class PostImport(PostCreate):
+    user_id: int
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    @field_validator('created_at', 'updated_at')
+    @classmethod
+    def to_naive_utc(cls, value: datetime | None) -> datetime | None:
+        # время в БД хранится без часового пояса в UTC
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(UTC).replace(tzinfo=None)
+        return value
+
+
 class PostInDB(PostCreate):
     id: int
     created_at: datetime
     updated_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+
+@dataclass(slots=True)
+class PostRow:
+    """
+    Пост для чтения списков: строка выборки без ORM-объекта и валидации,
+    сериализуется orjson напрямую. Поля совпадают с PostInDB
+    """
+
+    title: str
+    content: str
+    user_id: int
+    id: int
+    created_at: datetime
+    updated_at: datetime
+
+
+POST_FIELDS = (*(field.name for field in fields(PostRow)), 'excerpt')
+
+
+@lru_cache
+def post_row_type(names: tuple[str, ...]) -> type:
+    """
+    Тип строки поста с выбранными полями (из POST_FIELDS)
+    """
+
+    return make_dataclass('PostFieldsRow', names, slots=True)
+
+
+class PostsBulkDelete(BaseModel):
+    ids: list[int] = Field(
+        min_length=1, max_length=settings.post_bulk_max_size
+    )
+
+
+class PostsBulkUpdate(PostsBulkDelete):
+    data: PostUpdate
+
+
+class PostsBulkResult(BaseModel):
+    posts: list[PostInDB]
+    not_found: list[int]
+
+
+class SearchMode(str, Enum):
+    fts = 'fts'
+    ilike = 'ilike'
+    memory = 'memory'
+
+
+class ExportFormat(str, Enum):
+    ndjson = 'ndjson'
+    csv = 'csv'
+
+
+class PostsImportError(BaseModel):
+    batch: int
+    line: Optional[int] = None
+    detail: str
+
+
+class PostsImportReport(BaseModel):
+    rows: int
+    inserted: int
+    failed: int
+    elapsed_s: float
+    rows_per_second: float
+    errors: list[PostsImportError]
+
+
+class PostsStatisticsPeriod(BaseModel):
+    date_from: Optional[date] = Field(None, alias='from')
+    date_to: Optional[date] = Field(None, alias='to')
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    @model_validator(mode='after')
+    def check_period(self) -> 'PostsStatisticsPeriod':
+        if self.date_from and self.date_to and self.date_from > self.date_to:
+            raise ValueError('from must not be later than to')
+        return self
+
+
+class PostsStatisticsRequest(PostsStatisticsPeriod):
+    user_ids: list[int] = Field(min_length=1, max_length=STATISTICS_MAX_USERS)
+
+
+class PostsStatistics(BaseModel):
+    avg_posts_month: dict[int, int]
+    not_found: list[int]
@@ -0,0 +1,26 @@
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.schemas.post import PostRow
+
+
+class SearchBackend:
+    """
+    Поисковый движок постов
+    """
+
+    @property
+    def ready(self) -> bool:
+        return True
+
+    async def search(
+        self,
+        db: AsyncSession,
+        *,
+        search_str: str,
+        offset: int | None,
+        limit: int | None,
+        row_type: type = PostRow,
+    ) -> list[Any]:
+        raise NotImplementedError
@@ -0,0 +1,240 @@
+import heapq
+import math
+import re
+from array import array
+from bisect import bisect_left
+from operator import itemgetter
+from typing import Any, Type
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.post import Post as PostModel
+from src.repositories.base import RepositoryListener, select_rows
+from src.schemas.post import PostRow
+
+from .base import SearchBackend
+
+TOKEN_PATTERN = re.compile(r'\w+')
+TITLE_WEIGHT = 2
+BUILD_BATCH_SIZE = 5000
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Разбиение текста на термы
+    """
+
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class PostingList:
+    """
+    Список вхождений терма: отсортированные идентификаторы документов
+    и частоты терма в них, хранящиеся в компактных массивах
+    """
+
+    __slots__ = ('doc_ids', 'freqs')
+
+    def __init__(self) -> None:
+        self.doc_ids = array('i')
+        self.freqs = array('I')
+
+    def __len__(self) -> int:
+        return len(self.doc_ids)
+
+    def set(self, doc_id: int, freq: int) -> None:
+        pos = bisect_left(self.doc_ids, doc_id)
+        if pos < len(self.doc_ids) and self.doc_ids[pos] == doc_id:
+            self.freqs[pos] = freq
+            return
+        self.doc_ids.insert(pos, doc_id)
+        self.freqs.insert(pos, freq)
+
+    def discard(self, doc_id: int) -> None:
+        pos = bisect_left(self.doc_ids, doc_id)
+        if pos < len(self.doc_ids) and self.doc_ids[pos] == doc_id:
+            del self.doc_ids[pos]
+            del self.freqs[pos]
+
+
+class InvertedIndex:
+    """
+    Инвертированный индекс с ранжированием BM25.
+    Вхождения в названии учитываются с весом TITLE_WEIGHT
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75) -> None:
+        self.k1 = k1
+        self.b = b
+        self._term_ids: dict[str, int] = {}
+        self._postings: list[PostingList] = []
+        self._doc_terms: dict[int, array] = {}
+        self._doc_lengths = array('I')
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    def __contains__(self, doc_id: int) -> bool:
+        return doc_id in self._doc_terms
+
+    def add(self, doc_id: int, title: str, content: str) -> None:
+        """
+        Добавление документа; ранее проиндексированная версия заменяется
+        """
+
+        self.remove(doc_id)
+
+        freqs: dict[str, int] = {}
+        for term in tokenize(title):
+            freqs[term] = freqs.get(term, 0) + TITLE_WEIGHT
+        for term in tokenize(content):
+            freqs[term] = freqs.get(term, 0) + 1
+
+        term_ids = array('I')
+        for term, freq in freqs.items():
+            term_id = self._term_ids.get(term)
+            if term_id is None:
+                term_id = self._term_ids[term] = len(self._postings)
+                self._postings.append(PostingList())
+            self._postings[term_id].set(doc_id, freq)
+            term_ids.append(term_id)
+
+        length = sum(freqs.values())
+        if doc_id >= len(self._doc_lengths):
+            self._doc_lengths.extend(
+                [0] * (doc_id + 1 - len(self._doc_lengths))
+            )
+        self._doc_lengths[doc_id] = length
+        self._doc_terms[doc_id] = term_ids
+        self._total_length += length
+
+    def remove(self, doc_id: int) -> None:
+        """
+        Удаление документа из индекса
+        """
+
+        term_ids = self._doc_terms.pop(doc_id, None)
+        if term_ids is None:
+            return
+
+        for term_id in term_ids:
+            self._postings[term_id].discard(doc_id)
+        self._total_length -= self._doc_lengths[doc_id]
+        self._doc_lengths[doc_id] = 0
+
+    def search(self, query: str, k: int | None) -> list[tuple[int, float]]:
+        """
+        Поиск k наиболее релевантных документов.
+        Возвращает пары (идентификатор документа, оценка BM25)
+        """
+
+        doc_count = len(self._doc_terms)
+        if not doc_count or not self._total_length:
+            return []
+
+        k1 = self.k1
+        length_norm = k1 * (1 - self.b)
+        length_scale = k1 * self.b * doc_count / self._total_length
+        doc_lengths = self._doc_lengths
+        scores: dict[int, float] = {}
+        for term in set(tokenize(query)):
+            term_id = self._term_ids.get(term)
+            if term_id is None:
+                continue
+            posting = self._postings[term_id]
+            doc_freq = len(posting)
+            if not doc_freq:
+                continue
+
+            idf = math.log(
+                1 + (doc_count - doc_freq + 0.5) / (doc_freq + 0.5)
+            )
+            weight = idf * (k1 + 1)
+            for doc_id, freq in zip(posting.doc_ids, posting.freqs):
+                scores[doc_id] = scores.get(doc_id, 0.0) + weight * freq / (
+                    freq + length_norm + length_scale * doc_lengths[doc_id]
+                )
+
+        key = itemgetter(1, 0)
+        if k is None:
+            return sorted(scores.items(), key=key, reverse=True)
+
+        return heapq.nlargest(k, scores.items(), key=key)
+
+
+class MemorySearchBackend(SearchBackend, RepositoryListener):
+    """
+    Поиск по инвертированному индексу в памяти процесса.
+    Индекс строится при старте приложения и поддерживается в актуальном
+    состоянии событиями репозитория постов. Изменения, сделанные другими
+    процессами, в индекс не попадают
+    """
+
+    def __init__(self, model: Type[PostModel]) -> None:
+        self._model = model
+        self._index = InvertedIndex()
+        self._ready = False
+
+    @property
+    def ready(self) -> bool:
+        return self._ready
+
+    @property
+    def index(self) -> InvertedIndex:
+        return self._index
+
+    async def build(self, db: AsyncSession) -> None:
+        """
+        Построение индекса потоковым чтением таблицы постов
+        """
+
+        stmt = select(
+            self._model.id, self._model.title, self._model.content
+        ).execution_options(yield_per=BUILD_BATCH_SIZE)
+        result = await db.stream(stmt)
+        async for doc_id, title, content in result:
+            self._index.add(doc_id, title, content)
+        self._ready = True
+
+    def reset(self) -> None:
+        self._index = InvertedIndex()
+        self._ready = False
+
+    async def search(
+        self,
+        db: AsyncSession,
+        *,
+        search_str: str,
+        offset: int | None,
+        limit: int | None,
+        row_type: type = PostRow,
+    ) -> list[Any]:
+        offset = offset or 0
+        k = None if limit is None else offset + limit
+        hits = self._index.search(search_str, k)[offset:]
+        if not hits:
+            return []
+
+        ids = [doc_id for doc_id, _ in hits]
+        # id выбирается последней колонкой для восстановления порядка,
+        # даже если его нет среди полей row_type
+        stmt = (
+            select_rows(self._model, row_type)
+            .add_columns(self._model.id)
+            .where(self._model.id.in_(ids))
+        )
+        result = await db.execute(statement=stmt)
+        posts = {row[-1]: row_type(*row[:-1]) for row in result}
+
+        return [posts[doc_id] for doc_id in ids if doc_id in posts]
+
+    async def on_create(self, obj: Any) -> None:
+        self._index.add(obj.id, obj.title, obj.content)
+
+    async def on_update(self, obj: Any) -> None:
+        self._index.add(obj.id, obj.title, obj.content)
+
+    async def on_delete(self, obj: Any) -> None:
+        self._index.remove(obj.id)
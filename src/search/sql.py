@@ -0,0 +1,73 @@
+from typing import Any, Type
+
+from sqlalchemy import cast, func
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.post import SEARCH_CONFIG
+from src.models.post import Post as PostModel
+from src.repositories.base import fetch_rows, select_rows
+from src.schemas.post import PostRow
+
+from .base import SearchBackend
+
+
+class FullTextSearchBackend(SearchBackend):
+    """
+    Полнотекстовый поиск средствами Postgres (tsvector + GIN индекс)
+    с ранжированием по ts_rank
+    """
+
+    def __init__(self, model: Type[PostModel]) -> None:
+        self._model = model
+
+    async def search(
+        self,
+        db: AsyncSession,
+        *,
+        search_str: str,
+        offset: int | None,
+        limit: int | None,
+        row_type: type = PostRow,
+    ) -> list[Any]:
+        query = func.websearch_to_tsquery(
+            cast(SEARCH_CONFIG, REGCONFIG), search_str
+        )
+        rank = func.ts_rank(self._model.search_vector, query)
+        stmt = (
+            select_rows(self._model, row_type)
+            .where(self._model.search_vector.bool_op('@@')(query))
+            .order_by(rank.desc(), self._model.id.desc())
+            .offset(offset)
+            .limit(limit)
+        )
+        return await fetch_rows(db, stmt, row_type)
+
+
+class SubstringSearchBackend(SearchBackend):
+    """
+    Поиск подстроки в названии или содержании (ILIKE)
+    """
+
+    def __init__(self, model: Type[PostModel]) -> None:
+        self._model = model
+
+    async def search(
+        self,
+        db: AsyncSession,
+        *,
+        search_str: str,
+        offset: int | None,
+        limit: int | None,
+        row_type: type = PostRow,
+    ) -> list[Any]:
+        stmt = (
+            select_rows(self._model, row_type)
+            .where(
+                self._model.title.ilike(f'%{search_str}%')
+                | self._model.content.ilike(f'%{search_str}%')
+            )
+            .offset(offset)
+            .limit(limit)
+        )
+        return await fetch_rows(db, stmt, row_type)
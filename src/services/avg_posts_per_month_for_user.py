@@ -1,23 +1,47 @@
+from datetime import date
+
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.repositories.post import post_crud
-from src.repositories.user import user_crud
+from src.schemas.post import PostsStatistics
 
 
-async def retrieve_avg_posts_per_month(db: AsyncSession, user_id: int):
+async def retrieve_avg_posts_per_month(
+    db: AsyncSession,
+    user_id: int,
+    date_from: date | None = None,
+    date_to: date | None = None,
+):
     """
     Получение среднего количества постов пользователя за месяц
     """
 
-    user = await user_crud.get(db=db, obj_id=user_id)
-    if not user:
+    avg_posts = await post_crud.get_avg_posts_per_month_for_users(
+        db=db, user_ids=[user_id], date_from=date_from, date_to=date_to
+    )
+    if user_id not in avg_posts:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f'User(id={user_id}) not found',
         )
-    avg_posts = await post_crud.get_avg_posts_per_month_for_user(
-        db=db, user_id=user_id
+
+    return avg_posts[user_id]
+
+
+async def retrieve_avg_posts_per_month_for_users(
+    db: AsyncSession,
+    user_ids: list[int],
+    date_from: date | None = None,
+    date_to: date | None = None,
+) -> PostsStatistics:
+    """
+    Получение среднего количества постов за месяц для списка пользователей
+    """
+
+    avg_posts = await post_crud.get_avg_posts_per_month_for_users(
+        db=db, user_ids=user_ids, date_from=date_from, date_to=date_to
     )
+    not_found = sorted(set(user_ids) - avg_posts.keys())
 
-    return avg_posts
+    return PostsStatistics(avg_posts_month=avg_posts, not_found=not_found)
@@ -0,0 +1,73 @@
+import csv
+import io
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Sequence
+
+import orjson
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import settings
+from src.repositories.post import post_crud
+from src.schemas.post import ExportFormat
+
+EXPORT_FIELDS = (
+    'id',
+    'user_id',
+    'title',
+    'content',
+    'created_at',
+    'updated_at',
+)
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.ndjson: 'application/x-ndjson',
+    ExportFormat.csv: 'text/csv; charset=utf-8',
+}
+
+
+def encode_ndjson(rows: Sequence[Any]) -> bytes:
+    return b''.join(
+        orjson.dumps(row._asdict(), option=orjson.OPT_APPEND_NEWLINE)
+        for row in rows
+    )
+
+
+def encode_csv(rows: Sequence[Any]) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(
+        [
+            value.isoformat() if isinstance(value, datetime) else value
+            for value in row
+        ]
+        for row in rows
+    )
+    return buffer.getvalue().encode()
+
+
+async def export_posts(
+    session_factory: Callable[[], Awaitable[AsyncSession]],
+    *,
+    export_format: ExportFormat,
+    user_id: int | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+) -> AsyncIterator[bytes]:
+    """
+    Выгрузка постов по частям. Каждая часть - одна пачка строк
+    серверного курсора; сессия открывается на время выгрузки
+    """
+
+    if export_format == ExportFormat.csv:
+        encode = encode_csv
+        yield encode_csv([EXPORT_FIELDS])
+    else:
+        encode = encode_ndjson
+
+    async with await session_factory() as db:
+        async for rows in post_crud.stream_rows(
+            db,
+            user_id=user_id,
+            date_from=date_from,
+            date_to=date_to,
+            batch_size=settings.post_export_batch_size,
+        ):
+            yield encode(rows)
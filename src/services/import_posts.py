@@ -0,0 +1,240 @@
+import codecs
+import csv
+import time
+from datetime import UTC, datetime
+from typing import Any, AsyncIterator
+
+import orjson
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import logger
+from src.core.response_cache import response_cache
+from src.repositories.post import post_crud
+from src.repositories.user import user_crud
+from src.schemas.post import ExportFormat, PostImport, PostsImportReport
+
+IMPORT_COLUMNS = ('user_id', 'title', 'content', 'created_at', 'updated_at')
+READ_CHUNK_SIZE = 64 * 1024
+MAX_ERRORS_PER_BATCH = 100
+
+Record = tuple[int, str]
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """
+    Разбиение потока байтов в UTF-8 на строки
+    """
+
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    tail = ''
+    async for chunk in chunks:
+        lines = (tail + decoder.decode(chunk)).split('\n')
+        tail = lines.pop()
+        for line in lines:
+            yield line
+
+    tail += decoder.decode(b'', final=True)
+    if tail:
+        yield tail
+
+
+async def iter_records(
+    chunks: AsyncIterator[bytes], export_format: ExportFormat
+) -> AsyncIterator[Record]:
+    """
+    Разбиение потока на записи с номером первой строки записи.
+    Запись CSV может занимать несколько строк, если содержит переводы
+    строк в кавычках
+    """
+
+    line_no = 0
+    start = 0
+    lines: list[str] = []
+    quotes = 0
+    async for line in iter_lines(chunks):
+        line_no += 1
+        if export_format == ExportFormat.ndjson:
+            if line.strip():
+                yield line_no, line
+            continue
+
+        if not lines:
+            start = line_no
+        lines.append(line)
+        quotes += line.count('"')
+        if quotes % 2:
+            continue
+
+        text = '\n'.join(lines)
+        lines = []
+        quotes = 0
+        if text.strip():
+            yield start, text
+
+    if lines:
+        yield start, '\n'.join(lines)
+
+
+def parse_record(
+    text: str, export_format: ExportFormat, header: list[str] | None
+) -> Any:
+    if export_format == ExportFormat.ndjson:
+        return orjson.loads(text)
+
+    values = next(csv.reader([text]))
+    if len(values) != len(header):
+        raise ValueError(
+            f'expected {len(header)} fields, got {len(values)}'
+        )
+    # как и в COPY ... CSV, пустое значение означает NULL
+    return {key: value or None for key, value in zip(header, values)}
+
+
+def format_validation_error(exc: ValidationError) -> str:
+    return '; '.join(
+        f'{".".join(map(str, error["loc"]))}: {error["msg"]}'
+        for error in exc.errors(include_url=False)
+    )
+
+
+class PostsImporter:
+    """
+    Загрузка постов пачками: каждая пачка проверяется схемой PostImport,
+    загружается командой COPY и фиксируется отдельной транзакцией.
+    Ошибки пачки попадают в отчёт и не прерывают загрузку остальных.
+    Импортированные посты не попадают в поисковый индекс в памяти
+    до его перестроения
+    """
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        *,
+        export_format: ExportFormat,
+        batch_size: int,
+    ) -> None:
+        self._db = db
+        self._format = export_format
+        self._batch_size = batch_size
+        self._header: list[str] | None = None
+        self._now = datetime.now(UTC).replace(tzinfo=None)
+        self.rows = 0
+        self.inserted = 0
+        self.errors: list[dict[str, Any]] = []
+        self._batch = 0
+        self._batch_errors = 0
+
+    def _error(self, line: int | None, detail: str) -> None:
+        self._batch_errors += 1
+        if self._batch_errors <= MAX_ERRORS_PER_BATCH:
+            self.errors.append(
+                {'batch': self._batch, 'line': line, 'detail': detail}
+            )
+
+    def _validate(self, records: list[Record]) -> list[tuple[int, PostImport]]:
+        posts = []
+        for line, text in records:
+            try:
+                data = parse_record(text, self._format, self._header)
+                posts.append((line, PostImport.model_validate(data)))
+            except ValidationError as exc:
+                self._error(line, format_validation_error(exc))
+            except (ValueError, TypeError, csv.Error) as exc:
+                self._error(line, f'Invalid record: {exc}')
+        return posts
+
+    async def _load(self, records: list[Record]) -> None:
+        self._batch += 1
+        self._batch_errors = 0
+        self.rows += len(records)
+        posts = self._validate(records)
+        if not posts:
+            return
+
+        try:
+            user_ids = await user_crud.get_existing_ids(
+                self._db, list({post.user_id for _, post in posts})
+            )
+            rows = []
+            for line, post in posts:
+                if post.user_id not in user_ids:
+                    self._error(line, f'User(id={post.user_id}) not found')
+                    continue
+                created_at = post.created_at or self._now
+                rows.append(
+                    (
+                        post.user_id,
+                        post.title,
+                        post.content,
+                        created_at,
+                        post.updated_at or created_at,
+                    )
+                )
+            if rows:
+                await post_crud.copy_records(
+                    self._db, columns=IMPORT_COLUMNS, records=rows
+                )
+            await self._db.commit()
+        except Exception as exc:
+            await self._db.rollback()
+            logger.warning(
+                'Posts import batch #%s failed: %s', self._batch, exc
+            )
+            self._error(None, f'Batch failed: {exc}')
+            return
+
+        self.inserted += len(rows)
+        if rows:
+            # COPY идёт в обход слушателей репозитория
+            response_cache.clear()
+
+    async def run(self, chunks: AsyncIterator[bytes]) -> PostsImportReport:
+        started_at = time.perf_counter()
+        records: list[Record] = []
+        async for record in iter_records(chunks, self._format):
+            if self._format == ExportFormat.csv and self._header is None:
+                self._header = next(csv.reader([record[1]]))
+                continue
+            records.append(record)
+            if len(records) >= self._batch_size:
+                await self._load(records)
+                records = []
+        if records:
+            await self._load(records)
+
+        elapsed = time.perf_counter() - started_at
+        return PostsImportReport(
+            rows=self.rows,
+            inserted=self.inserted,
+            failed=self.rows - self.inserted,
+            elapsed_s=round(elapsed, 6),
+            rows_per_second=round(self.inserted / elapsed, 1),
+            errors=self.errors,
+        )
+
+
+async def import_posts(
+    db: AsyncSession,
+    chunks: AsyncIterator[bytes],
+    *,
+    export_format: ExportFormat,
+    batch_size: int,
+) -> PostsImportReport:
+    """
+    Импорт постов из потока NDJSON или CSV
+    """
+
+    importer = PostsImporter(
+        db, export_format=export_format, batch_size=batch_size
+    )
+    report = await importer.run(chunks)
+    logger.info(
+        'Imported %s of %s posts in %ss [%s rows/s]',
+        report.inserted,
+        report.rows,
+        report.elapsed_s,
+        report.rows_per_second,
+    )
+
+    return report
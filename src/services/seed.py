@@ -0,0 +1,325 @@
+import asyncio
+import math
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from itertools import accumulate
+from typing import Any, Iterator
+
+import asyncpg
+
+from src.core.config import logger, settings
+from src.core.password import get_crypt_context
+from src.models.post_monthly_count import POST_MONTHLY_COUNTS_REBUILD
+
+ALPHABET = 'абвгдежзиклмнопрстуфхцчшэюя'
+VOCABULARY_SIZE = 20000
+TITLES_SIZE = 10000
+CORPUS_SIZE = 4 * 1024 * 1024
+MIN_CONTENT_LENGTH = 20
+USER_COLUMNS = ('login', 'password')
+POST_COLUMNS = ('user_id', 'title', 'content', 'created_at', 'updated_at')
+SEED_TABLES = ('post_monthly_counts', 'post', '"user"')
+SEED_PASSWORD = 'password'
+# вторичные индексы постов: всё, кроме первичного ключа и уникальных
+SECONDARY_INDEXES = """
+SELECT indexrelid::regclass::text, pg_get_indexdef(indexrelid)
+FROM pg_index
+WHERE indrelid = 'post'::regclass AND NOT indisprimary AND NOT indisunique
+"""
+INDEX_BUILD_SETTINGS = "SET maintenance_work_mem = '512MB'"
+
+
+def make_vocabulary(rnd: random.Random) -> list[str]:
+    """
+    Словарь из VOCABULARY_SIZE случайных слов, одинаковый при одинаковом
+    состоянии rnd
+    """
+
+    words = set()
+    while len(words) < VOCABULARY_SIZE:
+        length = rnd.randint(3, 10)
+        words.add(''.join(rnd.choices(ALPHABET, k=length)))
+    return sorted(words)
+
+
+@dataclass(slots=True, frozen=True)
+class SeedConfig:
+    """
+    Параметры генерации: число авторов и постов, перекос числа постов
+    по авторам (показатель распределения Ципфа, 0 - равномерно),
+    логнормальное распределение длины содержания и период создания.
+    У всех пользователей пароль password
+    """
+
+    users: int
+    posts: int
+    date_from: datetime
+    date_to: datetime
+    skew: float = 1.1
+    content_median: int = 600
+    content_sigma: float = 0.8
+    content_max: int = 20000
+    seed: int = 42
+    batch_size: int = 50000
+    login_prefix: str = 'seed_user_'
+    password: str = SEED_PASSWORD
+
+
+class DataGenerator:
+    """
+    Детерминированный генератор пользователей и постов: при одинаковых
+    параметрах и seed выдаёт одинаковые строки. Тексты нарезаются
+    из заранее сгенерированного корпуса, чтобы генерация строки
+    не была узким местом загрузки
+    """
+
+    def __init__(self, config: SeedConfig) -> None:
+        self.config = config
+        self._rnd = random.Random(config.seed)
+        self.vocabulary = make_vocabulary(self._rnd)
+        self._titles = [
+            ' '.join(self._rnd.choices(self.vocabulary, k=5)).capitalize()
+            for _ in range(TITLES_SIZE)
+        ]
+        words = []
+        length = 0
+        while length < CORPUS_SIZE:
+            word = self._rnd.choice(self.vocabulary)
+            words.append(word)
+            length += len(word) + 1
+        self._corpus = ' '.join(words)
+
+    def users(self, password_hash: str) -> Iterator[list[tuple[str, str]]]:
+        """
+        Пачки пользователей (login, хеш пароля). Хеш вычисляется один
+        раз для всех пользователей: bcrypt намеренно медленный
+        """
+
+        config = self.config
+        for start in range(0, config.users, config.batch_size):
+            stop = min(start + config.batch_size, config.users)
+            yield [
+                (f'{config.login_prefix}{number}', password_hash)
+                for number in range(start, stop)
+            ]
+
+    def posts(self, user_ids: list[int]) -> Iterator[list[tuple]]:
+        """
+        Пачки постов. Автор с рангом r получает долю постов,
+        пропорциональную 1 / r ** skew
+        """
+
+        config = self.config
+        rnd = self._rnd
+        cum_weights = list(
+            accumulate(
+                1 / rank ** config.skew
+                for rank in range(1, len(user_ids) + 1)
+            )
+        )
+        mu = math.log(config.content_median)
+        corpus = self._corpus
+        corpus_size = len(corpus) - config.content_max
+        span = int((config.date_to - config.date_from).total_seconds())
+        date_from = config.date_from
+        lognormvariate = rnd.lognormvariate
+        random_ = rnd.random
+
+        for start in range(0, config.posts, config.batch_size):
+            size = min(config.batch_size, config.posts - start)
+            authors = rnd.choices(user_ids, cum_weights=cum_weights, k=size)
+            titles = rnd.choices(self._titles, k=size)
+            records = []
+            for user_id, title in zip(authors, titles):
+                length = min(
+                    max(
+                        int(lognormvariate(mu, config.content_sigma)),
+                        MIN_CONTENT_LENGTH,
+                    ),
+                    config.content_max,
+                )
+                offset = int(random_() * corpus_size)
+                created_at = date_from + timedelta(
+                    seconds=int(random_() * span)
+                )
+                records.append(
+                    (
+                        user_id,
+                        title,
+                        corpus[offset:offset + length],
+                        created_at,
+                        created_at,
+                    )
+                )
+            yield records
+
+
+async def copy_posts(
+    dsn: str, queue: asyncio.Queue, copy_times: list[float]
+) -> None:
+    conn = await asyncpg.connect(dsn)
+    try:
+        while (records := await queue.get()) is not None:
+            started_at = time.perf_counter()
+            await conn.copy_records_to_table(
+                'post', records=records, columns=POST_COLUMNS
+            )
+            copy_times.append(time.perf_counter() - started_at)
+    finally:
+        await conn.close()
+
+
+async def load_posts(
+    dsn: str,
+    batches: Iterator[list[tuple]],
+    jobs: int,
+    copy_times: list[float],
+) -> float:
+    """
+    Генерация пачек постов с загрузкой предыдущих в jobs соединений.
+    Ошибка любого загрузчика отменяет генерацию и остальных загрузчиков
+    и пробрасывается. Возвращает время генерации
+    """
+
+    generate_time = 0.0
+    queue: asyncio.Queue = asyncio.Queue(maxsize=jobs)
+    try:
+        async with asyncio.TaskGroup() as workers:
+            for _ in range(jobs):
+                workers.create_task(copy_posts(dsn, queue, copy_times))
+            while True:
+                started_at = time.perf_counter()
+                records = next(batches, None)
+                generate_time += time.perf_counter() - started_at
+                if records is None:
+                    break
+                await queue.put(records)
+            for _ in range(jobs):
+                await queue.put(None)
+    except ExceptionGroup as exc:
+        raise exc.exceptions[0]
+
+    return generate_time
+
+
+async def seed(
+    dsn: str,
+    config: SeedConfig,
+    *,
+    jobs: int = 1,
+    truncate: bool = False,
+    disable_triggers: bool = False,
+    drop_indexes: bool = False,
+) -> dict[str, Any]:
+    """
+    Загрузка сгенерированных пользователей и постов командой COPY.
+    Пачки постов генерируются, пока jobs соединений загружают
+    предыдущие: основное время загрузки уходит на вычисляемые колонки
+    и индексы на стороне БД, которые так распределяются по ядрам.
+    Каждая пачка фиксируется отдельно.
+    truncate очищает таблицы и сбрасывает последовательности, чтобы
+    при jobs=1 идентификаторы совпадали между запусками.
+    disable_triggers отключает триггеры счётчиков постов на время
+    загрузки и затем пересчитывает счётчики целиком. Параллельная
+    загрузка возможна только без триггеров: их обновления счётчиков
+    из разных пачек взаимно блокируются.
+    drop_indexes удаляет вторичные индексы постов на время загрузки
+    и строит их заново после неё (включает disable_triggers): COPY
+    не обновляет GIN-индекс поиска и остальные индексы на каждой
+    строке. Только для загрузки в БД, которую не использует сервис
+    """
+
+    disable_triggers = disable_triggers or drop_indexes
+    if jobs > 1 and not disable_triggers:
+        raise ValueError('Parallel seeding requires disabled triggers')
+
+    started_at = time.perf_counter()
+    generator = DataGenerator(config)
+    copy_times: list[float] = []
+    indexes: list[asyncpg.Record] = []
+    index_time = 0.0
+
+    conn = await asyncpg.connect(dsn)
+    try:
+        if truncate:
+            await conn.execute(
+                f'TRUNCATE {", ".join(SEED_TABLES)} RESTART IDENTITY CASCADE'
+            )
+        if disable_triggers:
+            await conn.execute('ALTER TABLE post DISABLE TRIGGER USER')
+        if drop_indexes:
+            async with conn.transaction():
+                indexes = await conn.fetch(SECONDARY_INDEXES)
+                for name, _ in indexes:
+                    await conn.execute(f'DROP INDEX {name}')
+
+        try:
+            password_hash = get_crypt_context(settings.bcrypt_rounds).hash(
+                config.password
+            )
+            for records in generator.users(password_hash):
+                await conn.copy_records_to_table(
+                    'user', records=records, columns=USER_COLUMNS
+                )
+            rows = await conn.fetch(
+                'SELECT login, id FROM "user" WHERE login LIKE $1',
+                f'{config.login_prefix}%',
+            )
+            ids = dict(rows)
+            user_ids = [
+                ids[f'{config.login_prefix}{number}']
+                for number in range(config.users)
+            ]
+
+            load_started_at = time.perf_counter()
+            generate_time = await load_posts(
+                dsn, generator.posts(user_ids), jobs, copy_times
+            )
+            load_time = time.perf_counter() - load_started_at
+        finally:
+            if indexes:
+                index_started_at = time.perf_counter()
+                await conn.execute(INDEX_BUILD_SETTINGS)
+                for _, definition in indexes:
+                    await conn.execute(definition)
+                index_time = time.perf_counter() - index_started_at
+            if disable_triggers:
+                async with conn.transaction():
+                    await conn.execute('ALTER TABLE post ENABLE TRIGGER USER')
+                    for statement in POST_MONTHLY_COUNTS_REBUILD:
+                        await conn.execute(statement)
+
+        await conn.execute('ANALYZE "user", post, post_monthly_counts')
+    finally:
+        await conn.close()
+
+    elapsed = time.perf_counter() - started_at
+    rows = config.users + config.posts
+    logger.info(
+        'Seeded %s users and %s posts in %.1fs [%.0f rows/s]',
+        config.users,
+        config.posts,
+        elapsed,
+        rows / elapsed,
+    )
+
+    return {
+        'users': config.users,
+        'posts': config.posts,
+        'jobs': jobs,
+        'drop_indexes': drop_indexes,
+        'elapsed_s': round(elapsed, 3),
+        'generate_s': round(generate_time, 3),
+        'generate_rows_per_second': round(
+            config.posts / max(generate_time, 1e-9), 1
+        ),
+        'copy_s': round(sum(copy_times), 3),
+        'load_s': round(load_time, 3),
+        'load_posts_per_second': round(
+            config.posts / max(load_time, 1e-9), 1
+        ),
+        'index_rebuild_s': round(index_time, 3),
+        'rows_per_second': round(rows / elapsed, 1),
+    }
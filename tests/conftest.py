@@ -4,18 +4,27 @@ import asyncpg
 import pytest
 from fastapi import Depends
 from httpx import ASGITransport, AsyncClient
-from sqlalchemy import NullPool, insert
+from sqlalchemy import NullPool, event, insert
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
 
-from src.core.auth import get_current_user, hash_password
+from src.core.auth import (
+    get_current_user,
+    hash_password,
+    principal_cache,
+    token_cache,
+)
 from src.core.config import settings
+from src.core.profiler import instrument_engine
+from src.core.response_cache import response_cache
 from src.db.postgres import get_session
+from src.db.replicas import get_read_session, get_read_session_factory
 from src.main import app
 from src.models import Base, Post, User
+from src.repositories.post import post_crud
 
 URL_PREFIX_AUTH = '/api/v1/users'
 URL_PREFIX_POST = '/api/v1/posts'
@@ -54,8 +63,13 @@ async def db_engine(create_test_database):
     engine = create_async_engine(
         settings.dsn_test, echo=False, future=True, poolclass=NullPool
     )
+    instrument_engine(engine)
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+    post_crud.cache.clear()
+    principal_cache.clear()
+    token_cache.clear()
+    response_cache.clear()
 
     yield engine
 
@@ -65,6 +79,22 @@ async def db_engine(create_test_database):
     await engine.dispose()
 
 
+@pytest.fixture
+def statements(db_engine):
+    executed = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        executed.append(statement)
+
+    event.listen(
+        db_engine.sync_engine, 'before_cursor_execute', before_cursor_execute
+    )
+    yield executed
+    event.remove(
+        db_engine.sync_engine, 'before_cursor_execute', before_cursor_execute
+    )
+
+
 @pytest.fixture(scope='module')
 async def db_session_factory(db_engine):
     return async_sessionmaker(
@@ -85,6 +115,17 @@ async def async_client(db_session_factory):
             yield session
 
     app.dependency_overrides[get_session] = override_get_session
+    app.dependency_overrides[get_read_session] = override_get_session
+
+    async def override_get_session_factory():
+        async def session():
+            return db_session_factory()
+
+        return session
+
+    app.dependency_overrides[get_read_session_factory] = (
+        override_get_session_factory
+    )
 
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url='http://test') as ac:
@@ -138,6 +179,7 @@ async def create_test_posts(db_session, posts_data, create_test_user):
     stmt = insert(Post).values(posts_data)
     await db_session.execute(stmt)
     await db_session.commit()
+    response_cache.clear()
 
 
 @app.get('/protected-route')
@@ -0,0 +1,179 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI, status
+from httpx import ASGITransport, AsyncClient
+
+from src.core.admission import (
+    AdmissionController,
+    AdmissionMiddleware,
+    AdmissionRejected,
+    ConcurrencyLimiter,
+    TokenBucketLimiter,
+    route_group,
+)
+from src.core.metrics import Metrics
+from tests.conftest import URL_PREFIX_POST
+
+URL_ADMISSION = '/api/v1/service/admission'
+
+
+@pytest.mark.parametrize(
+    'method, path, group',
+    [
+        ('GET', '/api/v1/posts/', 'reads'),
+        ('GET', '/api/v1/posts/statistics/1', 'reads'),
+        ('POST', '/api/v1/posts/statistics', 'reads'),
+        ('POST', '/api/v1/posts/', 'writes'),
+        ('DELETE', '/api/v1/posts/1', 'writes'),
+        ('GET', '/api/v1/posts/search/word', 'search'),
+        ('POST', '/api/v1/users/auth', 'auth'),
+        ('GET', '/metrics', None),
+    ],
+)
+def test_route_group(method, path, group):
+    assert route_group(method, path) == group
+
+
+@pytest.mark.anyio
+async def test_concurrency_limiter_queue():
+    limiter = ConcurrencyLimiter(limit=1, queue_size=1, timeout=1)
+    await limiter.acquire()
+
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    assert limiter.queue_depth == 1
+    with pytest.raises(AdmissionRejected) as exc:
+        await limiter.acquire()
+    assert exc.value.reason == 'queue_full'
+
+    limiter.release()
+    await waiter
+    assert limiter.active == 1
+    assert limiter.queue_depth == 0
+
+    limiter.release()
+    stats = limiter.stats()
+    assert stats['active'] == 0
+    assert stats['admitted'] == 2
+    assert stats['max_queue_depth'] == 1
+    assert stats['shed'] == {'queue_full': 1, 'timeout': 0, 'rate_limit': 0}
+
+
+@pytest.mark.anyio
+async def test_concurrency_limiter_timeout():
+    limiter = ConcurrencyLimiter(limit=1, queue_size=10, timeout=0.01)
+    await limiter.acquire()
+    with pytest.raises(AdmissionRejected) as exc:
+        await limiter.acquire()
+    assert exc.value.reason == 'timeout'
+    assert limiter.queue_depth == 0
+
+    limiter.release()
+    assert limiter.active == 0
+    assert limiter.stats()['shed']['timeout'] == 1
+
+
+@pytest.mark.anyio
+async def test_concurrency_limiter_cancel():
+    limiter = ConcurrencyLimiter(limit=1, queue_size=10, timeout=1)
+    await limiter.acquire()
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert limiter.queue_depth == 0
+
+    limiter.release()
+    assert limiter.active == 0
+
+
+def test_token_bucket():
+    bucket = TokenBucketLimiter(rate=1, burst=2)
+    bucket.acquire(1)
+    bucket.acquire(1)
+    with pytest.raises(AdmissionRejected) as exc:
+        bucket.acquire(1)
+    assert exc.value.reason == 'rate_limit'
+    assert 0 < exc.value.retry_after <= 1
+    bucket.acquire(2)
+
+
+@pytest.fixture
+def admission_app():
+    app = FastAPI()
+    release = asyncio.Event()
+
+    @app.get('/api/v1/posts/')
+    async def get_posts() -> dict:
+        await release.wait()
+        return {}
+
+    @app.get('/api/v1/posts/search/{query}')
+    async def search_posts(query: str) -> dict:
+        return {}
+
+    controller = AdmissionController(
+        {
+            'reads': ConcurrencyLimiter(limit=1, queue_size=0, timeout=1),
+            'search': ConcurrencyLimiter(limit=1, queue_size=0, timeout=1),
+        },
+        TokenBucketLimiter(rate=0.1, burst=1),
+    )
+    app.add_middleware(AdmissionMiddleware, controller=controller)
+    return app, controller, release
+
+
+@pytest.mark.anyio
+async def test_admission_middleware_shed(admission_app):
+    app, controller, release = admission_app
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url='http://test'
+    ) as client:
+        first = asyncio.create_task(client.get('/api/v1/posts/'))
+        while controller.limiters['reads'].active == 0:
+            await asyncio.sleep(0)
+
+        response = await client.get('/api/v1/posts/')
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert response.headers['retry-after'] == '1'
+
+        release.set()
+        assert (await first).status_code == status.HTTP_200_OK
+        assert controller.limiters['reads'].active == 0
+
+
+@pytest.mark.anyio
+async def test_admission_middleware_rate_limit(admission_app):
+    app, controller, _ = admission_app
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url='http://test'
+    ) as client:
+        response = await client.get('/api/v1/posts/search/word')
+        assert response.status_code == status.HTTP_200_OK
+
+        response = await client.get('/api/v1/posts/search/word')
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert int(response.headers['retry-after']) >= 1
+
+    stats = controller.stats()['groups']['search']
+    assert stats['shed']['rate_limit'] == 1
+    text = Metrics().render({}, controller.stats())
+    assert (
+        'admission_shed_total{group="search",reason="rate_limit"} 1' in text
+    )
+    assert 'admission_queue_depth{group="reads"} 0' in text
+
+
+@pytest.mark.anyio
+async def test_admission_stats(async_client, create_test_posts):
+    await async_client.get(f'{URL_PREFIX_POST}/')
+    response = await async_client.get(URL_ADMISSION)
+    assert response.status_code == status.HTTP_200_OK
+    stats = response.json()['groups']['reads']
+    assert stats['admitted'] >= 1
+    assert stats['active'] >= 1
+
+    response = await async_client.get('/metrics')
+    assert 'admission_admitted_total{group="reads"}' in response.text
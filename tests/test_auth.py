@@ -2,18 +2,30 @@ import asyncio
 
 import pytest
 from fastapi import status
+from sqlalchemy import insert
 
+from src.core.auth import (
+    decode_access_token,
+    password_hasher,
+    principal_cache,
+)
 from src.core.config import settings
+from src.core.password import get_crypt_context
+from src.models import User
+from src.repositories.user import user_crud
 
 from .conftest import (
     SUCCESSFUL_ACCESS,
     TEST_USER,
     URL_PREFIX_AUTH,
     URL_PREFIX_POST,
+    USER_ID,
 )
 
 PROTECTED_ROUTE = f'{URL_PREFIX_POST}/'
 ACCESS_TOKEN_EXPIRE_SECONDS = 1
+CACHED_USER = {'login': 'cached_user', 'password': 'password'}
+REHASH_USER = {'login': 'rehash_user', 'password': 'password'}
 
 
 @pytest.mark.anyio
@@ -74,8 +86,10 @@ async def test_access_with_invalid_token(async_client):
 
 
 @pytest.mark.anyio
-async def test_token_expiry(async_client, create_test_user):
-    settings.access_token_expire_seconds = ACCESS_TOKEN_EXPIRE_SECONDS
+async def test_token_expiry(async_client, create_test_user, monkeypatch):
+    monkeypatch.setattr(
+        settings, 'access_token_expire_seconds', ACCESS_TOKEN_EXPIRE_SECONDS
+    )
     response = await async_client.post(
         f'{URL_PREFIX_AUTH}/auth', json=TEST_USER
     )
@@ -87,3 +101,71 @@ async def test_token_expiry(async_client, create_test_user):
     response = await async_client.get('/protected-route', headers=headers)
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
     assert response.json() == {'detail': 'Token expired'}
+
+
+@pytest.mark.anyio
+async def test_token_carries_user_id(async_client, create_test_user):
+    response = await async_client.post(
+        f'{URL_PREFIX_AUTH}/auth', json=TEST_USER
+    )
+    payload = decode_access_token(response.json()['access_token'])
+    assert payload['sub'] == TEST_USER['login']
+    assert payload['uid'] == USER_ID
+
+
+@pytest.mark.anyio
+async def test_current_user_is_cached(async_client, headers):
+    await async_client.get('/protected-route', headers=headers)
+    hits = principal_cache.hits
+    response = await async_client.get('/protected-route', headers=headers)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert principal_cache.hits == hits + 1
+
+
+@pytest.mark.anyio
+async def test_deleted_user_cache_invalidated(async_client, db_session):
+    await async_client.post(f'{URL_PREFIX_AUTH}/register', json=CACHED_USER)
+    response = await async_client.post(
+        f'{URL_PREFIX_AUTH}/auth', json=CACHED_USER
+    )
+    token = response.json()['access_token']
+    headers = {'Authorization': f'Bearer {token}'}
+    response = await async_client.get('/protected-route', headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+
+    user = await user_crud.get_user_by_login(
+        db=db_session, login=CACHED_USER['login']
+    )
+    await user_crud.delete(db=db_session, obj_id=user.id)
+
+    response = await async_client.get('/protected-route', headers=headers)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert response.json() == {'detail': 'Invalid token'}
+
+
+@pytest.mark.anyio
+async def test_auth_rehashes_password_on_cost_change(
+    async_client, db_session
+):
+    old_rounds = password_hasher.rounds
+    await db_session.execute(
+        insert(User).values(
+            login=REHASH_USER['login'],
+            password=get_crypt_context(old_rounds - 1).hash(
+                REHASH_USER['password']
+            ),
+        )
+    )
+    await db_session.commit()
+
+    response = await async_client.post(
+        f'{URL_PREFIX_AUTH}/auth', json=REHASH_USER
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    user = await user_crud.get_user_by_login(
+        db=db_session, login=REHASH_USER['login']
+    )
+    await db_session.refresh(user)
+    assert user.password.startswith(f'$2b${old_rounds:02d}$')
@@ -0,0 +1,151 @@
+import pytest
+from fastapi import status
+
+from src.core.cache import LRUCache, MemoryCacheBackend, TwoTierCache
+from src.repositories.post import post_crud
+from tests.conftest import URL_PREFIX_POST
+
+POST_ID = 1
+REPLICA_POST_ID = 2
+
+
+def make_cache(l2=None) -> TwoTierCache:
+    return TwoTierCache(
+        LRUCache(maxsize=2, ttl=60),
+        namespace='test',
+        dumps=str.encode,
+        loads=bytes.decode,
+        l2=l2,
+    )
+
+
+def test_lru_cache_eviction():
+    cache = LRUCache(maxsize=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+    cache.set('c', 3)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.stats()['evictions'] == 1
+
+
+def test_lru_cache_ttl():
+    cache = LRUCache(maxsize=2, ttl=60)
+    cache.set('a', 1, ttl=0)
+
+    assert cache.get('a') is None
+    assert cache.stats()['expirations'] == 1
+
+
+@pytest.mark.anyio
+async def test_two_tier_cache_reads_through_l2():
+    l2 = MemoryCacheBackend()
+    cache = make_cache(l2=l2)
+    await cache.set(1, 'value')
+    cache.l1.clear()
+
+    assert await cache.get(1) == 'value'
+    assert cache.l2_hits == 1
+    assert await cache.get(1) == 'value'
+    assert cache.l1.hits == 1
+
+
+@pytest.mark.anyio
+async def test_two_tier_cache_delete_invalidates_both_tiers():
+    l2 = MemoryCacheBackend()
+    cache = make_cache(l2=l2)
+    await cache.set(1, 'value')
+    await cache.delete(1)
+
+    assert await cache.get(1) is None
+    assert await l2.get('test:1') is None
+
+
+@pytest.mark.anyio
+async def test_two_tier_cache_skips_fill_after_invalidation():
+    cache = make_cache()
+
+    async def loader():
+        await cache.delete(1)
+        return 'stale'
+
+    assert await cache.get_or_load(1, loader) == 'stale'
+    assert await cache.get(1) is None
+
+
+@pytest.fixture
+def shared_cache():
+    post_crud.cache.l2 = MemoryCacheBackend()
+    yield post_crud.cache
+    post_crud.cache.l2 = None
+    post_crud.cache.clear()
+
+
+@pytest.mark.anyio
+async def test_get_post_uses_cache(
+    async_client, create_test_posts, shared_cache
+):
+    await async_client.get(f'{URL_PREFIX_POST}/{POST_ID}')
+    hits = shared_cache.l1.hits
+    response = await async_client.get(f'{URL_PREFIX_POST}/{POST_ID}')
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()['id'] == POST_ID
+    assert shared_cache.l1.hits == hits + 1
+
+
+@pytest.mark.anyio
+async def test_get_post_cache_invalidated_on_write(
+    async_client, create_test_posts, headers, shared_cache
+):
+    await async_client.get(f'{URL_PREFIX_POST}/{POST_ID}')
+    await async_client.patch(
+        f'{URL_PREFIX_POST}/{POST_ID}',
+        json={'title': 'Изменённый заголовок'},
+        headers=headers,
+    )
+    assert await shared_cache.l2.get(f'post:{POST_ID}') is None
+
+    response = await async_client.get(f'{URL_PREFIX_POST}/{POST_ID}')
+    assert response.json()['title'] == 'Изменённый заголовок'
+
+    await async_client.delete(f'{URL_PREFIX_POST}/{POST_ID}', headers=headers)
+    response = await async_client.get(f'{URL_PREFIX_POST}/{POST_ID}')
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.anyio
+async def test_get_cached_replica_read_not_stored(
+    db_session, create_test_posts, shared_cache
+):
+    shared_cache.clear()
+    post = await post_crud.get_cached(
+        db=db_session, obj_id=REPLICA_POST_ID, fill_cache=False
+    )
+    assert post.id == REPLICA_POST_ID
+    assert await shared_cache.get(REPLICA_POST_ID) is None
+
+    # устаревшая запись кэша не читается в обход кэша
+    await shared_cache.set(
+        REPLICA_POST_ID, post.model_copy(update={'title': '-'})
+    )
+    post = await post_crud.get_cached(
+        db=db_session, obj_id=REPLICA_POST_ID, use_cache=False
+    )
+    assert post.title != '-'
+    assert await post_crud.get_updated_at(
+        db=db_session, obj_id=REPLICA_POST_ID, use_cache=False
+    ) == post.updated_at
+
+
+@pytest.mark.anyio
+async def test_cache_stats(async_client):
+    response = await async_client.get('/api/v1/service/cache')
+    assert response.status_code == status.HTTP_200_OK
+    assert set(response.json()['post']['l1']) >= {
+        'hits',
+        'misses',
+        'evictions',
+    }
@@ -0,0 +1,52 @@
+import pytest
+from fastapi import status
+from sqlalchemy import exc, text
+
+from src.core.config import settings
+from src.db.postgres import create_engine, get_pool_stats
+
+
+@pytest.fixture
+async def small_pool_engine(create_test_database, monkeypatch):
+    monkeypatch.setattr(settings, 'db_pool_size', 1)
+    monkeypatch.setattr(settings, 'db_max_overflow', 0)
+    monkeypatch.setattr(settings, 'db_pool_timeout', 0.1)
+    engine = create_engine(settings.dsn_test)
+
+    yield engine
+
+    await engine.dispose()
+
+
+@pytest.mark.anyio
+async def test_pool_stats_checked_out(small_pool_engine):
+    async with small_pool_engine.connect() as conn:
+        await conn.execute(text('SELECT 1'))
+        stats = get_pool_stats(small_pool_engine)
+        assert stats['checked_out'] == 1
+        assert stats['overflow'] == 0
+
+    stats = get_pool_stats(small_pool_engine)
+    assert stats['checked_out'] == 0
+    assert stats['waits'] == 1
+
+
+@pytest.mark.anyio
+async def test_pool_stats_timeout(small_pool_engine):
+    async with small_pool_engine.connect():
+        with pytest.raises(exc.TimeoutError):
+            async with small_pool_engine.connect():
+                pass
+
+    stats = get_pool_stats(small_pool_engine)
+    assert stats['timeouts'] == 1
+    assert stats['wait_time_max_s'] >= settings.db_pool_timeout
+
+
+@pytest.mark.anyio
+async def test_pool_stats_endpoint(async_client):
+    response = await async_client.get('/api/v1/service/pool')
+    assert response.status_code == status.HTTP_200_OK
+    assert {'checked_out', 'overflow', 'wait_time_total_s'} <= set(
+        response.json()
+    )
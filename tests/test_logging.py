@@ -0,0 +1,95 @@
+import logging
+from io import StringIO
+
+import orjson
+import pytest
+from fastapi import status
+
+from src.core.config import settings
+from src.core.logger import (
+    SAMPLED,
+    JsonFormatter,
+    LogContextFilter,
+    configure_logging,
+    request_id,
+    stop_logging,
+)
+from tests.conftest import URL_PREFIX_POST
+
+LOGGER = 'blog_api.test'
+
+
+def make_record(level: int = logging.INFO, **extra) -> logging.LogRecord:
+    record = logging.LogRecord(
+        LOGGER, level, __file__, 1, 'Post [id:%s]', (1,), None
+    )
+    record.__dict__.update(extra)
+    return record
+
+
+@pytest.fixture
+def log_stream():
+    stream = StringIO()
+    yield stream
+    configure_logging(
+        level=settings.log_level,
+        json=settings.log_json,
+        queue=settings.log_queue_enabled,
+        sample_rate=settings.log_sample_rate,
+    )
+
+
+def test_json_formatter():
+    record = make_record(request_id='abc', post_id=1)
+    data = orjson.loads(JsonFormatter().format(record))
+    assert data['message'] == 'Post [id:1]'
+    assert data['level'] == 'INFO'
+    assert data['logger'] == LOGGER
+    assert data['request_id'] == 'abc'
+    assert data['post_id'] == 1
+
+
+def test_context_filter_sampling():
+    drop_all = LogContextFilter(sample_rate=0)
+    assert not drop_all.filter(make_record(**SAMPLED))
+    assert drop_all.filter(make_record())
+    assert drop_all.filter(make_record(logging.WARNING, **SAMPLED))
+
+    token = request_id.set('abc')
+    try:
+        record = make_record()
+        assert LogContextFilter().filter(record)
+        assert record.request_id == 'abc'
+    finally:
+        request_id.reset(token)
+
+
+@pytest.mark.parametrize('queue', [False, True])
+def test_configure_logging(log_stream, queue):
+    configure_logging(json=True, queue=queue, stream=log_stream)
+    logger = logging.getLogger(LOGGER)
+    token = request_id.set('abc')
+    try:
+        logger.info('Post [id:%s]', 1)
+        logger.debug('Post [id:%s]', 2)
+    finally:
+        request_id.reset(token)
+    stop_logging()
+
+    lines = log_stream.getvalue().splitlines()
+    assert len(lines) == 1
+    data = orjson.loads(lines[0])
+    assert data['message'] == 'Post [id:1]'
+    assert data['request_id'] == 'abc'
+
+
+@pytest.mark.anyio
+async def test_request_id_header(async_client, create_test_posts):
+    response = await async_client.get(f'{URL_PREFIX_POST}/1')
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.headers['x-request-id']) == 32
+
+    response = await async_client.get(
+        f'{URL_PREFIX_POST}/1', headers={'X-Request-ID': 'request-1'}
+    )
+    assert response.headers['x-request-id'] == 'request-1'
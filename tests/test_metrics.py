@@ -0,0 +1,63 @@
+import re
+
+import pytest
+from fastapi import status
+
+from src.core.metrics import Histogram
+from src.repositories.post import post_crud
+from tests.conftest import URL_PREFIX_POST
+
+URL_METRICS = '/metrics'
+POST_ROUTE = 'method="GET",route="/api/v1/posts/{post_id}"'
+
+
+def metric_value(text: str, sample: str) -> float:
+    match = re.search(rf'^{re.escape(sample)} (\S+)$', text, re.MULTILINE)
+    assert match, sample
+    return float(match.group(1))
+
+
+def test_histogram_buckets():
+    histogram = Histogram((0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 5.0):
+        histogram.observe(value)
+
+    assert list(histogram.render('latency', 'route="/"')) == [
+        'latency_bucket{route="/",le="0.1"} 2',
+        'latency_bucket{route="/",le="1.0"} 3',
+        'latency_bucket{route="/",le="+Inf"} 4',
+        'latency_sum{route="/"} 5.65',
+        'latency_count{route="/"} 4',
+    ]
+
+
+@pytest.mark.anyio
+async def test_metrics(async_client, create_test_posts):
+    response = await async_client.get(URL_METRICS)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers['content-type'].startswith('text/plain')
+    before = response.text
+    assert metric_value(before, 'db_pool_size{pool="primary"}') >= 0
+    assert metric_value(before, 'http_requests_in_flight') == 1
+
+    post_crud.cache.clear()
+    await async_client.get(f'{URL_PREFIX_POST}/1')
+    await async_client.get(f'{URL_PREFIX_POST}/100500')
+    after = (await async_client.get(URL_METRICS)).text
+
+    assert metric_value(
+        after, f'http_requests_total{{{POST_ROUTE},status="200"}}'
+    ) >= 1
+    assert metric_value(
+        after, f'http_requests_total{{{POST_ROUTE},status="404"}}'
+    ) >= 1
+    assert metric_value(
+        after, f'http_request_duration_seconds_count{{{POST_ROUTE}}}'
+    ) >= 2
+    assert metric_value(
+        after, f'http_request_db_queries_sum{{{POST_ROUTE}}}'
+    ) >= 2
+    assert metric_value(after, 'db_queries_total') > metric_value(
+        before, 'db_queries_total'
+    )
+    assert '/api/v1/posts/100500' not in after
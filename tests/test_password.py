@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+
+from src.core.password import (
+    EXECUTOR_PROCESS,
+    EXECUTOR_THREAD,
+    PasswordHasher,
+)
+
+ROUNDS = 4
+PASSWORD = 'password'
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize('executor', [EXECUTOR_THREAD, EXECUTOR_PROCESS])
+async def test_password_hasher(executor):
+    hasher = PasswordHasher(rounds=ROUNDS, executor=executor, workers=1)
+    try:
+        hashed = await hasher.hash(PASSWORD)
+        assert hashed.startswith(f'$2b$0{ROUNDS}$')
+        assert await hasher.verify_and_update(PASSWORD, hashed) == (
+            True,
+            None,
+        )
+        verified, _ = await hasher.verify_and_update('wrong', hashed)
+        assert verified is False
+    finally:
+        hasher.shutdown()
+
+
+@pytest.mark.anyio
+async def test_password_hasher_concurrency_limit():
+    hasher = PasswordHasher(rounds=ROUNDS, workers=2, max_concurrency=1)
+    try:
+        await asyncio.gather(*(hasher.hash(PASSWORD) for _ in range(4)))
+    finally:
+        hasher.shutdown()
+
+    stats = hasher.stats()
+    assert stats['completed'] == 4
+    assert stats['waiting'] == 0
+    assert stats['running'] == 0
+    assert stats['queue_time_max_s'] > 0
+
+
+@pytest.mark.anyio
+async def test_password_hasher_rehash_on_cost_change():
+    hasher = PasswordHasher(rounds=ROUNDS)
+    try:
+        hashed = await hasher.hash(PASSWORD)
+        hasher.rounds = ROUNDS + 1
+        verified, new_hash = await hasher.verify_and_update(PASSWORD, hashed)
+    finally:
+        hasher.shutdown()
+
+    assert verified is True
+    assert new_hash.startswith(f'$2b$0{ROUNDS + 1}$')
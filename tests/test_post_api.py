@@ -1,11 +1,13 @@
 import pytest
 from fastapi import status
 
+from src.models.post import EXCERPT_LENGTH
 from src.repositories.post import post_crud
 from src.schemas.post import PostCreate
 from tests.conftest import MAX_NUM_POSTS, URL_PREFIX_POST, posts_data, USER_ID
 
 POST_ID = 1
+PAGE_LIMIT = 4
 NEW_POST = {'title': 'Новый заголовок', 'content': 'Новый текст'}
 
 
@@ -25,6 +27,50 @@ async def test_get_posts(async_client, create_test_posts, posts_data):
         assert post['title'] == posts_data[i]['title']
 
 
+@pytest.mark.anyio
+async def test_get_posts_matches_post_schema(async_client, create_test_posts):
+    response = await async_client.get(f'{URL_PREFIX_POST}/?offset=0&limit=1')
+    post = response.json()[0]
+
+    response = await async_client.get(f'{URL_PREFIX_POST}/{post["id"]}')
+    assert response.json() == post
+    assert list(response.json()) == list(post)
+
+
+@pytest.mark.anyio
+async def test_get_posts_cursor_pages(
+    async_client, create_test_posts, posts_data
+):
+    titles = []
+    url = f'{URL_PREFIX_POST}/?limit={PAGE_LIMIT}'
+    while url:
+        response = await async_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        page = response.json()
+        assert len(page) <= PAGE_LIMIT
+        titles.extend(post['title'] for post in page)
+        url = response.links.get('next', {}).get('url')
+
+    assert titles == [post['title'] for post in posts_data]
+
+
+@pytest.mark.anyio
+async def test_get_posts_cursor_prev_page(async_client, create_test_posts):
+    first = await async_client.get(f'{URL_PREFIX_POST}/?limit={PAGE_LIMIT}')
+    assert 'prev' not in first.links
+    second = await async_client.get(first.links['next']['url'])
+    back = await async_client.get(second.links['prev']['url'])
+    assert back.status_code == status.HTTP_200_OK
+    assert back.json() == first.json()
+
+
+@pytest.mark.anyio
+async def test_get_posts_invalid_cursor(async_client):
+    response = await async_client.get(f'{URL_PREFIX_POST}/?after=invalid')
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json() == {'detail': 'Invalid cursor'}
+
+
 @pytest.mark.anyio
 async def test_get_post_by_id(async_client, create_test_posts, posts_data):
     response = await async_client.get(f'{URL_PREFIX_POST}/{POST_ID}')
@@ -93,6 +139,123 @@ async def test_update_post(async_client, headers, db_session):
     assert response.json()['content'] == update_data['content']
 
 
+@pytest.mark.anyio
+async def test_get_posts_fields(async_client, create_test_posts, statements):
+    response = await async_client.get(f'{URL_PREFIX_POST}/')
+    all_titles = [post['title'] for post in response.json()]
+    statements.clear()
+
+    titles = []
+    url = f'{URL_PREFIX_POST}/?limit={PAGE_LIMIT}&fields=title'
+    while url:
+        response = await async_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert all(list(post) == ['title'] for post in response.json())
+        titles.extend(post['title'] for post in response.json())
+        url = response.links.get('next', {}).get('url')
+
+    assert titles == all_titles
+    assert all('post.content' not in statement for statement in statements)
+
+
+@pytest.mark.anyio
+async def test_get_posts_excerpt(async_client, headers, create_test_posts):
+    content = 'Длинный текст поста. ' * 20
+    response = await async_client.post(
+        f'{URL_PREFIX_POST}/',
+        json={'title': 'Пост с анонсом', 'content': content},
+        headers=headers,
+    )
+    post_id = response.json()['id']
+
+    url = f'{URL_PREFIX_POST}/search/анонсом'
+    response = await async_client.get(url, params={'fields': 'id,excerpt'})
+    assert response.json()[0] == {
+        'id': post_id,
+        'excerpt': content[:EXCERPT_LENGTH],
+    }
+
+    await async_client.patch(
+        f'{URL_PREFIX_POST}/{post_id}',
+        json={'content': 'Короткий текст'},
+        headers=headers,
+    )
+    response = await async_client.get(url, params={'fields': 'excerpt'})
+    assert response.json() == [{'excerpt': 'Короткий текст'}]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize('fields', ['', ' , ', 'title,password'])
+async def test_get_posts_invalid_fields(async_client, fields):
+    response = await async_client.get(
+        f'{URL_PREFIX_POST}/', params={'fields': fields}
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.anyio
+async def test_get_posts_fields_blank_names(async_client, create_test_posts):
+    response = await async_client.get(
+        f'{URL_PREFIX_POST}/', params={'fields': 'id, ,title,'}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert all(list(post) == ['id', 'title'] for post in response.json())
+
+
+@pytest.fixture
+async def write_statements(async_client, headers, statements):
+    # пользователь из токена попадает в кэш до начала подсчёта запросов
+    await async_client.get('/protected-route', headers=headers)
+    statements.clear()
+    return statements
+
+
+def statement_types(statements: list[str]) -> list[str]:
+    return [statement.split()[0] for statement in statements]
+
+
+@pytest.mark.anyio
+async def test_write_post_single_statement(
+    async_client, headers, write_statements
+):
+    response = await async_client.post(
+        f'{URL_PREFIX_POST}/', json=NEW_POST, headers=headers
+    )
+    created = response.json()
+    assert statement_types(write_statements) == ['INSERT']
+
+    write_statements.clear()
+    response = await async_client.patch(
+        f'{URL_PREFIX_POST}/{created["id"]}',
+        json={'title': 'Изменённый заголовок'},
+        headers=headers,
+    )
+    assert response.status_code == status.HTTP_200_OK
+    updated = response.json()
+    assert updated['title'] == 'Изменённый заголовок'
+    assert updated['content'] == NEW_POST['content']
+    assert updated['updated_at'] > created['updated_at']
+    assert statement_types(write_statements) == ['UPDATE']
+
+    write_statements.clear()
+    response = await async_client.delete(
+        f'{URL_PREFIX_POST}/{created["id"]}', headers=headers
+    )
+    assert response.json() == updated
+    assert statement_types(write_statements) == ['DELETE']
+
+
+@pytest.mark.anyio
+async def test_write_post_not_found(async_client, headers, write_statements):
+    url = f'{URL_PREFIX_POST}/{POST_ID + 1000}'
+    response = await async_client.patch(url, json=NEW_POST, headers=headers)
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    response = await async_client.delete(url, headers=headers)
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert statement_types(write_statements) == ['UPDATE', 'DELETE']
+
+
 @pytest.mark.anyio
 async def test_search_posts(async_client, create_test_posts, posts_data):
     response = await async_client.get(
@@ -102,3 +265,49 @@ async def test_search_posts(async_client, create_test_posts, posts_data):
     assert (
         response.json()[0]['title'] == posts_data[MAX_NUM_POSTS - 1]['title']
     )
+
+
+@pytest.mark.anyio
+async def test_search_posts_fts_stemming(async_client, create_test_posts):
+    response = await async_client.get(f'{URL_PREFIX_POST}/search/сообщение')
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.json()) == MAX_NUM_POSTS
+
+
+@pytest.mark.anyio
+async def test_search_posts_fts_title_ranked_first(
+    async_client, headers, create_test_posts
+):
+    await async_client.post(
+        f'{URL_PREFIX_POST}/',
+        json={'title': 'Обычный пост', 'content': 'Про ранжирование'},
+        headers=headers,
+    )
+    await async_client.post(
+        f'{URL_PREFIX_POST}/',
+        json={'title': 'Ранжирование', 'content': 'Текст'},
+        headers=headers,
+    )
+    response = await async_client.get(
+        f'{URL_PREFIX_POST}/search/ранжирование'
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert [post['title'] for post in response.json()] == [
+        'Ранжирование',
+        'Обычный пост',
+    ]
+
+
+@pytest.mark.anyio
+async def test_search_posts_ilike_mode(async_client, create_test_posts):
+    response = await async_client.get(
+        f'{URL_PREFIX_POST}/search/сообщение', params={'mode': 'ilike'}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == []
+
+    response = await async_client.get(
+        f'{URL_PREFIX_POST}/search/%231', params={'mode': 'ilike'}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.json()) == 2
@@ -0,0 +1,120 @@
+import pytest
+from fastapi import status
+
+from src.core.config import settings
+from tests.conftest import URL_PREFIX_POST, USER_ID
+
+URL_BULK = f'{URL_PREFIX_POST}/bulk'
+BULK_SIZE = 5
+
+
+def bulk_posts(count: int, prefix: str = 'Пакетный пост') -> list[dict]:
+    return [
+        {'title': f'{prefix} #{i}', 'content': f'Текст #{i}'}
+        for i in range(count)
+    ]
+
+
+@pytest.mark.anyio
+async def test_create_posts_bulk_unauthorized(async_client):
+    response = await async_client.post(URL_BULK, json=bulk_posts(BULK_SIZE))
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.anyio
+async def test_create_posts_bulk(async_client, headers, statements):
+    data = bulk_posts(BULK_SIZE)
+    response = await async_client.post(URL_BULK, json=data, headers=headers)
+    assert response.status_code == status.HTTP_201_CREATED
+    posts = response.json()
+    assert [post['title'] for post in posts] == [
+        post['title'] for post in data
+    ]
+    assert all(post['user_id'] == USER_ID for post in posts)
+    assert sorted(post['id'] for post in posts) == [
+        post['id'] for post in posts
+    ]
+
+    inserts = [stmt for stmt in statements if stmt.startswith('INSERT')]
+    assert len(inserts) == 1
+    assert 'search_vector' not in inserts[0]
+
+    response = await async_client.get(f'{URL_PREFIX_POST}/{posts[0]["id"]}')
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == posts[0]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize('count', [0, settings.post_bulk_max_size + 1])
+async def test_create_posts_bulk_size_limits(async_client, headers, count):
+    response = await async_client.post(
+        URL_BULK, json=bulk_posts(count), headers=headers
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.anyio
+async def test_update_posts_bulk(async_client, headers, statements):
+    response = await async_client.post(
+        URL_BULK, json=bulk_posts(BULK_SIZE, 'Обновляемый'), headers=headers
+    )
+    ids = [post['id'] for post in response.json()]
+    missing_id = max(ids) + 1000
+    statements.clear()
+
+    response = await async_client.patch(
+        URL_BULK,
+        json={'ids': [missing_id, *ids], 'data': {'title': 'Новое название'}},
+        headers=headers,
+    )
+    assert response.status_code == status.HTTP_200_OK
+    result = response.json()
+    assert [post['id'] for post in result['posts']] == ids
+    assert {post['title'] for post in result['posts']} == {'Новое название'}
+    assert result['not_found'] == [missing_id]
+    assert [stmt.split()[0] for stmt in statements] == ['UPDATE']
+
+    response = await async_client.get(f'{URL_PREFIX_POST}/{ids[0]}')
+    assert response.json()['title'] == 'Новое название'
+    assert response.json()['content'] == 'Текст #0'
+
+
+@pytest.mark.anyio
+async def test_update_posts_bulk_unauthorized(async_client):
+    response = await async_client.patch(
+        URL_BULK, json={'ids': [1], 'data': {'title': 'Название'}}
+    )
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.anyio
+async def test_delete_posts_bulk(async_client, headers, statements):
+    response = await async_client.post(
+        URL_BULK, json=bulk_posts(BULK_SIZE, 'Удаляемый'), headers=headers
+    )
+    ids = [post['id'] for post in response.json()]
+    missing_id = max(ids) + 1000
+    statements.clear()
+
+    response = await async_client.request(
+        'DELETE',
+        URL_BULK,
+        json={'ids': [*ids, missing_id, ids[0]]},
+        headers=headers,
+    )
+    assert response.status_code == status.HTTP_200_OK
+    result = response.json()
+    assert [post['id'] for post in result['posts']] == ids
+    assert result['not_found'] == [missing_id]
+    assert [stmt.split()[0] for stmt in statements] == ['DELETE']
+
+    response = await async_client.get(f'{URL_PREFIX_POST}/{ids[0]}')
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.anyio
+async def test_delete_posts_bulk_unauthorized(async_client):
+    response = await async_client.request(
+        'DELETE', URL_BULK, json={'ids': [1]}
+    )
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,84 @@
+import csv
+import io
+
+import orjson
+import pytest
+from fastapi import status
+
+from src.core.config import settings
+from src.schemas.post import ExportFormat
+from src.services.export_posts import EXPORT_FIELDS, export_posts
+from tests.conftest import MAX_NUM_POSTS, URL_PREFIX_POST, USER_ID
+
+URL_EXPORT = f'{URL_PREFIX_POST}/export'
+
+
+@pytest.mark.anyio
+async def test_export_posts_ndjson(async_client, create_test_posts):
+    response = await async_client.get(URL_EXPORT)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers['content-type'] == 'application/x-ndjson'
+
+    posts = [orjson.loads(line) for line in response.text.splitlines()]
+    assert len(posts) == MAX_NUM_POSTS
+    assert [post['id'] for post in posts] == list(range(1, MAX_NUM_POSTS + 1))
+    assert tuple(posts[0]) == EXPORT_FIELDS
+
+    response = await async_client.get(f'{URL_PREFIX_POST}/{posts[0]["id"]}')
+    assert response.json() == posts[0]
+
+
+@pytest.mark.anyio
+async def test_export_posts_csv(async_client, create_test_posts, posts_data):
+    response = await async_client.get(URL_EXPORT, params={'format': 'csv'})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers['content-type'].startswith('text/csv')
+
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == MAX_NUM_POSTS
+    assert [row['title'] for row in rows] == [
+        post['title'] for post in posts_data
+    ]
+
+
+@pytest.mark.anyio
+async def test_export_posts_filters(
+    async_client, create_test_posts, posts_data
+):
+    response = await async_client.get(
+        URL_EXPORT, params={'user_id': USER_ID + 1}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.text == ''
+
+    newest, oldest = posts_data[0], posts_data[2]
+    response = await async_client.get(
+        URL_EXPORT,
+        params={
+            'user_id': USER_ID,
+            'from': oldest['created_at'].date().isoformat(),
+            'to': newest['created_at'].date().isoformat(),
+        },
+    )
+    titles = [
+        orjson.loads(line)['title'] for line in response.text.splitlines()
+    ]
+    assert titles == [post['title'] for post in posts_data[:3]]
+
+
+@pytest.mark.anyio
+async def test_export_posts_in_batches(
+    db_session_factory, create_test_posts, monkeypatch
+):
+    monkeypatch.setattr(settings, 'post_export_batch_size', 3)
+
+    async def session():
+        return db_session_factory()
+
+    chunks = [
+        chunk
+        async for chunk in export_posts(
+            session, export_format=ExportFormat.ndjson
+        )
+    ]
+    assert [chunk.count(b'\n') for chunk in chunks] == [3, 3, 3, 1]
@@ -0,0 +1,112 @@
+from datetime import timedelta
+from email.utils import format_datetime, parsedate_to_datetime
+
+import pytest
+from fastapi import status
+
+from src.core.config import settings
+from src.core.response_cache import response_cache
+from src.repositories.post import post_crud
+from tests.conftest import URL_PREFIX_POST
+
+POST_ID = 1
+URL_POST = f'{URL_PREFIX_POST}/{POST_ID}'
+
+
+@pytest.mark.anyio
+async def test_get_post_validators(async_client, create_test_posts):
+    response = await async_client.get(URL_POST)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers['etag']
+    assert response.headers['cache-control'] == 'no-cache'
+    assert parsedate_to_datetime(response.headers['last-modified'])
+
+
+@pytest.mark.anyio
+async def test_get_post_if_none_match(
+    async_client, create_test_posts, headers, statements
+):
+    etag = (await async_client.get(URL_POST)).headers['etag']
+    post_crud.cache.clear()
+    statements.clear()
+
+    response = await async_client.get(
+        URL_POST, headers={'If-None-Match': etag}
+    )
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.content == b''
+    assert response.headers['etag'] == etag
+    assert len(statements) == 1
+    assert 'post.content' not in statements[0]
+
+    await async_client.patch(
+        URL_POST, json={'title': 'Новое название'}, headers=headers
+    )
+    response = await async_client.get(
+        URL_POST, headers={'If-None-Match': etag}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers['etag'] != etag
+
+
+@pytest.mark.anyio
+async def test_get_post_if_modified_since(async_client, create_test_posts):
+    response = await async_client.get(URL_POST)
+    last_modified = response.headers['last-modified']
+
+    response = await async_client.get(
+        URL_POST, headers={'If-Modified-Since': last_modified}
+    )
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    earlier = parsedate_to_datetime(last_modified) - timedelta(seconds=1)
+    response = await async_client.get(
+        URL_POST,
+        headers={'If-Modified-Since': format_datetime(earlier, usegmt=True)},
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.anyio
+async def test_get_posts_if_none_match(
+    async_client, create_test_posts, headers, statements
+):
+    url = f'{URL_PREFIX_POST}/?limit=3'
+    etag = (await async_client.get(url)).headers['etag']
+    response_cache.clear()
+    statements.clear()
+
+    response = await async_client.get(url, headers={'If-None-Match': etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert len(statements) == 1
+    assert 'post.title' not in statements[0]
+
+    response = await async_client.get(
+        f'{url}&fields=id,title', headers={'If-None-Match': etag}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers['etag'] != etag
+
+    await async_client.post(
+        f'{URL_PREFIX_POST}/',
+        json={'title': 'Новый пост', 'content': 'Текст'},
+        headers=headers,
+    )
+    response = await async_client.get(url, headers={'If-None-Match': etag})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()[0]['title'] == 'Новый пост'
+
+
+@pytest.mark.anyio
+async def test_cache_control_per_route(
+    async_client, create_test_posts, monkeypatch
+):
+    monkeypatch.setattr(
+        settings, 'http_cache_control', {'get_post': 'public, max-age=60'}
+    )
+
+    response = await async_client.get(URL_POST)
+    assert response.headers['cache-control'] == 'public, max-age=60'
+
+    response = await async_client.get(f'{URL_PREFIX_POST}/')
+    assert 'cache-control' not in response.headers
@@ -0,0 +1,175 @@
+import csv
+import io
+
+import orjson
+import pytest
+from fastapi import status
+
+from src.core.config import settings
+from src.schemas.post import ExportFormat
+from src.services.import_posts import iter_records
+from tests.conftest import TEST_USER, URL_PREFIX_POST, USER_ID
+
+URL_IMPORT = f'{URL_PREFIX_POST}/import'
+URL_EXPORT = f'{URL_PREFIX_POST}/export'
+
+
+@pytest.fixture
+def admin(monkeypatch):
+    monkeypatch.setattr(settings, 'admin_logins', [TEST_USER['login']])
+    monkeypatch.setattr(settings, 'post_import_batch_size', 2)
+
+
+def ndjson_file(rows: list[dict]) -> dict:
+    content = b''.join(orjson.dumps(row) + b'\n' for row in rows)
+    return {'file': ('posts.ndjson', content, 'application/x-ndjson')}
+
+
+async def export_titles(async_client) -> list[str]:
+    response = await async_client.get(URL_EXPORT)
+    return [
+        orjson.loads(line)['title'] for line in response.text.splitlines()
+    ]
+
+
+async def chunked(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+@pytest.mark.anyio
+async def test_iter_records_csv_multiline():
+    data = 'title,content\r\n"Первый","строка 1\r\nстрока 2"\r\nВторой,""\r\n'
+    records = [
+        record
+        async for record in iter_records(
+            chunked(data.encode(), 1), ExportFormat.csv
+        )
+    ]
+    assert [line for line, _ in records] == [1, 2, 4]
+    assert next(csv.reader([records[1][1]])) == [
+        'Первый',
+        'строка 1\r\nстрока 2',
+    ]
+
+
+@pytest.mark.anyio
+async def test_import_posts_unauthorized(async_client):
+    response = await async_client.post(URL_IMPORT, files=ndjson_file([]))
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.anyio
+async def test_import_posts_requires_admin(async_client, headers):
+    response = await async_client.post(
+        URL_IMPORT, files=ndjson_file([]), headers=headers
+    )
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.anyio
+async def test_import_posts_ndjson(async_client, headers, admin):
+    rows = [
+        {'user_id': USER_ID, 'title': 'Импорт #1', 'content': 'Текст'},
+        {'user_id': USER_ID, 'content': 'Без названия'},
+        {
+            'user_id': USER_ID,
+            'title': 'Импорт #2',
+            'content': 'Текст',
+            'created_at': '2024-01-15T10:00:00',
+        },
+        {'user_id': USER_ID + 100, 'title': 'Чужой', 'content': 'Текст'},
+        {'user_id': USER_ID, 'title': 'Импорт #3', 'content': 'Текст'},
+    ]
+    response = await async_client.post(
+        URL_IMPORT, files=ndjson_file(rows), headers=headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    report = response.json()
+    assert report['rows'] == 5
+    assert report['inserted'] == 3
+    assert report['failed'] == 2
+    assert report['rows_per_second'] > 0
+    assert [
+        (error['batch'], error['line']) for error in report['errors']
+    ] == [(1, 2), (2, 4)]
+
+    assert await export_titles(async_client) == [
+        'Импорт #1',
+        'Импорт #2',
+        'Импорт #3',
+    ]
+
+    response = await async_client.get(
+        f'{URL_PREFIX_POST}/statistics/{USER_ID}',
+        params={'from': '2024-01-01', 'to': '2024-01-31'},
+    )
+    assert response.json() == {'avg_posts_month': 1}
+
+
+@pytest.mark.anyio
+async def test_import_posts_aware_datetimes(async_client, headers, admin):
+    rows = [
+        {
+            'user_id': USER_ID,
+            'title': 'Импорт UTC',
+            'content': 'Текст',
+            'created_at': '2020-01-01T00:00:00Z',
+            'updated_at': '2020-01-01T03:00:00+03:00',
+        },
+        {'user_id': USER_ID, 'title': 'Импорт без даты', 'content': 'Текст'},
+    ]
+    response = await async_client.post(
+        URL_IMPORT, files=ndjson_file(rows), headers=headers
+    )
+    report = response.json()
+    assert report['inserted'] == 2
+    assert report['errors'] == []
+
+    response = await async_client.get(URL_EXPORT)
+    posts = {
+        post['title']: post
+        for post in map(orjson.loads, response.text.splitlines())
+    }
+    assert posts['Импорт UTC']['created_at'] == '2020-01-01T00:00:00'
+    assert posts['Импорт UTC']['updated_at'] == '2020-01-01T00:00:00'
+
+
+@pytest.mark.anyio
+async def test_import_posts_failed_batch(async_client, headers, admin):
+    rows = [
+        {'user_id': USER_ID, 'title': 'Пачка #1', 'content': 'Текст'},
+        {'user_id': USER_ID, 'title': 'Пачка #1', 'content': 'Текст\x00'},
+        {'user_id': USER_ID, 'title': 'Пачка #2', 'content': 'Текст'},
+    ]
+    response = await async_client.post(
+        URL_IMPORT, files=ndjson_file(rows), headers=headers
+    )
+    report = response.json()
+    assert report['inserted'] == 1
+    assert len(report['errors']) == 1
+    assert report['errors'][0]['batch'] == 1
+    assert report['errors'][0]['line'] is None
+
+    titles = await export_titles(async_client)
+    assert 'Пачка #1' not in titles
+    assert 'Пачка #2' in titles
+
+
+@pytest.mark.anyio
+async def test_import_posts_csv_round_trip(async_client, headers, admin):
+    response = await async_client.get(URL_EXPORT, params={'format': 'csv'})
+    exported = list(csv.DictReader(io.StringIO(response.text)))
+
+    response = await async_client.post(
+        URL_IMPORT,
+        params={'format': 'csv'},
+        files={'file': ('posts.csv', response.content, 'text/csv')},
+        headers=headers,
+    )
+    report = response.json()
+    assert report['inserted'] == len(exported)
+    assert report['errors'] == []
+
+    titles = await export_titles(async_client)
+    assert titles == [row['title'] for row in exported] * 2
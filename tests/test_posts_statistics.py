@@ -1,10 +1,27 @@
+import asyncio
+from datetime import UTC, datetime, timedelta
+
 import pytest
+from sqlalchemy import func, insert, select, update
 
+from src.models import Post, PostMonthlyCount, User
+from src.repositories.post import post_crud
+from src.repositories.user import user_crud
+from src.schemas.post import PostCreate, PostUpdate
 from tests.conftest import URL_PREFIX_POST, USER_ID
 
 AVG_POSTS_MONTH = 1
 
 
+async def monthly_counts(db_session) -> dict:
+    result = await db_session.execute(
+        select(PostMonthlyCount.month, PostMonthlyCount.count).where(
+            PostMonthlyCount.user_id == USER_ID
+        )
+    )
+    return dict(result.all())
+
+
 @pytest.mark.anyio
 async def test_get_user_avg_posts_month(async_client, create_test_posts):
     response = await async_client.get(
@@ -12,3 +29,256 @@ async def test_get_user_avg_posts_month(async_client, create_test_posts):
     )
     assert response.status_code == 200
     assert response.json() == {'avg_posts_month': AVG_POSTS_MONTH}
+
+
+@pytest.mark.anyio
+async def test_monthly_counts_match_posts(db_session, create_test_posts):
+    counts = await monthly_counts(db_session)
+    total = await db_session.scalar(select(func.count(Post.id)))
+    assert sum(counts.values()) == total
+
+
+@pytest.mark.anyio
+async def test_monthly_counts_follow_writes(db_session, create_test_posts):
+    month = datetime.now(UTC).date().replace(day=1)
+    before = (await monthly_counts(db_session)).get(month, 0)
+
+    post = await post_crud.create(
+        db=db_session,
+        obj=PostCreate(user_id=USER_ID, title='Счётчик', content='Текст'),
+    )
+    assert (await monthly_counts(db_session))[month] == before + 1
+
+    await post_crud.patch(
+        db=db_session, obj_id=post.id, data=PostUpdate(title='Счётчик 2')
+    )
+    assert (await monthly_counts(db_session))[month] == before + 1
+
+    await post_crud.delete(db=db_session, obj_id=post.id)
+    assert (await monthly_counts(db_session)).get(month, 0) == before
+
+
+@pytest.mark.anyio
+async def test_monthly_counts_move_with_created_at(
+    db_session, create_test_posts
+):
+    post = await db_session.get(Post, 1)
+    old_month = post.created_at.date().replace(day=1)
+    new_created_at = datetime(2000, 1, 15)
+    counts = await monthly_counts(db_session)
+
+    post.created_at = new_created_at
+    await db_session.commit()
+
+    moved = await monthly_counts(db_session)
+    assert moved.get(old_month, 0) == counts[old_month] - 1
+    assert moved[new_created_at.date().replace(day=1)] == 1
+
+    post.created_at = post.created_at + timedelta(days=1)
+    await db_session.commit()
+    assert await monthly_counts(db_session) == moved
+
+
+async def all_monthly_counts(db_session) -> dict:
+    result = await db_session.execute(
+        select(
+            PostMonthlyCount.user_id,
+            PostMonthlyCount.month,
+            PostMonthlyCount.count,
+        )
+    )
+    return {(user_id, month): count for user_id, month, count in result}
+
+
+async def expected_monthly_counts(db_session) -> dict:
+    month = func.date_trunc('month', Post.created_at)
+    result = await db_session.execute(
+        select(Post.user_id, month, func.count()).group_by(
+            Post.user_id, month
+        )
+    )
+    return {
+        (user_id, month.date()): count for user_id, month, count in result
+    }
+
+
+@pytest.mark.anyio
+async def test_monthly_counts_follow_bulk_writes(
+    db_session, create_test_posts
+):
+    created_at = datetime(2001, 3, 10)
+    rows = [
+        {
+            'user_id': USER_ID,
+            'title': f'Пакет #{number}',
+            'content': 'Текст',
+            'created_at': created_at + timedelta(days=number * 20),
+        }
+        for number in range(4)
+    ]
+    ids = list(
+        await db_session.scalars(insert(Post).returning(Post.id), rows)
+    )
+    await db_session.commit()
+    assert await all_monthly_counts(db_session) == (
+        await expected_monthly_counts(db_session)
+    )
+
+    await db_session.execute(
+        update(Post)
+        .where(Post.id.in_(ids))
+        .values(created_at=Post.created_at + timedelta(days=40))
+    )
+    await db_session.execute(
+        update(Post).where(Post.id.in_(ids)).values(title='Пакет')
+    )
+    await db_session.commit()
+    assert await all_monthly_counts(db_session) == (
+        await expected_monthly_counts(db_session)
+    )
+
+    await db_session.execute(Post.__table__.delete().where(Post.id.in_(ids)))
+    await db_session.commit()
+    counts = await all_monthly_counts(db_session)
+    assert counts == await expected_monthly_counts(db_session)
+    assert all(month.year != 2001 for _, month in counts)
+
+
+@pytest.mark.anyio
+async def test_monthly_counts_concurrent_writes(
+    db_session, db_session_factory, create_test_posts
+):
+    """
+    Пакетные вставки в разном порядке авторов не блокируют друг друга
+    взаимно: счётчики обновляются в порядке (user_id, month)
+    """
+
+    user_ids = list(
+        await db_session.scalars(
+            insert(User).returning(User.id),
+            [
+                {'login': f'counter_user_{number}', 'password': '-'}
+                for number in range(2)
+            ],
+        )
+    )
+    await db_session.commit()
+    created_at = datetime(2002, 5, 5)
+
+    def rows(authors):
+        return [
+            {
+                'user_id': user_id,
+                'title': 'Счётчик',
+                'content': 'Текст',
+                'created_at': created_at,
+            }
+            for user_id in authors
+        ]
+
+    # INSERT ... RETURNING выполняется одним оператором, как create_many
+    stmt = insert(Post).returning(Post.id)
+    async with db_session_factory() as first, db_session_factory() as second:
+        await first.execute(stmt, rows(user_ids[:1]))
+        blocked = asyncio.create_task(
+            second.execute(stmt, rows(reversed(user_ids)))
+        )
+        await asyncio.sleep(0.2)
+        await first.execute(stmt, rows(user_ids[1:]))
+        await first.commit()
+        await asyncio.wait_for(blocked, 5)
+        await second.commit()
+
+    counts = await all_monthly_counts(db_session)
+    assert [
+        counts[(user_id, created_at.date().replace(day=1))]
+        for user_id in user_ids
+    ] == [2, 2]
+
+
+@pytest.mark.anyio
+async def test_monthly_counts_user_deleted(db_session, create_test_posts):
+    user_id = await db_session.scalar(
+        insert(User)
+        .values(login='deleted_counter_user', password='-')
+        .returning(User.id)
+    )
+    await db_session.execute(
+        insert(Post).returning(Post.id),
+        [
+            {
+                'user_id': user_id,
+                'title': 'Удаляемый',
+                'content': 'Текст',
+                'created_at': datetime(2003, month, 1),
+            }
+            for month in (1, 1, 2)
+        ],
+    )
+    await db_session.commit()
+    before = await all_monthly_counts(db_session)
+    assert before[(user_id, datetime(2003, 1, 1).date())] == 2
+
+    await user_crud.delete(db=db_session, obj_id=user_id)
+
+    counts = await all_monthly_counts(db_session)
+    assert counts == {
+        key: count for key, count in before.items() if key[0] != user_id
+    }
+    assert counts == await expected_monthly_counts(db_session)
+
+
+@pytest.mark.anyio
+async def test_get_user_avg_posts_month_not_found(async_client):
+    response = await async_client.get(f'{URL_PREFIX_POST}/statistics/999')
+    assert response.status_code == 404
+
+
+@pytest.mark.anyio
+async def test_get_users_avg_posts_month(async_client, create_test_posts):
+    response = await async_client.post(
+        f'{URL_PREFIX_POST}/statistics',
+        json={'user_ids': [USER_ID, 999]},
+    )
+    assert response.status_code == 200
+    assert response.json() == {
+        'avg_posts_month': {str(USER_ID): AVG_POSTS_MONTH},
+        'not_found': [999],
+    }
+
+
+@pytest.mark.anyio
+async def test_get_users_avg_posts_month_period(
+    async_client, create_test_posts
+):
+    response = await async_client.post(
+        f'{URL_PREFIX_POST}/statistics',
+        json={'user_ids': [USER_ID], 'from': '1990-01-01', 'to': '1990-12-31'},
+    )
+    assert response.status_code == 200
+    assert response.json()['avg_posts_month'] == {str(USER_ID): 0}
+
+    response = await async_client.get(
+        f'{URL_PREFIX_POST}/statistics/{USER_ID}',
+        params={'from': '2000-01-01', 'to': '2000-01-31'},
+    )
+    assert response.status_code == 200
+    assert response.json() == {'avg_posts_month': 1}
+
+
+@pytest.mark.anyio
+async def test_get_users_avg_posts_month_invalid_period(async_client):
+    response = await async_client.post(
+        f'{URL_PREFIX_POST}/statistics',
+        json={'user_ids': [USER_ID], 'from': '2024-02-01', 'to': '2024-01-01'},
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.anyio
+async def test_get_user_avg_posts_month_invalid_period(async_client):
+    response = await async_client.get(
+        f'{URL_PREFIX_POST}/statistics/{USER_ID}',
+        params={'from': '2024-02-01', 'to': '2024-01-01'},
+    )
+    assert response.status_code == 422
@@ -0,0 +1,84 @@
+import logging
+
+import pytest
+
+from src.core.config import settings
+from src.core.profiler import RequestStats, normalize_sql
+from src.core.response_cache import response_cache
+from src.repositories.post import post_crud
+from tests.conftest import URL_PREFIX_POST
+
+POST_ROUTE = '/api/v1/posts/{post_id}'
+
+
+def test_normalize_sql():
+    statement = (
+        "SELECT post.id\n  FROM post\n WHERE post.title = 'it''s'"
+        ' AND post.id IN (1, 2.5) AND post.user_id = $1'
+    )
+    assert normalize_sql(statement) == (
+        'SELECT post.id FROM post WHERE post.title = ? '
+        'AND post.id IN (?, ?) AND post.user_id = $1'
+    )
+
+
+def test_request_stats_slowest():
+    stats = RequestStats(top_n=2)
+    for statement, elapsed in zip('abcd', (0.3, 0.1, 0.5, 0.2)):
+        stats.add(statement, elapsed)
+
+    assert stats.queries == 4
+    assert stats.db_time == pytest.approx(1.1)
+    assert stats.slowest == [(0.5, 'c'), (0.3, 'a')]
+
+
+@pytest.mark.anyio
+async def test_server_timing(async_client, create_test_posts, monkeypatch):
+    response = await async_client.get(f'{URL_PREFIX_POST}/1')
+    assert 'server-timing' not in response.headers
+
+    monkeypatch.setattr(settings, 'server_timing_enabled', True)
+    post_crud.cache.clear()
+    response = await async_client.get(f'{URL_PREFIX_POST}/1')
+    assert response.headers['server-timing'].startswith('db;dur=')
+    assert 'desc="1 queries"' in response.headers['server-timing']
+
+
+@pytest.mark.anyio
+async def test_slow_query_log(
+    async_client, create_test_posts, monkeypatch, caplog
+):
+    monkeypatch.setattr(settings, 'db_slow_query_seconds', 1e-9)
+    post_crud.cache.clear()
+    with caplog.at_level(logging.WARNING):
+        await async_client.get(f'{URL_PREFIX_POST}/1')
+
+    messages = [
+        record.getMessage()
+        for record in caplog.records
+        if record.getMessage().startswith('Slow query')
+    ]
+    assert len(messages) == 1
+    assert f'route:{POST_ROUTE}]' in messages[0]
+    assert 'WHERE post.id = $1::INTEGER' in messages[0]
+
+
+@pytest.mark.anyio
+async def test_request_queries_warning(
+    async_client, create_test_posts, monkeypatch, caplog
+):
+    monkeypatch.setattr(settings, 'db_request_queries_warning', 1)
+    response_cache.clear()
+    with caplog.at_level(logging.WARNING):
+        await async_client.get(
+            f'{URL_PREFIX_POST}/', headers={'If-None-Match': '"stale"'}
+        )
+
+    messages = [
+        record.getMessage()
+        for record in caplog.records
+        if record.getMessage().startswith('Request GET')
+    ]
+    assert len(messages) == 1
+    assert messages[0].startswith('Request GET /api/v1/posts/ made 2 queries')
+    assert messages[0].count('ms SELECT') == 2
@@ -0,0 +1,154 @@
+import asyncpg
+import pytest
+from fastapi import status
+from sqlalchemy import NullPool, text
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from src.core.config import settings
+from src.db.replicas import (
+    ReadSessionRouter,
+    ReadYourWritesListener,
+    is_replica_session,
+)
+
+REPLICA_DB = f'{settings.postgres_test_db}_replica'
+UNAVAILABLE_DSN = settings.dsn_test.replace(
+    f':{settings.db_port}/', ':1/'
+)
+
+
+def session_factory(dsn: str) -> async_sessionmaker:
+    engine = create_async_engine(dsn, poolclass=NullPool)
+    return async_sessionmaker(
+        bind=engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+
+@pytest.fixture(scope='module')
+async def replica_factory(create_test_database):
+    dsn = settings.dsn.replace('postgresql+asyncpg', 'postgresql')
+    conn = await asyncpg.connect(dsn)
+    await conn.execute(f'DROP DATABASE IF EXISTS {REPLICA_DB}')
+    await conn.execute(f'CREATE DATABASE {REPLICA_DB}')
+    await conn.close()
+
+    factory = session_factory(
+        settings.dsn_test.replace(settings.postgres_test_db, REPLICA_DB)
+    )
+
+    yield factory
+
+    await factory.kw['bind'].dispose()
+    conn = await asyncpg.connect(dsn)
+    await conn.execute(f'DROP DATABASE IF EXISTS {REPLICA_DB}')
+    await conn.close()
+
+
+async def current_database(router: ReadSessionRouter, **kwargs) -> str:
+    async with await router.session(**kwargs) as session:
+        result = await session.execute(text('SELECT current_database()'))
+        return result.scalar_one()
+
+
+@pytest.mark.anyio
+async def test_reads_go_to_replica(db_session_factory, replica_factory):
+    router = ReadSessionRouter(
+        db_session_factory, [replica_factory], retry_after=30
+    )
+
+    assert await current_database(router) == REPLICA_DB
+    assert router.stats()['replica_reads'] == 1
+    assert router.stats()['primary_reads'] == 0
+
+
+@pytest.mark.anyio
+async def test_reads_round_robin(db_session_factory, replica_factory):
+    router = ReadSessionRouter(
+        db_session_factory,
+        [replica_factory, db_session_factory],
+        retry_after=30,
+    )
+
+    databases = [await current_database(router) for _ in range(4)]
+    assert databases == [REPLICA_DB, settings.postgres_test_db] * 2
+    assert router.stats()['replica_reads'] == 4
+
+
+@pytest.mark.anyio
+async def test_unavailable_replica_falls_back(
+    db_session_factory, replica_factory
+):
+    unavailable = session_factory(UNAVAILABLE_DSN)
+    router = ReadSessionRouter(
+        db_session_factory, [unavailable, replica_factory], retry_after=30
+    )
+
+    assert await current_database(router) == REPLICA_DB
+    assert await current_database(router) == REPLICA_DB
+    stats = router.stats()
+    assert stats['replica_failures'] == 1
+    assert stats['replicas_down'] == 1
+
+    router = ReadSessionRouter(
+        db_session_factory, [unavailable], retry_after=30
+    )
+    assert await current_database(router) == settings.postgres_test_db
+    assert router.stats()['primary_reads'] == 1
+
+
+@pytest.mark.anyio
+async def test_read_your_writes(db_session_factory, replica_factory):
+    router = ReadSessionRouter(
+        db_session_factory,
+        [replica_factory],
+        retry_after=30,
+        read_your_writes_window=60,
+    )
+    listener = ReadYourWritesListener(router)
+
+    class Post:
+        user_id = 1
+
+    await listener.on_create(Post())
+    assert await current_database(router, user_id=1) == (
+        settings.postgres_test_db
+    )
+    assert await current_database(router, user_id=2) == REPLICA_DB
+    assert await current_database(router) == REPLICA_DB
+
+
+@pytest.mark.anyio
+async def test_replica_session_marked(db_session_factory, replica_factory):
+    router = ReadSessionRouter(
+        db_session_factory,
+        [replica_factory],
+        retry_after=30,
+        read_your_writes_window=60,
+    )
+    router.pin(1)
+
+    async with await router.session() as session:
+        assert is_replica_session(session)
+    async with await router.session(user_id=1) as session:
+        assert not is_replica_session(session)
+
+
+@pytest.mark.anyio
+async def test_read_your_writes_disabled(db_session_factory, replica_factory):
+    router = ReadSessionRouter(
+        db_session_factory, [replica_factory], retry_after=30
+    )
+    router.pin(1)
+
+    assert await current_database(router, user_id=1) == REPLICA_DB
+
+
+@pytest.mark.anyio
+async def test_replicas_stats_endpoint(async_client):
+    response = await async_client.get('/api/v1/service/replicas')
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()['replicas'] == len(settings.db_replica_dsns)
@@ -0,0 +1,136 @@
+import gzip
+
+import orjson
+import pytest
+from fastapi import Request, status
+from fastapi.responses import ORJSONResponse
+
+from src.core.response_cache import ResponseCache, response_cache
+from tests.conftest import URL_PREFIX_POST
+
+URL_POSTS = f'{URL_PREFIX_POST}/'
+
+
+def make_request(query: str = '', accept_encoding: str = '') -> Request:
+    headers = [(b'accept-encoding', accept_encoding.encode())]
+    return Request(
+        {
+            'type': 'http',
+            'method': 'GET',
+            'path': URL_POSTS,
+            'query_string': query.encode(),
+            'headers': headers,
+        }
+    )
+
+
+def test_response_cache_key_normalized():
+    assert ResponseCache.key(make_request('b=2&a=1')) == ResponseCache.key(
+        make_request('a=1&b=2')
+    )
+    assert ResponseCache.key(make_request('a=1')) != ResponseCache.key(
+        make_request('a=2')
+    )
+
+
+def test_response_cache_evicts_by_size():
+    cache = ResponseCache(max_bytes=250, ttl=60, min_gzip_size=10_000)
+    for page in range(3):
+        request = make_request(f'page={page}')
+        cache.set(request, ORJSONResponse('x' * 98), cache.generation)
+
+    assert cache.stats()['entries'] == 2
+    assert cache.stats()['bytes'] == 200
+    assert cache.stats()['evictions'] == 1
+    assert cache.get(make_request('page=0')) is None
+    assert cache.get(make_request('page=2')) is not None
+
+
+def test_response_cache_skips_stale_generation():
+    cache = ResponseCache(max_bytes=1000, ttl=60, min_gzip_size=10_000)
+    generation = cache.generation
+    cache.clear()
+
+    response = cache.set(make_request(), ORJSONResponse([]), generation)
+    assert response.body == b'[]'
+    assert cache.get(make_request()) is None
+
+
+def test_response_cache_gzip_threshold():
+    cache = ResponseCache(max_bytes=100_000, ttl=60, min_gzip_size=100)
+    small = make_request('size=small', 'gzip')
+    large = make_request('size=large', 'gzip, deflate')
+    cache.set(small, ORJSONResponse('x'), cache.generation)
+    cache.set(large, ORJSONResponse('x' * 1000), cache.generation)
+
+    assert 'content-encoding' not in cache.get(small).headers
+    response = cache.get(large)
+    assert response.headers['content-encoding'] == 'gzip'
+    assert response.headers['vary'] == 'Accept-Encoding'
+    assert orjson.loads(gzip.decompress(response.body)) == 'x' * 1000
+
+    response = cache.get(make_request('size=large', 'gzip;q=0'))
+    assert 'content-encoding' not in response.headers
+    assert orjson.loads(response.body) == 'x' * 1000
+
+
+@pytest.mark.anyio
+async def test_get_posts_cached(async_client, create_test_posts, statements):
+    response = await async_client.get(URL_POSTS, params={'limit': 5})
+    assert response.status_code == status.HTTP_200_OK
+    statements.clear()
+
+    cached = await async_client.get(URL_POSTS, params={'limit': 5})
+    assert cached.status_code == status.HTTP_200_OK
+    assert statements == []
+    assert cached.json() == response.json()
+    assert cached.headers['etag'] == response.headers['etag']
+    assert cached.headers['link'] == response.headers['link']
+
+    cached = await async_client.get(
+        URL_POSTS,
+        params={'limit': 5},
+        headers={'If-None-Match': response.headers['etag']},
+    )
+    assert cached.status_code == status.HTTP_304_NOT_MODIFIED
+    assert statements == []
+
+
+@pytest.mark.anyio
+async def test_get_posts_cached_gzip(
+    async_client, create_test_posts, monkeypatch
+):
+    monkeypatch.setattr(response_cache, 'min_gzip_size', 0)
+    params = {'limit': 10}
+
+    response = await async_client.get(
+        URL_POSTS, params=params, headers={'Accept-Encoding': 'gzip'}
+    )
+    assert response.headers['content-encoding'] == 'gzip'
+    assert response.headers['vary'] == 'Accept-Encoding'
+
+    plain = await async_client.get(
+        URL_POSTS, params=params, headers={'Accept-Encoding': 'identity'}
+    )
+    assert 'content-encoding' not in plain.headers
+    assert plain.json() == response.json()
+
+
+@pytest.mark.anyio
+async def test_response_cache_invalidated_on_write(
+    async_client, create_test_posts, headers
+):
+    url = f'{URL_PREFIX_POST}/search/Кэш'
+    assert (await async_client.get(url)).json() == []
+    response = await async_client.get(URL_POSTS)
+    titles = [post['title'] for post in response.json()]
+
+    await async_client.post(
+        URL_POSTS, json={'title': 'Кэш', 'content': 'Текст'}, headers=headers
+    )
+    assert response_cache.stats()['entries'] == 0
+
+    response = await async_client.get(url)
+    assert [post['title'] for post in response.json()] == ['Кэш']
+    response = await async_client.get(URL_POSTS)
+    assert [post['title'] for post in response.json()] == ['Кэш', *titles]
@@ -0,0 +1,119 @@
+import pytest
+from fastapi import status
+
+from src.repositories.post import post_crud
+from src.search.memory import InvertedIndex
+from tests.conftest import MAX_NUM_POSTS, URL_PREFIX_POST
+
+SEARCH_PARAMS = {'mode': 'memory'}
+
+
+def test_index_ranks_title_above_content():
+    index = InvertedIndex()
+    index.add(1, 'Обычный пост', 'Про ранжирование')
+    index.add(2, 'Ранжирование', 'Текст')
+    index.add(3, 'Другой пост', 'Текст')
+
+    hits = index.search('ранжирование', k=10)
+    assert [doc_id for doc_id, _ in hits] == [2, 1]
+
+
+def test_index_rare_terms_score_higher():
+    index = InvertedIndex()
+    index.add(1, 'пост', 'общий редкий')
+    index.add(2, 'пост', 'общий')
+    index.add(3, 'пост', 'общий')
+
+    hits = index.search('общий редкий', k=1)
+    assert hits[0][0] == 1
+
+
+def test_index_update_and_remove():
+    index = InvertedIndex()
+    index.add(1, 'Старый заголовок', 'Текст')
+    index.add(1, 'Новый заголовок', 'Текст')
+    assert index.search('старый', k=10) == []
+    assert [doc_id for doc_id, _ in index.search('новый', k=10)] == [1]
+
+    index.remove(1)
+    assert 1 not in index
+    assert len(index) == 0
+    assert index.search('новый', k=10) == []
+
+
+def test_index_top_k():
+    index = InvertedIndex()
+    for doc_id in range(1, 101):
+        index.add(doc_id, 'пост', ' '.join(['слово'] * (doc_id % 7 + 1)))
+
+    top = index.search('слово', k=5)
+    full = index.search('слово', k=None)
+    assert len(top) == 5
+    assert len(full) == 100
+    assert top == full[:5]
+
+
+@pytest.fixture(scope='module')
+async def search_index(db_session, create_test_posts):
+    post_crud.add_listener(post_crud.search_index)
+    await post_crud.search_index.build(db_session)
+
+    yield post_crud.search_index
+
+    post_crud.remove_listener(post_crud.search_index)
+    post_crud.search_index.reset()
+
+
+@pytest.mark.anyio
+async def test_search_posts_memory(async_client, search_index, posts_data):
+    response = await async_client.get(
+        f'{URL_PREFIX_POST}/search/{MAX_NUM_POSTS}', params=SEARCH_PARAMS
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert [post['title'] for post in response.json()] == [
+        posts_data[MAX_NUM_POSTS - 1]['title']
+    ]
+
+
+@pytest.mark.anyio
+async def test_search_posts_memory_follows_writes(
+    async_client, search_index, headers
+):
+    response = await async_client.post(
+        f'{URL_PREFIX_POST}/',
+        json={'title': 'Индексация', 'content': 'Текст'},
+        headers=headers,
+    )
+    post_id = response.json()['id']
+    url = f'{URL_PREFIX_POST}/search/индексация'
+
+    response = await async_client.get(url, params=SEARCH_PARAMS)
+    assert [post['id'] for post in response.json()] == [post_id]
+
+    await async_client.patch(
+        f'{URL_PREFIX_POST}/{post_id}',
+        json={'title': 'Переиндексация'},
+        headers=headers,
+    )
+    response = await async_client.get(url, params=SEARCH_PARAMS)
+    assert response.json() == []
+
+    await async_client.delete(
+        f'{URL_PREFIX_POST}/{post_id}', headers=headers
+    )
+    response = await async_client.get(
+        f'{URL_PREFIX_POST}/search/переиндексация', params=SEARCH_PARAMS
+    )
+    assert response.json() == []
+
+
+@pytest.mark.anyio
+async def test_search_posts_memory_fields(async_client, search_index):
+    response = await async_client.get(
+        f'{URL_PREFIX_POST}/search/сообщения',
+        params={**SEARCH_PARAMS, 'fields': 'title', 'limit': 3},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    posts = response.json()
+    assert len(posts) == 3
+    assert all(list(post) == ['title'] for post in posts)
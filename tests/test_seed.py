@@ -0,0 +1,133 @@
+import asyncio
+from collections import Counter
+from dataclasses import replace
+from datetime import datetime
+
+import pytest
+from fastapi import status
+from sqlalchemy import func, select, text
+
+from src.core.config import settings
+from src.models import Post, PostMonthlyCount, User
+from src.services import seed as seed_module
+from src.services.seed import (
+    SEED_PASSWORD,
+    DataGenerator,
+    SeedConfig,
+    load_posts,
+    seed,
+)
+from tests.conftest import URL_PREFIX_AUTH
+
+POST_INDEXES = {
+    'ix_post_created_at_id',
+    'ix_post_search_vector',
+    'ix_post_user_id',
+}
+CONFIG = SeedConfig(
+    users=10,
+    posts=1000,
+    date_from=datetime(2024, 1, 1),
+    date_to=datetime(2024, 7, 1),
+    content_median=100,
+    content_max=500,
+    batch_size=300,
+)
+
+
+def generate(config: SeedConfig) -> list[tuple]:
+    generator = DataGenerator(config)
+    return [
+        record
+        for records in generator.posts(list(range(1, config.users + 1)))
+        for record in records
+    ]
+
+
+def test_generator_deterministic():
+    posts = generate(CONFIG)
+    assert len(posts) == CONFIG.posts
+    assert posts == generate(CONFIG)
+    assert posts != generate(replace(CONFIG, seed=7))
+
+
+def test_generator_distributions():
+    posts = generate(CONFIG)
+
+    authors = Counter(user_id for user_id, *_ in posts).most_common()
+    assert authors[0][0] == 1
+    assert authors[0][1] > 3 * authors[-1][1]
+    assert all(
+        20 <= len(content) <= CONFIG.content_max
+        for _, _, content, *_ in posts
+    )
+    assert all(
+        CONFIG.date_from <= created_at < CONFIG.date_to
+        for *_, created_at, _ in posts
+    )
+
+
+@pytest.mark.anyio
+async def test_seed_parallel_requires_disabled_triggers():
+    with pytest.raises(ValueError):
+        await seed('postgresql://', CONFIG, jobs=2)
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    'jobs, disable_triggers, drop_indexes',
+    [(1, False, False), (2, True, False), (1, False, True)],
+)
+async def test_seed(
+    async_client,
+    db_engine,
+    db_session_factory,
+    jobs,
+    disable_triggers,
+    drop_indexes,
+):
+    dsn = settings.dsn_test.replace('postgresql+asyncpg', 'postgresql')
+    report = await seed(
+        dsn,
+        CONFIG,
+        jobs=jobs,
+        truncate=True,
+        disable_triggers=disable_triggers,
+        drop_indexes=drop_indexes,
+    )
+    assert report['posts'] == CONFIG.posts
+    assert report['load_posts_per_second'] > 0
+
+    async with db_session_factory() as db:
+        assert await db.scalar(select(func.count(User.id))) == CONFIG.users
+        assert await db.scalar(select(func.count(Post.id))) == CONFIG.posts
+        assert await db.scalar(select(func.min(Post.id))) == 1
+        assert (
+            await db.scalar(select(func.sum(PostMonthlyCount.count)))
+            == CONFIG.posts
+        )
+        indexes = await db.scalars(
+            text("SELECT indexname FROM pg_indexes WHERE tablename = 'post'")
+        )
+        assert set(indexes) >= POST_INDEXES
+
+    response = await async_client.post(
+        f'{URL_PREFIX_AUTH}/auth',
+        json={
+            'login': f'{CONFIG.login_prefix}0',
+            'password': SEED_PASSWORD,
+        },
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.anyio
+async def test_load_posts_worker_error(monkeypatch):
+    async def copy_posts(dsn, queue, copy_times):
+        await queue.get()
+        raise ConnectionError('copy failed')
+
+    monkeypatch.setattr(seed_module, 'copy_posts', copy_posts)
+    batches = iter([[('post',)]] * 10)
+    with pytest.raises(ConnectionError):
+        await asyncio.wait_for(load_posts('postgresql://', batches, 1, []), 5)